@@ -1 +1,6 @@
+import time
+
+# Start of the package import: the first mark of `caux-sim --startup-profile`
+_import_started = time.perf_counter()
+
 __version__ = "0.2.33"
@@ -5,16 +5,16 @@ Manages device registration, packet routing, and bus-level emulation.
 """
 
 import logging
+from time import perf_counter, time
 from typing import Dict, List, Optional, Callable
-from .utils import split_cmds, decode_command, make_checksum
+from .utils import decode_command, make_checksum
+from .cmdlog import NO_RESPONSE
 from ..devices.base import AuxDevice
 
 try:
     from .. import nse_logging as nselog
-    from ..nse_telescope import trg_names, cmd_names
 except ImportError:
     import nse_logging as nselog  # type: ignore
-    from nse_telescope import trg_names, cmd_names  # type: ignore
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +26,21 @@ class AuxBus:
         self.devices: Dict[int, AuxDevice] = {}
         self.msg_log: List[str] = []  # For TUI compatibility
         self.cmd_callback = cmd_callback
+        # Optional metrics.BusStats; counters are only updated when attached
+        self.stats = None
+        # Optional cmdlog.CommandLog recording every routed command
+        self.cmd_log = None
+        # Re-raise handler exceptions instead of logging them (fuzzing, tests)
+        self.raise_errors = False
+        # Dropped packets and handler errors (AuxSession charges them to the
+        # connection's error budget); their log messages are rate limited
+        self.errors = 0
+        # Packets received (framed) and sent, for per-connection accounting
+        self.packets_rx = 0
+        self.packets_tx = 0
+        # Offset of the packet cut off by the end of the last non-final read
+        self.tail = -1
+        self.log_limiter = nselog.LogLimiter(logger)
 
     def register_device(self, device: AuxDevice) -> None:
         """Adds a simulated device to the bus."""
@@ -41,22 +56,92 @@ class AuxBus:
         for device in self.devices.values():
             device.tick(interval)
 
-    def handle_stream(self, msg: bytes) -> bytes:
+    def _framing_error(self, msg: bytes, start: int, stop: int) -> None:
+        """Counts a run of bytes that is not a packet (one error per run)."""
+        self.errors += 1
+        if self.stats is not None:
+            self.stats.framing_errors += 1
+        if self.log_limiter.allow("framing"):
+            logger.warning(f"Malformed packet: {msg[start:stop][:32].hex()}")
+
+    @staticmethod
+    def _frames_packet(msg: bytes, start: int) -> bool:
+        """True if a `;` at or after `start` begins a complete, valid packet."""
+        end = len(msg)
+        q = msg.find(b";", start)
+        while 0 <= q < end - 5:
+            nxt = q + msg[q + 1] + 3
+            if msg[q + 1] >= 3 and nxt <= end:
+                if make_checksum(msg[q + 1 : nxt - 1]) == msg[nxt - 1]:
+                    return True
+            q = msg.find(b";", q + 1)
+        return False
+
+    def handle_stream(self, msg: bytes, final: bool = True) -> bytes:
         """
         Main entry point for incoming bytes from the network.
         Returns combined responses (echoes + response packets).
+
+        With `final=False` the bytes are one read of a stream: a packet cut
+        off at the end is not an error, and `tail` is set to its offset so
+        that the caller can prepend it to the next read (-1 otherwise).
         """
         nselog.log_protocol(logger, f"RX: {msg.hex()} ({len(msg)} bytes)")
 
+        stats = self.stats
+        cmd_log = self.cmd_log
+        limit = self.log_limiter.allow
         all_responses = []
-        for cmd_pkt in split_cmds(msg):
+        end = len(msg)
+        # Start of a packet cut off by the end of a non-final read
+        tail = -1
+        p = msg.find(b";")
+        if p != 0 and end:
+            self._framing_error(msg, 0, p if p > 0 else end)
+        while p >= 0:
+            # 1. Framing and integrity check. On any error, resynchronize
+            # to the next `;` after this one: a bad length byte must not
+            # swallow the valid packets that follow it.
+            cmd_pkt = b""
             try:
-                cmd_id, src_id, dst_id, length, data, chk = decode_command(cmd_pkt)
-
-                # 1. Integrity Check
-                if make_checksum(cmd_pkt[:-1]) != chk:
-                    logger.warning(f"Checksum error in packet: {cmd_pkt.hex()}")
+                length = msg[p + 1] if p + 1 < end else 0
+                nxt = p + length + 3
+                if length < 3 or nxt > end:
+                    if not final and (
+                        p + 1 == end
+                        or (length >= 3 and not self._frames_packet(msg, p + 1))
+                    ):
+                        # Cut off by the end of the read. A `;` within its
+                        # declared length may be payload, so nothing after
+                        # it is framed until the next read completes it,
+                        # unless a later `;` starts a complete packet with
+                        # a valid checksum (a bogus length byte then).
+                        tail = p
+                        break
+                    q = msg.find(b";", p + 1)
+                    self._framing_error(msg, p, q if q > 0 else end)
+                    p = q
                     continue
+                cmd_pkt = msg[p + 1 : nxt]
+                self.packets_rx += 1
+                if stats is not None:
+                    stats.packets_rx += 1
+                if make_checksum(cmd_pkt[:-1]) != cmd_pkt[-1]:
+                    self.errors += 1
+                    if stats is not None:
+                        stats.checksum_errors += 1
+                    if limit("checksum"):
+                        logger.warning(
+                            f"Checksum error in packet: {cmd_pkt[:32].hex()}"
+                        )
+                    p = msg.find(b";", p + 1)
+                    continue
+                p = msg.find(b";", nxt)
+                if p > nxt:
+                    self._framing_error(msg, nxt, p)
+                elif p < 0 and nxt < end:
+                    self._framing_error(msg, nxt, end)
+                cmd_id, src_id, dst_id, length, data, chk = decode_command(cmd_pkt)
 
                 # 2. Device Presence Filter (Silence Strategy)
                 # If target device isn't simulated, be COMPLETELY silent (no echo, no response).
@@ -70,6 +155,8 @@ class AuxBus:
                     # For testing: if we want to avoid timeouts in test_extensive,
                     # we should only ignore if we are NOT in a special test mode
                     # OR just accept that the test will time out on non-simulated devices.
+                    if stats is not None:
+                        stats.silenced += 1
                     continue
 
                 # 3. Always echo the valid packet to the bus (MB behavior)
@@ -81,32 +168,60 @@ class AuxBus:
                     self.cmd_callback(src_id, dst_id, cmd_id)
 
                 # 4. Route to target device(s)
+                timed = stats is not None or cmd_log is not None
+                resp_payload = None
+                if timed:
+                    t0 = perf_counter()
                 if dst_id == 0x00:  # Broadcast
                     for device in self.devices.values():
                         device.handle_command(src_id, cmd_id, data)
-                elif dst_id in self.devices:
+                else:
                     resp_payload = self.devices[dst_id].handle_command(
                         src_id, cmd_id, data
                     )
-
-                    if resp_payload is not None:
-                        # Construct response packet
-                        resp_header = bytes(
-                            [len(resp_payload) + 3, dst_id, src_id, cmd_id]
-                        )
-                        full_payload = resp_header + resp_payload
-                        resp_pkt = (
-                            b";" + full_payload + bytes([make_checksum(full_payload)])
+                if timed:
+                    latency = perf_counter() - t0
+                    if stats is not None and dst_id != 0x00:
+                        stats.observe_handler(dst_id, cmd_id, latency)
+                    if cmd_log is not None:
+                        cmd_log.append(
+                            time(),
+                            src_id,
+                            dst_id,
+                            cmd_id,
+                            len(data),
+                            NO_RESPONSE if resp_payload is None else len(resp_payload),
+                            latency,
                         )
 
-                        all_responses.append(resp_pkt)
-                        logger.debug(f"Response packet: {resp_pkt.hex()}")
-                        nselog.log_protocol(logger, f"TX Response: {resp_pkt.hex()}")
+                if resp_payload is not None:
+                    # Construct response packet
+                    resp_header = bytes([len(resp_payload) + 3, dst_id, src_id, cmd_id])
+                    full_payload = resp_header + resp_payload
+                    resp_pkt = (
+                        b";" + full_payload + bytes([make_checksum(full_payload)])
+                    )
 
-            except Exception as e:
-                logger.exception(f"Error processing packet {cmd_pkt.hex()}: {e}")
+                    all_responses.append(resp_pkt)
+                    logger.debug(f"Response packet: {resp_pkt.hex()}")
+                    nselog.log_protocol(logger, f"TX Response: {resp_pkt.hex()}")
 
+            except Exception as e:
+                if self.raise_errors:
+                    raise
+                self.errors += 1
+                if stats is not None:
+                    stats.handler_errors += 1
+                if limit(("handler", cmd_pkt[2:4], type(e)), logging.ERROR):
+                    logger.exception(f"Error processing packet {cmd_pkt.hex()}: {e}")
+
+        self.tail = tail
         full_tx = b"".join(all_responses)
+        self.packets_tx += len(all_responses)
+        if stats is not None:
+            stats.bytes_rx += len(msg)
+            stats.bytes_tx += len(full_tx)
+            stats.packets_tx += len(all_responses)
         if full_tx:
             nselog.log_protocol(
                 logger, f"TX Total: {full_tx.hex()} ({len(full_tx)} bytes)"
@@ -0,0 +1,113 @@
+"""
+AUX Traffic Capture
+
+Binary capture of the raw bytes exchanged on the AUX port, one record per
+read from (RX) or write to (TX) a connection:
+
+    b"CAUXCAP1" header, then per record:
+    <timestamp f64> <direction u8> <connection u16> <length u32> <bytes>
+
+Timestamps are UNIX seconds. Captures are read back by
+`caux-sim-analyze` and `caux-sim-tracediff`, which also accept text logs
+with the PROTOCOL logging category (`read_trace`).
+"""
+
+import re
+import struct
+from datetime import datetime
+from typing import BinaryIO, Iterator, List, NamedTuple, Optional
+
+MAGIC = b"CAUXCAP1"
+RECORD = struct.Struct("<dBHI")
+
+RX = 0
+TX = 1
+
+# `[PROTO] RX: <hex>` / `[PROTO] TX Total: <hex>` log lines (nse_logging),
+# with the optional `asctime` prefix of the default log format
+PROTO_LINE = re.compile(
+    rb"^(?:(\d{4}-\d\d-\d\d \d\d:\d\d:\d\d,\d{3}))?[^\n]*?"
+    rb"\[PROTO\] (RX|TX Total): ([0-9a-fA-F]+)",
+    re.MULTILINE,
+)
+
+
+class CaptureRecord(NamedTuple):
+    time: float
+    direction: int
+    conn: int
+    data: bytes
+
+
+class CaptureWriter:
+    """Appends records to a capture file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._f: Optional[BinaryIO] = open(path, "wb")
+        self._f.write(MAGIC)
+        self.records = 0
+
+    def write(self, t: float, direction: int, conn: int, data: bytes) -> None:
+        if self._f is None:
+            return
+        self._f.write(RECORD.pack(t, direction, conn & 0xFFFF, len(data)))
+        self._f.write(data)
+        self.records += 1
+
+    def close(self) -> None:
+        if self._f is not None:
+            self._f.close()
+            self._f = None
+
+    def __enter__(self) -> "CaptureWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def read_capture(path: str) -> Iterator[CaptureRecord]:
+    """Yields the records of a capture file; a truncated tail is ignored."""
+    with open(path, "rb") as f:
+        buf = f.read()
+    if buf[: len(MAGIC)] != MAGIC:
+        raise ValueError(f"{path} is not an AUX capture file")
+    p = len(MAGIC)
+    size = RECORD.size
+    while p + size <= len(buf):
+        t, direction, conn, n = RECORD.unpack_from(buf, p)
+        p += size
+        if p + n > len(buf):
+            return
+        yield CaptureRecord(t, direction, conn, buf[p : p + n])
+        p += n
+
+
+def is_capture(path: str) -> bool:
+    with open(path, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def read_protocol_log(path: str) -> Iterator[CaptureRecord]:
+    """
+    Yields the traffic logged by the PROTOCOL category of a text log as
+    records of connection 0 (timestamps are naive local time, NaN when the
+    log format has no `asctime`).
+    """
+    with open(path, "rb") as f:
+        text = f.read()
+    for stamp, kind, data in PROTO_LINE.findall(text):
+        t = float("nan")
+        if stamp:
+            t = datetime.strptime(stamp.decode(), "%Y-%m-%d %H:%M:%S,%f").timestamp()
+        yield CaptureRecord(
+            t, RX if kind == b"RX" else TX, 0, bytes.fromhex(data.decode())
+        )
+
+
+def read_trace(path: str) -> List[CaptureRecord]:
+    """All records of a capture or a text log."""
+    if is_capture(path):
+        return list(read_capture(path))
+    return list(read_protocol_log(path))
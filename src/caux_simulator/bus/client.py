@@ -0,0 +1,266 @@
+"""
+AUX Client
+
+Asyncio client for the AUX port (the simulator or a real WiFi mount).
+Frames the incoming byte stream into packets with the bus codec, matches
+echoes and responses to requests by (src, dst, cmd) and allows many
+requests in flight on one connection.
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+from .utils import decode_command, encode_packet, make_checksum
+
+
+class PacketFramer:
+    """
+    Splits a byte stream into complete AUX packets.
+
+    Partial packets are kept until the rest arrives. Bytes that do not
+    form a packet (length below 3 or a bad checksum) are skipped up to
+    the next `;`.
+    """
+
+    def __init__(self) -> None:
+        self.buffer = bytearray()
+        self.bad_packets = 0
+
+    def feed(self, data: bytes) -> List[bytes]:
+        """Adds received bytes and returns the completed packets (without `;`)."""
+        buf = self.buffer
+        buf += data
+        packets = []
+        p = 0
+        while True:
+            p = buf.find(b";", p)
+            if p < 0 or p + 1 >= len(buf):
+                break
+            if buf[p + 1] < 3:
+                # No room for src, dst and cmd: not a packet start
+                self.bad_packets += 1
+                p += 1
+                continue
+            end = p + buf[p + 1] + 3
+            if end > len(buf):
+                break
+            pkt = bytes(buf[p + 1 : end])
+            if make_checksum(pkt[:-1]) == pkt[-1]:
+                packets.append(pkt)
+                p = end
+            else:
+                self.bad_packets += 1
+                p += 1
+        if p < 0:
+            del buf[:]
+        else:
+            del buf[:p]
+        return packets
+
+
+class AuxReply:
+    """Outcome of one AUX request with its timing (perf_counter seconds)."""
+
+    def __init__(self, src: int, dst: int, cmd: int, data: bytes) -> None:
+        self.src = src
+        self.dst = dst
+        self.cmd = cmd
+        self.data = data
+        self.payload: Optional[bytes] = None
+        self.echoed = False
+        self.t_sent = 0.0
+        self.t_echo: Optional[float] = None
+        self.t_response: Optional[float] = None
+
+    @property
+    def echo_latency(self) -> Optional[float]:
+        return None if self.t_echo is None else self.t_echo - self.t_sent
+
+    @property
+    def latency(self) -> Optional[float]:
+        """Time from sending the request to receiving its response."""
+        return None if self.t_response is None else self.t_response - self.t_sent
+
+    def __repr__(self) -> str:
+        lat = self.latency
+        lat_str = "-" if lat is None else f"{lat * 1e3:.2f}ms"
+        return (
+            f"AuxReply(0x{self.src:02x}->0x{self.dst:02x} cmd=0x{self.cmd:02x} "
+            f"payload={self.payload!r} latency={lat_str})"
+        )
+
+
+class AuxClient:
+    """
+    Pipelining asyncio AUX client.
+
+    Requests with the same (src, dst, cmd) are answered in order, so they
+    can be pipelined too. Use `connect()` or the async context manager.
+    """
+
+    def __init__(self, src_id: int = 0x20, timeout: float = 1.0) -> None:
+        self.src_id = src_id
+        self.timeout = timeout
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+        self.framer = PacketFramer()
+        # (src, dst, cmd) of the request -> requests waiting for echo/response
+        self._pending: Dict[
+            Tuple[int, int, int], Deque[Tuple[AuxReply, asyncio.Future]]
+        ] = {}
+        self._reader_task: Optional[asyncio.Task] = None
+        self.unmatched: Deque[bytes] = deque(maxlen=100)
+
+    async def connect(self, host: str = "127.0.0.1", port: int = 2000) -> "AuxClient":
+        self.reader, self.writer = await asyncio.open_connection(host, port)
+        self._reader_task = asyncio.create_task(self._read_loop())
+        return self
+
+    async def close(self) -> None:
+        if self._reader_task:
+            self._reader_task.cancel()
+            await asyncio.gather(self._reader_task, return_exceptions=True)
+            self._reader_task = None
+        if self.writer:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except ConnectionError:
+                pass
+            self.writer = None
+        self._fail_pending(ConnectionError("AUX client closed"))
+
+    async def __aenter__(self) -> "AuxClient":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    def _fail_pending(self, exc: Exception) -> None:
+        for queue in self._pending.values():
+            for _, fut in queue:
+                if not fut.done():
+                    fut.set_exception(exc)
+        self._pending.clear()
+
+    async def _read_loop(self) -> None:
+        assert self.reader is not None
+        try:
+            while data := await self.reader.read(4096):
+                now = time.perf_counter()
+                for pkt in self.framer.feed(data):
+                    self._dispatch(pkt, now)
+        except ConnectionError:
+            pass
+        finally:
+            # Also on unexpected errors: nothing reads the replies any more
+            self._fail_pending(ConnectionError("AUX connection lost"))
+
+    def _dispatch(self, pkt: bytes, now: float) -> None:
+        cmd, src, dst, _, data, _ = decode_command(pkt)
+
+        # Echo of our own packet: same (src, dst, cmd) as the request
+        for reply, _ in self._pending.get((src, dst, cmd), ()):
+            if not reply.echoed and reply.data == data:
+                reply.echoed = True
+                reply.t_echo = now
+                return
+
+        # Response: addressed back to the requester
+        queue = self._pending.get((dst, src, cmd))
+        if queue:
+            reply, fut = queue.popleft()
+            if not queue:
+                del self._pending[(dst, src, cmd)]
+            reply.payload = data
+            reply.t_response = now
+            if not fut.done():
+                fut.set_result(reply)
+            return
+        self.unmatched.append(pkt)
+
+    def send(self, dst: int, cmd: int, data: bytes = b"", src: Optional[int] = None):
+        """
+        Writes one request without waiting and returns a future of its
+        `AuxReply`. Call `drain()` (or await the future) to flush.
+        """
+        if self.writer is None:
+            raise ConnectionError("AUX client not connected")
+        src = self.src_id if src is None else src
+        reply = AuxReply(src, dst, cmd, bytes(data))
+        fut = asyncio.get_running_loop().create_future()
+        self._pending.setdefault((src, dst, cmd), deque()).append((reply, fut))
+        reply.t_sent = time.perf_counter()
+        self.writer.write(encode_packet(src, dst, cmd, data))
+        return fut
+
+    async def drain(self) -> None:
+        if self.writer:
+            await self.writer.drain()
+
+    def _forget(self, fut: asyncio.Future) -> None:
+        for key, queue in list(self._pending.items()):
+            for item in queue:
+                if item[1] is fut:
+                    queue.remove(item)
+                    if not queue:
+                        del self._pending[key]
+                    return
+
+    async def request(
+        self,
+        dst: int,
+        cmd: int,
+        data: bytes = b"",
+        src: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> AuxReply:
+        """
+        Sends one command and waits for its response.
+
+        Raises asyncio.TimeoutError if the target does not answer (silent
+        devices send neither echo nor response).
+        """
+        fut = self.send(dst, cmd, data, src)
+        await self.drain()
+        try:
+            return await asyncio.wait_for(
+                fut, self.timeout if timeout is None else timeout
+            )
+        except asyncio.TimeoutError:
+            self._forget(fut)
+            raise
+
+    async def query(self, dst: int, cmd: int, data: bytes = b"") -> bytes:
+        """Sends one command and returns the payload of its response."""
+        reply = await self.request(dst, cmd, data)
+        assert reply.payload is not None
+        return reply.payload
+
+    async def pipeline(
+        self,
+        requests: List[Tuple[int, int, bytes]],
+        timeout: Optional[float] = None,
+    ) -> List[AuxReply]:
+        """Sends all (dst, cmd, data) requests at once and awaits all replies."""
+        futs = [self.send(dst, cmd, data) for dst, cmd, data in requests]
+        await self.drain()
+        try:
+            return list(
+                await asyncio.wait_for(
+                    asyncio.gather(*futs),
+                    self.timeout if timeout is None else timeout,
+                )
+            )
+        except asyncio.TimeoutError:
+            for fut in futs:
+                self._forget(fut)
+            raise
+
+
+async def open_client(
+    host: str = "127.0.0.1", port: int = 2000, src_id: int = 0x20, timeout: float = 1.0
+) -> AuxClient:
+    """Connects a new `AuxClient` to an AUX port."""
+    return await AuxClient(src_id=src_id, timeout=timeout).connect(host, port)
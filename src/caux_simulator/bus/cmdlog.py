@@ -0,0 +1,152 @@
+"""
+AUX Command Log
+
+Fixed-size ring buffer of integer command records kept in preallocated
+arrays. Appending writes numbers in place; device and command names are
+only formatted when a viewer reads the log.
+"""
+
+from array import array
+from typing import Dict, Iterator, List, NamedTuple, Optional, Union
+
+from .protocol import trg_names, cmd_names, targets, commands
+
+# Response length recorded for commands that produced no response packet
+NO_RESPONSE = -1
+
+
+class CommandRecord(NamedTuple):
+    seq: int  # Running number of the command since the log was created
+    time: float  # Wall clock [s since epoch]
+    src: int
+    dst: int
+    cmd: int
+    length: int  # Request payload length
+    resp_length: int  # Response payload length, NO_RESPONSE if none
+    latency: float  # Handler latency [s]
+
+    @property
+    def device_name(self) -> str:
+        return trg_names.get(self.dst, f"0x{self.dst:02x}")
+
+    @property
+    def cmd_name(self) -> str:
+        return cmd_names.get(self.cmd, f"0x{self.cmd:02x}")
+
+    def __str__(self) -> str:
+        return f"{self.device_name}: {self.cmd_name}"
+
+    def as_dict(self) -> Dict[str, Union[int, float, str]]:
+        return {
+            "seq": self.seq,
+            "time": self.time,
+            "src": trg_names.get(self.src, f"0x{self.src:02x}"),
+            "dst": self.device_name,
+            "cmd": self.cmd_name,
+            "length": self.length,
+            "resp_length": self.resp_length,
+            "latency": self.latency,
+        }
+
+
+def _resolve(value: Union[int, str, None], table: Dict[str, int]) -> Optional[int]:
+    """Accepts an ID, a name from `table` or a numeric string ("0x10")."""
+    if value is None or isinstance(value, int):
+        return value
+    if value in table:
+        return table[value]
+    try:
+        return int(value, 0)
+    except ValueError:
+        raise ValueError(f"Unknown AUX name: {value}") from None
+
+
+class CommandLog:
+    """Ring buffer of the last `capacity` AUX commands handled by the bus."""
+
+    def __init__(self, capacity: int = 1024):
+        self.capacity = capacity
+        self.time = array("d", bytes(8 * capacity))
+        self.latency = array("d", bytes(8 * capacity))
+        self.src = array("B", bytes(capacity))
+        self.dst = array("B", bytes(capacity))
+        self.cmd = array("B", bytes(capacity))
+        self.length = array("B", bytes(capacity))
+        self.resp_length = array("h", bytes(2 * capacity))
+        # Total number of records appended (also the seq of the next record)
+        self.seq = 0
+        self._start = 0  # First seq still valid after clear()
+
+    def append(
+        self,
+        t: float,
+        src: int,
+        dst: int,
+        cmd: int,
+        length: int,
+        resp_length: int,
+        latency: float,
+    ) -> None:
+        i = self.seq % self.capacity
+        self.time[i] = t
+        self.src[i] = src
+        self.dst[i] = dst
+        self.cmd[i] = cmd
+        self.length[i] = length
+        self.resp_length[i] = resp_length
+        self.latency[i] = latency
+        self.seq += 1
+
+    def clear(self) -> None:
+        """Drops all records; `seq` keeps counting so reader cursors stay valid."""
+        self._start = self.seq
+
+    def __len__(self) -> int:
+        return self.seq - max(self._start, self.seq - self.capacity)
+
+    def _record(self, seq: int) -> CommandRecord:
+        i = seq % self.capacity
+        return CommandRecord(
+            seq,
+            self.time[i],
+            self.src[i],
+            self.dst[i],
+            self.cmd[i],
+            self.length[i],
+            self.resp_length[i],
+            self.latency[i],
+        )
+
+    def since(self, seq: int) -> Iterator[CommandRecord]:
+        """Records with a sequence number >= `seq` (oldest first)."""
+        first = max(seq, self._start, self.seq - self.capacity)
+        for s in range(first, self.seq):
+            yield self._record(s)
+
+    def query(
+        self,
+        n: Optional[int] = None,
+        device: Union[int, str, None] = None,
+        cmd: Union[int, str, None] = None,
+    ) -> List[CommandRecord]:
+        """
+        The last `n` records (all by default), oldest first, optionally
+        filtered by target device and command (IDs or names).
+        """
+        dst_id = _resolve(device, targets)
+        cmd_id = _resolve(cmd, commands)
+        result: List[CommandRecord] = []
+        if n is not None and n <= 0:
+            return result
+        first = max(self._start, self.seq - self.capacity)
+        for s in range(self.seq - 1, first - 1, -1):
+            i = s % self.capacity
+            if dst_id is not None and self.dst[i] != dst_id:
+                continue
+            if cmd_id is not None and self.cmd[i] != cmd_id:
+                continue
+            result.append(self._record(s))
+            if n is not None and len(result) >= n:
+                break
+        result.reverse()
+        return result
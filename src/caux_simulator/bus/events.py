@@ -0,0 +1,120 @@
+"""
+Mount State Events
+
+Devices emit typed events when their state changes; the mount collects
+them during a tick and delivers them once per tick, keeping only the
+latest event of each kind per device. Front-ends subscribe and redraw when
+something changed instead of polling the mount on a timer.
+"""
+
+import asyncio
+from enum import Enum
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+
+class EventType(Enum):
+    GOTO_STARTED = "goto_started"  # value: target steps
+    GOTO_FINISHED = "goto_finished"  # value: final steps
+    RATE_CHANGED = "rate_changed"  # value: rate [steps/s]
+    GUIDE_RATE_CHANGED = "guide_rate_changed"  # value: guide rate [steps/s]
+    POSITION_CHANGED = "position_changed"  # value: steps (moved past threshold)
+    TIME_SYNCED = "time_synced"  # value: clock offset [s]
+    LOCATION_SYNCED = "location_synced"  # value: (latitude, longitude)
+    LIGHT_CHANGED = "light_changed"  # value: {"tray", "logo", "wifi"} levels
+    CHARGER_CHANGED = "charger_changed"  # value: charging flag
+    RESET = "reset"  # value: None
+
+
+class Event(NamedTuple):
+    kind: EventType
+    device: int
+    value: Any = None
+
+
+class Subscription:
+    """
+    Receives the events of one subscriber. Either pass a callback (called
+    with the batch of events of each tick) or poll with `drain()` /
+    `await wait()`.
+    """
+
+    def __init__(
+        self,
+        bus: "EventBus",
+        kinds: Optional[Iterable[EventType]] = None,
+        callback: Optional[Callable[[List[Event]], None]] = None,
+    ):
+        self.bus = bus
+        self.kinds = frozenset(kinds) if kinds is not None else None
+        self.callback = callback
+        self.pending: List[Event] = []
+        self._ready = asyncio.Event()
+
+    def _deliver(self, events: List[Event]) -> None:
+        if self.kinds is not None:
+            events = [e for e in events if e.kind in self.kinds]
+            if not events:
+                return
+        if self.callback is not None:
+            self.callback(events)
+            return
+        self.pending.extend(events)
+        self._ready.set()
+
+    def drain(self) -> List[Event]:
+        """Returns and clears the events received since the last call."""
+        events, self.pending = self.pending, []
+        self._ready.clear()
+        return events
+
+    async def wait(self, timeout: Optional[float] = None) -> List[Event]:
+        """Waits for events (at most `timeout` seconds) and drains them."""
+        if not self.pending:
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        return self.drain()
+
+    def wake(self) -> None:
+        """Ends a pending `wait()` without events (e.g. a new viewer joined)."""
+        self._ready.set()
+
+    def close(self) -> None:
+        self.bus.unsubscribe(self)
+
+
+class EventBus:
+    """Per-tick coalescing event dispatcher of one mount."""
+
+    def __init__(self) -> None:
+        self.subscribers: List[Subscription] = []
+        self._pending: Dict[Tuple[EventType, int], Event] = {}
+
+    def emit(self, kind: EventType, device: int, value: Any = None) -> None:
+        key = (kind, device)
+        # Re-insert so the batch stays in order of the latest change
+        self._pending.pop(key, None)
+        self._pending[key] = Event(kind, device, value)
+
+    def flush(self) -> None:
+        """Delivers the events collected since the last flush (once per tick)."""
+        if not self._pending:
+            return
+        events = list(self._pending.values())
+        self._pending.clear()
+        for sub in list(self.subscribers):
+            sub._deliver(events)
+
+    def subscribe(
+        self,
+        kinds: Optional[Iterable[EventType]] = None,
+        callback: Optional[Callable[[List[Event]], None]] = None,
+    ) -> Subscription:
+        sub = Subscription(self, kinds, callback)
+        self.subscribers.append(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        if sub in self.subscribers:
+            self.subscribers.remove(sub)
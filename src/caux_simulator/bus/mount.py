@@ -7,20 +7,17 @@ Aggregates multiple AUX devices and handles high-level mount state and sky model
 import logging
 from typing import Dict, Any, Tuple, Optional
 from datetime import datetime, timezone, timedelta
-from math import pi, sin, tan, radians
 from collections import deque
 from .aux_bus import AuxBus
+from .cmdlog import CommandLog
+from .events import EventBus, EventType
 from ..devices.motor import MotorController
 from ..devices.power import PowerModule
 from ..devices.wifi import WiFiModule
 from ..devices.gps import GPSReceiver
 from ..devices.light import LightController
 from ..devices.generic import GenericDevice
-
-try:
-    from ..nse_telescope import trg_names, cmd_names
-except ImportError:
-    from nse_telescope import trg_names, cmd_names  # type: ignore
+from ..model.pointing import PointingModel
 
 logger = logging.getLogger(__name__)
 
@@ -37,17 +34,16 @@ class NexStarMount:
             self.config["observer"] = {}
         if "time_offset" not in self.config["observer"]:
             self.config["observer"]["time_offset"] = 0.0
+        # Initial observer state, restored by reset() (WiFi sync modifies it)
+        self._observer_defaults = dict(self.config["observer"])
 
-        # Logging/UI State (Preserved for TUI compatibility)
+        # Logging/UI State
         self.msg_log = deque(maxlen=10)
-        self.cmd_log = deque(maxlen=30)
-
-        def log_to_deque(src, dst, cmd):
-            t_name = trg_names.get(dst, f"0x{dst:02x}")
-            c_name = cmd_names.get(cmd, f"0x{cmd:02x}")
-            self.cmd_log.append(f"{t_name}: {c_name}")
+        # Structured record of every routed command, read by the TUI/web console
+        self.cmd_log = CommandLog()
 
-        self.bus = AuxBus(cmd_callback=log_to_deque)
+        self.bus = AuxBus()
+        self.bus.cmd_log = self.cmd_log
 
         # Evolution Mount Device Profile (Based on nsevo.log)
         # Note: Devices that do NOT respond in the real log are OMITTED.
@@ -76,6 +72,13 @@ class NexStarMount:
         self.bus.register_device(LightController(0xBF, config, version=(1, 1, 64, 34)))
 
         # 5. Optional devices\n        if hc_enabled:\n            # NexStar+ HC - Version 5.35.3177 (0x0D)\n            # nsevo.log scan shows this version\n            self.bus.register_device(GenericDevice(0x0D, config, version=(5, 35, 12, 105))) # 12*256 + 105 = 3177\n\n        # GPS (0xB0), Main Board (0x01), and other HCs are SILENT in nsevo.log scan.\n
+        # State change events, delivered to subscribers once per tick
+        self.events = EventBus()
+        for device in self.bus.devices.values():
+            device.events = self.events
+        # Optional telemetry.TelemetryRecorder, fed at the end of every tick
+        self.telemetry = None
+
         # Sky Model Parameters
         imp = self.config.get("simulator", {}).get("imperfections", {})
         self.cone_error = imp.get("cone_error_arcmin", 0.0) / (360.0 * 60.0)
@@ -84,6 +87,9 @@ class NexStarMount:
         self.pe_period = imp.get("periodic_error_period_sec", 480.0)
         self.refraction_enabled = imp.get("refraction_enabled", False)
         self.clock_drift = imp.get("clock_drift", 0.0)
+        self.pointing_model = PointingModel.from_config(
+            imp, self.config.get("config_dir", ".")
+        )
 
     # --- UI Compatibility Accessors ---
 
@@ -177,12 +183,32 @@ class NexStarMount:
         actual_dt = dt * (1.0 + self.clock_drift)
         self.sim_time += actual_dt
         self.bus.tick(actual_dt)
-
-    def handle_msg(self, data: bytes) -> bytes:
+        if self.telemetry is not None:
+            self.telemetry.record(self)
+        self.events.flush()
+
+    def reset(self) -> None:
+        """
+        Restores the power-on state without rebuilding the mount.
+
+        Resets all devices (motor steps, rates, backlash slack, lights,
+        battery), the simulation clock and the synced time/location.
+        """
+        for device in self.bus.devices.values():
+            device.reset()
+        self.sim_time = 0.0
+        observer = self.config["observer"]
+        observer.clear()
+        observer.update(self._observer_defaults)
+        self.cmd_log.clear()
+        self.msg_log.clear()
+        self.events.emit(EventType.RESET, 0x00)
+        if self.telemetry is not None:
+            self.telemetry.clear()
+
+    def handle_msg(self, data: bytes, final: bool = True) -> bytes:
         """Process incoming bytes and return responses."""
-        # Note: cmd_log update should ideally happen inside the bus or devices
-        # but kept here for now to maintain TUI state.
-        return self.bus.handle_stream(data)
+        return self.bus.handle_stream(data, final)
 
     def print_msg(self, msg: str) -> None:
         """Log a system message (for UI and logger)."""
@@ -192,31 +218,13 @@ class NexStarMount:
 
     def get_sky_altaz(self) -> Tuple[float, float]:
         """Calculates actual pointing position including imperfections."""
-        sky_alt = self.alt_motor.pointing_pos
-        sky_azm = self.azm_motor.pointing_pos
-
-        # 1. Cone error (Alt offset)
-        sky_alt += self.cone_error
-
-        # 2. Non-perpendicularity (Azm offset scaling with tan(alt))
-        # Limit Alt to [-80, 80] to avoid tan() singularity
-        safe_alt_deg = max(-80.0, min(80.0, self.alt_motor.pos * 360.0))
-        sky_azm += self.non_perp * tan(radians(safe_alt_deg))
-
-        # 3. Periodic Error (Azm/RA and Alt/Dec)
-        if self.pe_period > 0:
-            error = self.pe_amplitude * sin(2 * pi * self.sim_time / self.pe_period)
-            sky_azm += error
-            sky_alt += error
-
-        # 4. Atmospheric Refraction (Approximate formula)
-        if self.refraction_enabled:
-            h = max(0.1, sky_alt * 360.0)
-            # Bennett's formula for refraction in arcmin
-            ref_arcmin = 1.0 / tan(radians(h + 7.31 / (h + 4.4)))
-            sky_alt += ref_arcmin / (60.0 * 360.0)
-
-        return sky_azm % 1.0, sky_alt
+        return self.pointing_model.apply(
+            self.azm_motor.pointing_pos,
+            self.alt_motor.pointing_pos,
+            self.azm_motor.steps,
+            self.alt_motor.steps,
+            self.sim_time,
+        )
 
     def get_utc_now(self) -> datetime:
         """Returns the synchronized current UTC time."""
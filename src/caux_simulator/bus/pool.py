@@ -0,0 +1,57 @@
+"""
+Mount Pool
+
+Pre-initialized `NexStarMount` instances for the isolated mode of the AUX
+port, where every connection drives a mount of its own. Each mount gets a
+private copy of the configuration (WiFi time/location sync writes to it);
+mounts are reset to the power-on state when returned, so the next
+connection cannot observe anything of the previous one.
+"""
+
+import copy
+import logging
+from typing import Any, Dict, List
+
+from .mount import NexStarMount
+
+logger = logging.getLogger(__name__)
+
+
+class MountPool:
+    """
+    Hands out one mount per connection.
+
+    `size` mounts are built up front and kept idle; when all are in use,
+    `acquire` builds another one, and `release` keeps at most `size` idle.
+    Only mounts in use are ticked.
+    """
+
+    def __init__(self, config: Dict[str, Any], size: int = 4, hc_enabled: bool = False):
+        self.config = config
+        self.size = size
+        self.hc_enabled = hc_enabled
+        self.created = 0
+        self.idle: List[NexStarMount] = [self._create() for _ in range(size)]
+        self.active: List[NexStarMount] = []
+
+    def _create(self) -> NexStarMount:
+        self.created += 1
+        return NexStarMount(copy.deepcopy(self.config), hc_enabled=self.hc_enabled)
+
+    def acquire(self) -> NexStarMount:
+        mount = self.idle.pop() if self.idle else self._create()
+        self.active.append(mount)
+        return mount
+
+    def release(self, mount: NexStarMount) -> None:
+        self.active.remove(mount)
+        if len(self.idle) < self.size:
+            mount.reset()
+            self.idle.append(mount)
+
+    def tick(self, interval: float) -> None:
+        for mount in self.active:
+            mount.tick(interval)
+
+    def counts(self) -> Dict[str, int]:
+        return {"active": len(self.active), "idle": len(self.idle)}
@@ -0,0 +1,61 @@
+"""
+AUX Protocol Name Tables
+
+Device and command ID tables used for logging and display. Kept free of
+any imports so the bus can use them without loading the legacy emulator.
+"""
+
+# ID tables from Celestron AUX Protocol
+targets = {
+    "ANY": 0x00,
+    "MB": 0x01,  # Main Board
+    "HC": 0x04,  # Hand Controller
+    "UKN1": 0x05,
+    "HC+": 0x0D,
+    "AZM": 0x10,  # Azimuth / RA Motor
+    "ALT": 0x11,  # Altitude / Dec Motor
+    "APP": 0x20,  # Software Application
+    "GPS": 0xB0,
+    "UKN2": 0xB4,
+    "WiFi": 0xB5,
+    "BAT": 0xB6,
+    "CHG": 0xB7,
+    "LIGHT": 0xBF,
+}
+trg_names = {value: key for key, value in targets.items()}
+
+commands = {
+    "MC_GET_POSITION": 0x01,
+    "MC_GOTO_FAST": 0x02,
+    "MC_SET_POSITION": 0x04,
+    "MC_GET_MODEL": 0x05,
+    "MC_SET_POS_GUIDERATE": 0x06,
+    "MC_SET_NEG_GUIDERATE": 0x07,
+    "MC_LEVEL_START": 0x0B,
+    "MC_SET_POS_BACKLASH": 0x10,
+    "MC_SET_NEG_BACKLASH": 0x11,
+    "MC_LEVEL_DONE": 0x12,
+    "MC_SLEW_DONE": 0x13,
+    "MC_GOTO_SLOW": 0x17,
+    "MC_SEEK_DONE": 0x18,
+    "MC_SEEK_INDEX": 0x19,
+    "MC_SET_MAXRATE": 0x20,
+    "MC_GET_MAXRATE": 0x21,
+    "MC_ENABLE_MAXRATE": 0x22,
+    "MC_MAXRATE_ENABLED": 0x23,
+    "MC_MOVE_POS": 0x24,
+    "MC_MOVE_NEG": 0x25,
+    "MC_ENABLE_CORDWRAP": 0x38,
+    "MC_DISABLE_CORDWRAP": 0x39,
+    "MC_SET_CORDWRAP_POS": 0x3A,
+    "MC_POLL_CORDWRAP": 0x3B,
+    "MC_GET_CORDWRAP_POS": 0x3C,
+    "MC_GET_POS_BACKLASH": 0x40,
+    "MC_GET_NEG_BACKLASH": 0x41,
+    "MC_GET_AUTOGUIDE_RATE": 0x47,
+    "MC_GET_APPROACH": 0xFC,
+    "MC_SET_APPROACH": 0xFD,
+    "SIM_GET_SKY_POSITION": 0xFF,
+    "GET_VER": 0xFE,
+}
+cmd_names = {value: key for key, value in commands.items()}
@@ -0,0 +1,298 @@
+"""
+AUX Port Transport
+
+Per-connection protocol state of the AUX port (transparent AUX traffic and
+WiFly command mode) and an in-process channel that drives a mount with the
+same semantics as the TCP port, without sockets.
+"""
+
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from .utils import encode_packet, split_cmds
+
+try:
+    from .. import nse_logging as nselog
+except ImportError:
+    import nse_logging as nselog  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+
+ERROR_POLICIES = ("drop", "disconnect")
+
+
+class TokenBucket:
+    """
+    Token bucket holding up to `burst` tokens and regaining `refill` per
+    second. `spend` may overdraw it and returns False when it is; `delay`
+    is the time until it is out of debt.
+    """
+
+    def __init__(
+        self,
+        burst: float = 50,
+        refill: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if refill <= 0:
+            raise ValueError(f"Token bucket refill must be positive, not {refill!r}")
+        self.burst = burst
+        self.refill = refill
+        self.clock = clock
+        self.tokens = float(burst)
+        self._last = clock()
+
+    def _update(self) -> None:
+        now = self.clock()
+        self.tokens = min(self.burst, self.tokens + (now - self._last) * self.refill)
+        self._last = now
+
+    def spend(self, n: int = 1) -> bool:
+        self._update()
+        self.tokens -= n
+        return self.tokens >= 0
+
+    def delay(self) -> float:
+        if self.tokens >= 0:
+            return 0.0
+        self._update()
+        return max(0.0, -self.tokens / self.refill)
+
+
+class AuxSession:
+    """
+    Protocol state of one AUX port connection.
+
+    Bytes are passed to the mount in transparent mode; `$$$` switches to
+    the WiFly command mode until `exit` is received. The session counts the
+    bytes and packets it exchanges and the bus errors its input causes.
+
+    With an error `budget`, those errors (malformed packets, bad checksums,
+    handler exceptions) are charged to it. Once the budget is exhausted the
+    `"drop"` policy discards the connection's input unparsed for
+    `drop_seconds` (the server stops reading it, which throttles the peer
+    through TCP flow control), and `"disconnect"` sets `closed` for the
+    server to close the connection. With a `rate_limit`, each received
+    packet costs a token and the server stops reading while the bucket is
+    in debt (`throttle`).
+    """
+
+    def __init__(
+        self,
+        mount: Any,
+        peer: Any = None,
+        budget: Optional[TokenBucket] = None,
+        policy: str = "drop",
+        drop_seconds: float = 10.0,
+        rate_limit: Optional[TokenBucket] = None,
+    ):
+        if policy not in ERROR_POLICIES:
+            raise ValueError(f"Unknown error policy {policy!r}")
+        self.mount = mount
+        self.peer = peer
+        self.transparent = True
+        self.budget = budget
+        self.policy = policy
+        self.drop_seconds = drop_seconds
+        self.rate_limit = rate_limit
+        self.closed = False
+        self.started = time.time()
+        self.bytes_rx = 0
+        self.bytes_tx = 0
+        self.packets_rx = 0
+        self.packets_tx = 0
+        self.errors = 0
+        self.dropped_bytes = 0
+        self._drop_until = 0.0
+        self._partial = b""
+
+    def _handle(self, data: bytes) -> bytes:
+        if self.closed or (self._drop_until and self.drop_remaining() > 0):
+            self.dropped_bytes += len(data)
+            return b""
+        if self._partial:
+            data = self._partial + data
+            self._partial = b""
+        bus = self.mount.bus
+        errors, packets_rx, packets_tx = bus.errors, bus.packets_rx, bus.packets_tx
+        resp = self.mount.handle_msg(data, final=False)
+        if bus.tail >= 0:
+            # A packet split between reads (at most 257 bytes)
+            self._partial = data[bus.tail :]
+        packets_rx = bus.packets_rx - packets_rx
+        self.packets_rx += packets_rx
+        self.packets_tx += bus.packets_tx - packets_tx
+        if self.rate_limit is not None and packets_rx:
+            self.rate_limit.spend(packets_rx)
+        errors = bus.errors - errors
+        if errors:
+            self.errors += errors
+            if self.budget is not None and not self.budget.spend(errors):
+                self._exhausted()
+        return resp
+
+    def drop_remaining(self) -> float:
+        """Seconds until input is accepted again (servers stop reading)."""
+        if not self._drop_until:
+            return 0.0
+        return max(0.0, self._drop_until - self.budget.clock())
+
+    def throttle(self) -> float:
+        """Seconds the server should wait before reading more input."""
+        pause = self.drop_remaining()
+        if self.rate_limit is not None:
+            pause = max(pause, self.rate_limit.delay())
+        return pause
+
+    def _exhausted(self) -> None:
+        if self.policy == "disconnect":
+            self.closed = True
+            action = "disconnecting"
+        else:
+            self._drop_until = self.budget.clock() + self.drop_seconds
+            action = f"dropping its input for {self.drop_seconds:g} s"
+        # At most once per drop period: not gated by the CONNECTION category
+        logger.warning(
+            f"Client {self.peer} exceeded its error budget "
+            f"({self.errors} errors), {action}"
+        )
+
+    def summary(self) -> str:
+        return (
+            f"{self.bytes_rx} bytes / {self.packets_rx} packets in, "
+            f"{self.bytes_tx} bytes / {self.packets_tx} packets out, "
+            f"{self.errors} errors in {time.time() - self.started:.0f} s"
+        )
+
+    def feed(self, data: bytes) -> bytes:
+        """Processes one chunk of received bytes and returns the reply bytes."""
+        self.bytes_rx += len(data)
+        resp = self._feed(data)
+        self.bytes_tx += len(resp)
+        return resp
+
+    def _feed(self, data: bytes) -> bytes:
+        if self.transparent:
+            if data[:3] == b"$$$":
+                self.transparent = False
+                nselog.log_connection(
+                    logger, f"Client {self.peer} entered WiFly command mode"
+                )
+                return b"CMD\r\n"
+            if self.mount:
+                return self._handle(data)
+            return b""
+
+        message = data.decode("ascii", errors="ignore").strip()
+        if message == "exit":
+            self.transparent = True
+            nselog.log_connection(
+                logger, f"Client {self.peer} exited WiFly command mode"
+            )
+            return data + b"\r\nEXIT\r\n"
+        return data + b"\r\nAOK\r\n<2.40-CEL> "
+
+
+class FanOut:
+    """
+    Bus traffic fan-out to every subscribed AUX connection.
+
+    The real main board repeats all bus traffic on every channel, so a
+    client sees the commands of the others and their responses. Each
+    chunk of echoes and responses is written, as the same `bytes` object,
+    to the subscribers' transports in subscription order; since the
+    writes happen in one step of the event loop, every client receives
+    the chunks in the same order.
+
+    The requester is flow controlled by its own `drain`. The others are
+    not awaited: a subscriber whose unsent buffer exceeds `max_buffer`
+    bytes is not keeping up with the bus and its connection is aborted.
+    """
+
+    def __init__(self, max_buffer: int = 262144):
+        self.max_buffer = max_buffer
+        self.subscribers: Dict[int, Any] = {}  # Connection id -> transport
+        self.chunks = 0
+        self.bytes = 0
+        self.overflows = 0
+
+    def subscribe(self, conn_id: int, transport: Any) -> None:
+        self.subscribers[conn_id] = transport
+
+    def unsubscribe(self, conn_id: int) -> None:
+        self.subscribers.pop(conn_id, None)
+
+    def publish(self, data: bytes) -> None:
+        """Writes one chunk of bus traffic to all subscribers."""
+        self.chunks += 1
+        self.bytes += len(data)
+        lagging = None
+        for conn_id, transport in self.subscribers.items():
+            if transport.is_closing():
+                continue
+            transport.write(data)
+            if transport.get_write_buffer_size() > self.max_buffer:
+                lagging = (lagging or []) + [conn_id]
+        if lagging:
+            for conn_id in lagging:
+                self.overflows += 1
+                logger.warning(
+                    f"AUX connection {conn_id} is not keeping up with the bus "
+                    f"(over {self.max_buffer} bytes unsent), disconnecting"
+                )
+                self.subscribers.pop(conn_id).abort()
+
+
+class LoopbackChannel:
+    """
+    In-process `bytes -> bytes` channel to a `NexStarMount`.
+
+    Replies carry the same echo and response packets as port 2000, so
+    driver test harnesses can exchange packets without kernel networking.
+    Simulation time only advances through `advance()`, which makes
+    exchanges deterministic.
+    """
+
+    def __init__(self, mount: Any, src_id: int = 0x20):
+        self.mount = mount
+        self.src_id = src_id
+        self.session = AuxSession(mount, peer="loopback")
+
+    def send(self, data: bytes) -> bytes:
+        """Writes raw bytes to the port and returns everything it sends back."""
+        return self.session.feed(data)
+
+    __call__ = send
+
+    def exchange(
+        self, dst: int, cmd: int, data: bytes = b"", src: Optional[int] = None
+    ) -> Tuple[Optional[bytes], List[bytes]]:
+        """
+        Sends one AUX command and splits the reply.
+
+        Returns:
+            (echo, responses): the echoed packet (or None if the target is
+            silent) and the list of response packets, all including the
+            leading `;`.
+        """
+        pkt = encode_packet(self.src_id if src is None else src, dst, cmd, data)
+        packets = [b";" + p for p in split_cmds(self.send(pkt))]
+        if packets and packets[0] == pkt:
+            return packets[0], packets[1:]
+        return None, packets
+
+    def query(self, dst: int, cmd: int, data: bytes = b"") -> Optional[bytes]:
+        """Sends one AUX command and returns the payload of its response."""
+        _, responses = self.exchange(dst, cmd, data)
+        for resp in responses:
+            if resp[4] == cmd and resp[2] == dst:
+                return resp[5:-1]
+        return None
+
+    def advance(self, seconds: float, step: float = 0.1) -> None:
+        """Advances simulation time in ticks of at most `step` seconds."""
+        while seconds > 1e-12:
+            dt = min(step, seconds)
+            self.mount.tick(dt)
+            seconds -= dt
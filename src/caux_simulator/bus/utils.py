@@ -10,7 +10,7 @@ from typing import Tuple, List
 
 def make_checksum(data: bytes) -> int:
     """Calculates 2's complement checksum for AUX packet."""
-    return (~sum([c for c in bytes(data)]) + 1) & 0xFF
+    return -sum(data) & 0xFF
 
 
 def decode_command(cmd: bytes) -> Tuple[int, int, int, int, bytes, int]:
@@ -3,8 +3,7 @@ Base class for simulated AUX bus devices.
 """
 
 import logging
-from abc import ABC, abstractmethod
-from typing import Optional, Dict, Any, Tuple
+from typing import Optional, Dict, Any, Callable, Tuple
 
 try:
     from .. import nse_logging as nselog
@@ -14,8 +13,18 @@ except ImportError:
 logger = logging.getLogger(__name__)
 
 
-class AuxDevice(ABC):
-    """Abstract base class for all simulated AUX devices."""
+class AuxDevice:
+    """
+    Base class for all simulated AUX devices.
+
+    Devices are slotted and their command handlers live in a class-level
+    `handlers` table (command id -> function called as
+    `handler(self, data, sender_id, receiver_id)`), so an instance carries
+    only its own state. Subclasses declare their state in `__slots__` and
+    extend the table of their base: `handlers = {**Base.handlers, ...}`.
+    """
+
+    __slots__ = ("device_id", "version", "config", "events")
 
     def __init__(
         self, device_id: int, version: Tuple[int, int, int, int], config: Dict[str, Any]
@@ -23,23 +32,37 @@ class AuxDevice(ABC):
         self.device_id = device_id
         self.version = version
         self.config = config
-        self.handlers: Dict[int, Any] = {0xFE: self.handle_get_version}
+        # Optional bus.events.EventBus of the mount, attached on registration
+        self.events = None
 
-    @abstractmethod
     def handle_command(
         self, sender_id: int, command_id: int, data: bytes
     ) -> Optional[bytes]:
         """Process an incoming command and return response data payload or None."""
-        pass
+        handler = self.handlers.get(command_id)
+        if handler is None:
+            return None
+        return handler(self, data, sender_id, self.device_id)
 
     def tick(self, interval: float) -> None:
         """Update internal state/physics based on time interval."""
         pass
 
+    def reset(self) -> None:
+        """Restore the power-on state of the device."""
+        pass
+
+    def emit(self, kind: Any, value: Any = None) -> None:
+        """Publishes a state change event if an event bus is attached."""
+        if self.events is not None:
+            self.events.emit(kind, self.device_id, value)
+
     def handle_get_version(self, data: bytes, sender_id: int, rcv_id: int) -> bytes:
         """Standard GET_VER (0xFE) handler."""
         return bytes(self.version)
 
+    handlers: Dict[int, Callable[..., bytes]] = {0xFE: handle_get_version}
+
     def log_cmd(self, sender_id: int, cmd_name: str, data: bytes = b""):
         """Utility for consistent command logging."""
         nselog.log_command(
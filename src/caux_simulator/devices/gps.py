@@ -3,7 +3,7 @@ Simulated GPS Receiver (0xB0).
 """
 
 import logging
-from typing import Dict, Any, List, Tuple, Union, Optional
+from typing import Dict, Any, List, Tuple, Union
 from datetime import datetime, timezone
 from .base import AuxDevice
 
@@ -13,41 +13,21 @@ logger = logging.getLogger(__name__)
 class GPSReceiver(AuxDevice):
     """Simulates a Celestron GPS module."""
 
+    __slots__ = ("lat", "lon", "linked")
+
     def __init__(self, device_id: int, config: Dict[str, Any], version=(7, 11, 0, 0)):
         # Version 7.11
         super().__init__(device_id, version, config)
+        self.reset()
 
-        obs_cfg = config.get("observer", {})
+    def reset(self) -> None:
+        obs_cfg = self.config.get("observer", {})
 
         # Convert degrees to [deg, min, sec, 0] format used by NexStar GPS protocol
         self.lat = self._dec_to_nexstar(float(obs_cfg.get("latitude", 50.0)))
         self.lon = self._dec_to_nexstar(float(obs_cfg.get("longitude", 20.0)))
         self.linked = True
 
-        # Register GPS specific handlers
-        self.handlers.update(
-            {
-                0x01: self.get_gps_lat,
-                0x02: self.get_gps_long,
-                0x31: self.set_gps_lat,
-                0x32: self.set_gps_long,
-                0x33: self.get_gps_time,
-                0x34: self.set_gps_time,
-                0x36: self.get_gps_time_valid,
-                0x37: self.get_gps_linked,
-                0x38: self.get_gps_sats,
-                0x3B: self.get_gps_date,
-                0x3C: self.set_gps_date,
-            }
-        )
-
-    def handle_command(
-        self, sender_id: int, command_id: int, data: bytes
-    ) -> Optional[bytes]:
-        if command_id in self.handlers:
-            return self.handlers[command_id](data, sender_id, self.device_id)
-        return None
-
     def _dec_to_nexstar(self, deg: float) -> List[int]:
         d = abs(deg)
         dd = int(d)
@@ -91,3 +71,19 @@ class GPSReceiver(AuxDevice):
 
     def set_gps_date(self, data: bytes, snd: int, rcv: int) -> bytes:
         return b""
+
+    # GPS specific handlers
+    handlers = {
+        **AuxDevice.handlers,
+        0x01: get_gps_lat,
+        0x02: get_gps_long,
+        0x31: set_gps_lat,
+        0x32: set_gps_long,
+        0x33: get_gps_time,
+        0x34: set_gps_time,
+        0x36: get_gps_time_valid,
+        0x37: get_gps_linked,
+        0x38: get_gps_sats,
+        0x3B: get_gps_date,
+        0x3C: set_gps_date,
+    }
@@ -3,8 +3,9 @@ Simulated Light Controller (0xBF).
 """
 
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any
 from .base import AuxDevice
+from ..bus.events import EventType
 
 logger = logging.getLogger(__name__)
 
@@ -12,28 +13,18 @@ logger = logging.getLogger(__name__)
 class LightController(AuxDevice):
     """Simulates the mount lighting controller (Tray, WiFi, Logo)."""
 
+    __slots__ = ("lt_tray", "lt_wifi", "lt_logo")
+
     def __init__(self, device_id: int, config: Dict[str, Any], version=(7, 11, 0, 0)):
         # Version 7.11
         super().__init__(device_id, version, config)
+        self.reset()
 
+    def reset(self) -> None:
         self.lt_tray = 128
         self.lt_wifi = 255
         self.lt_logo = 64
 
-        # Register Light specific handlers
-        self.handlers.update(
-            {
-                0x10: self.handle_cmd_0x10,
-            }
-        )
-
-    def handle_command(
-        self, sender_id: int, command_id: int, data: bytes
-    ) -> Optional[bytes]:
-        if command_id in self.handlers:
-            return self.handlers[command_id](data, sender_id, self.device_id)
-        return None
-
     def handle_cmd_0x10(self, data: bytes, snd: int, rcv: int) -> bytes:
         """GET/SET_LEVEL for mount lights."""
         if len(data) == 2:
@@ -47,6 +38,10 @@ class LightController(AuxDevice):
             else:
                 self.lt_wifi = level
             self.log_cmd(snd, f"SET_LIGHT({selector})", data[1:2])
+            self.emit(
+                EventType.LIGHT_CHANGED,
+                {"tray": self.lt_tray, "logo": self.lt_logo, "wifi": self.lt_wifi},
+            )
             return b""  # Ack
         elif len(data) == 1:
             # GET logic
@@ -59,3 +54,9 @@ class LightController(AuxDevice):
                 val = self.lt_wifi
             return bytes([val])
         return b""
+
+    # Light specific handlers
+    handlers = {
+        **AuxDevice.handlers,
+        0x10: handle_cmd_0x10,
+    }
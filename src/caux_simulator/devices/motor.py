@@ -3,9 +3,11 @@ Simulated Motor Controller (MC) for AZM and ALT axes.
 """
 
 import logging
+import time
 from decimal import Decimal, getcontext
 from typing import Tuple, Dict, Any, Optional
 from .base import AuxDevice
+from ..bus.events import EventType
 from ..bus.utils import pack_int3_raw, unpack_int3_raw, unpack_int2
 
 try:
@@ -43,6 +45,41 @@ RATES = {
 class MotorController(AuxDevice):
     """Simulates an AZM or ALT motor controller using integer step counts."""
 
+    __slots__ = (
+        # Configuration and statistics (kept across reset())
+        "axis_name",
+        "phys_backlash",
+        "unbalance",
+        "initial_pos",
+        "clock",
+        "gotos_completed",
+        "anti_stall_count",
+        "backlash_jumps",
+        "event_threshold",
+        # Power-on state (see reset())
+        "steps",
+        "trg_steps",
+        "backlash_corr_pos",
+        "backlash_corr_neg",
+        "_backlash_slack",
+        "pointing_steps",
+        "last_direction",
+        "_step_accumulator",
+        "rate_steps",
+        "guide_rate_steps",
+        "max_rate_steps",
+        "use_maxrate",
+        "approach",
+        "slewing",
+        "goto",
+        "last_cmd",
+        "goto_start_time",
+        "_event_steps",
+        "_goto_stuck_start",
+        "cordwrap",
+        "cordwrap_steps",
+    )
+
     def __init__(
         self,
         device_id: int,
@@ -54,26 +91,42 @@ class MotorController(AuxDevice):
         self.axis_name = "azm" if device_id == 0x10 else "alt"
         imp = config.get("simulator", {}).get("imperfections", {})
 
-        # Positions stored as 24-bit integers [0, 16777216)
-        self.steps = int((initial_pos % 1.0) * STEPS_PER_REV)
-        self.trg_steps = self.steps
-
         # Physical Backlash (Actual gear slack in encoder steps)
         # This is the physical gap that the motor must move through before the OTA follows.
         self.phys_backlash = int(
             imp.get(f"{self.axis_name}_backlash_steps", imp.get("backlash_steps", 0))
         )
 
+        # Gravity unbalance: -1 (loaded negative), 0 (neutral), 1 (loaded positive)
+        # If unbalanced, gravity pulls the OTA to one side of the slack gap.
+        self.unbalance = int(imp.get(f"{self.axis_name}_unbalance", 0))
+
+        self.initial_pos = initial_pos
+        # Time source of the anti-stall timer (wall clock by default;
+        # accelerated-time runs substitute the simulation clock)
+        self.clock = time.time
+        # Statistics (kept across reset())
+        self.gotos_completed = 0
+        self.anti_stall_count = 0
+        self.backlash_jumps = 0
+        # Movement [steps] that publishes a POSITION_CHANGED event (~1 arcsec)
+        self.event_threshold = int(
+            config.get("simulator", {}).get("event_position_steps", 13)
+        )
+        self.reset()
+
+    def reset(self) -> None:
+        """Restores the power-on state (position, rates, backlash, flags)."""
+        # Positions stored as 24-bit integers [0, 16777216)
+        self.steps = int((self.initial_pos % 1.0) * STEPS_PER_REV)
+        self.trg_steps = self.steps
+
         # Backlash Correction (MC internal compensation jump values)
         # These are set via the AUX protocol (0x10/0x11) and represent how many steps
         # the MC "jumps" to quickly take up physical slack.
         self.backlash_corr_pos = 0
         self.backlash_corr_neg = 0
 
-        # Gravity unbalance: -1 (loaded negative), 0 (neutral), 1 (loaded positive)
-        # If unbalanced, gravity pulls the OTA to one side of the slack gap.
-        self.unbalance = int(imp.get(f"{self.axis_name}_unbalance", 0))
-
         # Internal slack state [0, phys_backlash]
         # Represents the current position of the motor within the gear gap.
         # If unbalanced, initialize slack to the loaded side.
@@ -98,43 +151,11 @@ class MotorController(AuxDevice):
         self.goto = False
         self.last_cmd = ""
         self.goto_start_time = 0.0
-
-        # Register MC specific handlers
-        self.handlers.update(
-            {
-                0x01: self.get_position,
-                0x02: self.handle_goto_fast,
-                0x04: self.set_position,
-                0x05: self.get_model,
-                0x06: self.set_pos_guiderate,
-                0x07: self.set_neg_guiderate,
-                0x0B: self.handle_level_start,
-                0x10: self.set_backlash_pos,
-                0x11: self.set_backlash_neg,
-                0x12: self.get_level_done,
-                0x13: self.get_slew_done,
-                0x17: self.handle_goto_slow,
-                0x18: self.get_seek_done,
-                0x19: self.handle_seek_index,
-                0x20: self.handle_set_maxrate,
-                0x21: self.get_maxrate,
-                0x22: self.handle_enable_maxrate,
-                0x23: self.get_maxrate_enabled,
-                0x24: self.handle_move_pos,
-                0x25: self.handle_move_neg,
-                0x38: self.handle_enable_cordwrap,
-                0x39: self.handle_disable_cordwrap,
-                0x3A: self.handle_set_cordwrap_pos,
-                0x3B: self.get_cordwrap_enabled,
-                0x3C: self.get_cordwrap_pos,
-                0x40: self.get_backlash_pos,
-                0x41: self.get_backlash_neg,
-                0x47: self.get_autoguide_rate,
-                0xFC: self.get_approach,
-                0xFD: self.set_approach,
-                0xFF: self.get_position,
-            }
-        )
+        self._event_steps = self.steps
+        # Start of the current GOTO approach, for the anti-stall timer
+        self._goto_stuck_start: Optional[float] = None
+        self.cordwrap = False
+        self.cordwrap_steps = 0
 
     def _apply_backlash_jump(self, new_rate: Decimal):
         """Applies internal MC backlash correction jump when reversing direction."""
@@ -155,6 +176,7 @@ class MotorController(AuxDevice):
                     jump = Decimal(corr) if new_dir > 0 else Decimal(-corr)
                     # The jump is an active motor movement
                     self._step_accumulator += jump
+                    self.backlash_jumps += 1
                     logger.debug(
                         f"[0x{self.device_id:02x}] Backlash Jump: {jump} steps (Direction reversal)"
                     )
@@ -184,6 +206,7 @@ class MotorController(AuxDevice):
         self._step_accumulator = Decimal(0)
         # Reset slack to loaded side if unbalanced
         self._backlash_slack = 0 if self.unbalance <= 0 else self.phys_backlash
+        self._emit_position()
 
     @property
     def trg_pos(self) -> float:
@@ -210,13 +233,6 @@ class MotorController(AuxDevice):
     def guide_rate(self, val: float):
         self.guide_rate_steps = Decimal(val) * STEPS_PER_REV
 
-    def handle_command(
-        self, sender_id: int, command_id: int, data: bytes
-    ) -> Optional[bytes]:
-        if command_id in self.handlers:
-            return self.handlers[command_id](data, sender_id, self.device_id)
-        return None
-
     # --- MC Command Handlers ---
 
     def get_position(self, data: bytes, snd: int, rcv: int) -> bytes:
@@ -225,6 +241,7 @@ class MotorController(AuxDevice):
     def set_position(self, data: bytes, snd: int, rcv: int) -> bytes:
         self.steps = self.trg_steps = self.pointing_steps = unpack_int3_raw(data)
         self._step_accumulator = Decimal(0)
+        self._emit_position()
         return b""
 
     def get_model(self, data: bytes, snd: int, rcv: int) -> bytes:
@@ -240,8 +257,7 @@ class MotorController(AuxDevice):
             )
 
         # Reset anti-stall timer for new movement
-        if hasattr(self, "_goto_stuck_start"):
-            del self._goto_stuck_start
+        self._goto_stuck_start = None
 
         # Reset if new target is received, even if busy
         self.trg_steps = new_trg
@@ -251,6 +267,7 @@ class MotorController(AuxDevice):
 
         # High speed 4 deg/sec = 186411 steps/sec
         self.rate_steps = Decimal(186411) if diff > 0 else Decimal(-186411)
+        self._goto_started()
         self.log_cmd(snd, f"GOTO_FAST to steps={self.trg_steps}")
         return b""
 
@@ -264,8 +281,7 @@ class MotorController(AuxDevice):
             )
 
         # Reset anti-stall timer for the slow phase
-        if hasattr(self, "_goto_stuck_start"):
-            del self._goto_stuck_start
+        self._goto_stuck_start = None
 
         self.trg_steps = new_trg
         self.slewing = self.goto = True
@@ -275,45 +291,48 @@ class MotorController(AuxDevice):
         # Slow rate 0.5 deg/sec = 23301 steps/sec
         r = Decimal(23301)
         self.rate_steps = r if diff > 0 else -r
+        self._goto_started()
         self.log_cmd(snd, f"GOTO_SLOW to steps={self.trg_steps}")
         return b""
 
     def handle_move_pos(self, data: bytes, snd: int, rcv: int) -> bytes:
-        new_rate = Decimal(RATES.get(data[0], 0))
+        new_rate = Decimal(RATES.get(data[0], 0) if data else 0)
         self._apply_backlash_jump(new_rate)
         self.rate_steps = new_rate
         self.slewing = self.rate_steps > 0
         self.goto = False
+        self.emit(EventType.RATE_CHANGED, float(new_rate))
         return b""
 
     def handle_move_neg(self, data: bytes, snd: int, rcv: int) -> bytes:
-        new_rate = Decimal(-RATES.get(data[0], 0))
+        new_rate = Decimal(-RATES.get(data[0], 0) if data else 0)
         self._apply_backlash_jump(new_rate)
         self.rate_steps = new_rate
         self.slewing = self.rate_steps < 0
         self.goto = False
+        self.emit(EventType.RATE_CHANGED, float(new_rate))
         return b""
 
     def get_slew_done(self, data: bytes, snd: int, rcv: int) -> bytes:
         return b"\xff" if not self.slewing else b"\x00"
 
     def handle_level_start(self, data: bytes, snd: int, rcv: int) -> bytes:
-        if hasattr(self, "_goto_stuck_start"):
-            del self._goto_stuck_start
+        self._goto_stuck_start = None
         self.trg_steps = 0
         self.slewing = self.goto = True
         self.rate_steps = Decimal(23300)  # 5 deg/sec
+        self._goto_started()
         return b""
 
     def get_level_done(self, data: bytes, snd: int, rcv: int) -> bytes:
         return b"\xff" if self.steps == 0 else b"\x00"
 
     def handle_seek_index(self, data: bytes, snd: int, rcv: int) -> bytes:
-        if hasattr(self, "_goto_stuck_start"):
-            del self._goto_stuck_start
+        self._goto_stuck_start = None
         self.trg_steps = 0
         self.slewing = self.goto = True
         self.rate_steps = Decimal(23300)
+        self._goto_started()
         return b""
 
     def get_seek_done(self, data: bytes, snd: int, rcv: int) -> bytes:
@@ -328,7 +347,8 @@ class MotorController(AuxDevice):
         return bytes.fromhex("0fa01194")
 
     def handle_enable_maxrate(self, data: bytes, snd: int, rcv: int) -> bytes:
-        self.use_maxrate = bool(data[0])
+        if len(data) > 0:
+            self.use_maxrate = bool(data[0])
         return b""
 
     def get_maxrate_enabled(self, data: bytes, snd: int, rcv: int) -> bytes:
@@ -347,10 +367,10 @@ class MotorController(AuxDevice):
         return b""
 
     def get_cordwrap_enabled(self, data: bytes, snd: int, rcv: int) -> bytes:
-        return b"\xff" if hasattr(self, "cordwrap") and self.cordwrap else b"\x00"
+        return b"\xff" if self.cordwrap else b"\x00"
 
     def get_cordwrap_pos(self, data: bytes, snd: int, rcv: int) -> bytes:
-        return pack_int3_raw(getattr(self, "cordwrap_steps", 0))
+        return pack_int3_raw(self.cordwrap_steps)
 
     def get_backlash_pos(self, data: bytes, snd: int, rcv: int) -> bytes:
         return bytes([self.backlash_corr_pos & 0xFF])
@@ -375,7 +395,8 @@ class MotorController(AuxDevice):
         return bytes([self.approach])
 
     def set_approach(self, data: bytes, snd: int, rcv: int) -> bytes:
-        self.approach = data[0]
+        if len(data) > 0:
+            self.approach = data[0]
         return b""
 
     def set_pos_guiderate(self, data: bytes, snd: int, rcv: int) -> bytes:
@@ -388,14 +409,31 @@ class MotorController(AuxDevice):
         # Steps/sec = Value * (128 / 10125)
         val = unpack_int3_raw(data)
         self.guide_rate_steps = (Decimal(val) * 128) / 10125
+        self.emit(EventType.GUIDE_RATE_CHANGED, float(self.guide_rate_steps))
         return b""
 
     def set_neg_guiderate(self, data: bytes, snd: int, rcv: int) -> bytes:
         # Inverse of positive guiderate
         val = unpack_int3_raw(data)
         self.guide_rate_steps = -(Decimal(val) * 128) / 10125
+        self.emit(EventType.GUIDE_RATE_CHANGED, float(self.guide_rate_steps))
         return b""
 
+    def _goto_started(self) -> None:
+        self.emit(EventType.GOTO_STARTED, self.trg_steps)
+        self.emit(EventType.RATE_CHANGED, float(self.rate_steps))
+
+    def _goto_finished(self) -> None:
+        self.gotos_completed += 1
+        if self.events is not None:
+            self.emit(EventType.GOTO_FINISHED, self.steps)
+            self.emit(EventType.RATE_CHANGED, 0.0)
+            self._emit_position()
+
+    def _emit_position(self) -> None:
+        self._event_steps = self.steps
+        self.emit(EventType.POSITION_CHANGED, self.steps)
+
     def _get_diff(self) -> int:
         """Returns signed step difference to target, handling AZM wrap."""
         diff = self.trg_steps - self.steps
@@ -427,6 +465,7 @@ class MotorController(AuxDevice):
                 self.rate_steps = Decimal(0)
                 self.slewing = self.goto = False
                 self._step_accumulator = Decimal(0)
+                self._goto_finished()
                 logger.debug(
                     f"[0x{self.device_id:02x}] GOTO Finished at steps={self.steps}"
                 )
@@ -446,11 +485,9 @@ class MotorController(AuxDevice):
                 r = min_r
 
             # Anti-stall timeout check
-            import time
-
-            if not hasattr(self, "_goto_stuck_start"):
-                self._goto_stuck_start = time.time()
-            elif time.time() - self._goto_stuck_start > 5.0 and abs(diff) < 50:
+            if self._goto_stuck_start is None:
+                self._goto_stuck_start = self.clock()
+            elif self.clock() - self._goto_stuck_start > 5.0 and abs(diff) < 50:
                 # Force finish if stuck near target for > 5s
                 logger.warning(
                     f"[0x{self.device_id:02x}] GOTO Anti-Stall Triggered (Steps {self.steps} -> {self.trg_steps})"
@@ -459,14 +496,14 @@ class MotorController(AuxDevice):
                 self.rate_steps = Decimal(0)
                 self.slewing = self.goto = False
                 self._step_accumulator = Decimal(0)
-                if hasattr(self, "_goto_stuck_start"):
-                    del self._goto_stuck_start
+                self.anti_stall_count += 1
+                self._goto_finished()
+                self._goto_stuck_start = None
                 return
 
             self.rate_steps = s * r
         else:
-            if hasattr(self, "_goto_stuck_start"):
-                del self._goto_stuck_start
+            self._goto_stuck_start = None
 
         # Accumulate whole steps from the rate (High Precision)
         move_dec = (self.rate_steps + self.guide_rate_steps) * interval_dec
@@ -511,6 +548,11 @@ class MotorController(AuxDevice):
                     0, min(STEPS_PER_REV - 1, self.pointing_steps)
                 )
 
+            if self.events is not None:
+                moved = (self.steps - self._event_steps) % STEPS_PER_REV
+                if min(moved, STEPS_PER_REV - moved) >= self.event_threshold:
+                    self._emit_position()
+
         # 3. Apply "Unbalance" gravity correction (when stopped)
         if not is_moving:
             if self.unbalance > 0:  # Gravity pulls positive
@@ -528,6 +570,43 @@ class MotorController(AuxDevice):
                 self.rate_steps = Decimal(0)
                 self.slewing = self.goto = False
                 self._step_accumulator = Decimal(0)
+                self._goto_finished()
                 logger.debug(
                     f"[0x{self.device_id:02x}] GOTO Finished at steps={self.steps}"
                 )
+
+    # MC specific handlers
+    handlers = {
+        **AuxDevice.handlers,
+        0x01: get_position,
+        0x02: handle_goto_fast,
+        0x04: set_position,
+        0x05: get_model,
+        0x06: set_pos_guiderate,
+        0x07: set_neg_guiderate,
+        0x0B: handle_level_start,
+        0x10: set_backlash_pos,
+        0x11: set_backlash_neg,
+        0x12: get_level_done,
+        0x13: get_slew_done,
+        0x17: handle_goto_slow,
+        0x18: get_seek_done,
+        0x19: handle_seek_index,
+        0x20: handle_set_maxrate,
+        0x21: get_maxrate,
+        0x22: handle_enable_maxrate,
+        0x23: get_maxrate_enabled,
+        0x24: handle_move_pos,
+        0x25: handle_move_neg,
+        0x38: handle_enable_cordwrap,
+        0x39: handle_disable_cordwrap,
+        0x3A: handle_set_cordwrap_pos,
+        0x3B: get_cordwrap_enabled,
+        0x3C: get_cordwrap_pos,
+        0x40: get_backlash_pos,
+        0x41: get_backlash_neg,
+        0x47: get_autoguide_rate,
+        0xFC: get_approach,
+        0xFD: set_approach,
+        0xFF: get_position,
+    }
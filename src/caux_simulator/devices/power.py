@@ -4,8 +4,9 @@ Simulated Power Module (Battery and Charger).
 
 import struct
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any
 from .base import AuxDevice
+from ..bus.events import EventType
 
 logger = logging.getLogger(__name__)
 
@@ -13,33 +14,19 @@ logger = logging.getLogger(__name__)
 class PowerModule(AuxDevice):
     """Simulates Battery (0xB6) and Charger (0xB7) devices."""
 
+    __slots__ = ("voltage", "current", "status", "charging")
+
     def __init__(self, device_id: int, config: Dict[str, Any], version=(2, 0, 0, 0)):
         # Main board version 2.00
         super().__init__(device_id, version, config)
+        self.reset()
 
+    def reset(self) -> None:
         self.voltage = 12345678  # microvolts
         self.current = 2468  # mA
         self.status = 0x02  # HIGH
         self.charging = False
 
-        # Register Power specific handlers
-        self.handlers.update(
-            {
-                0x01: self.get_voltage,
-                0x02: self.get_current,
-                0x03: self.get_status,
-                0x10: self.handle_cmd_0x10,
-                0x18: self.handle_cmd_0x18,
-            }
-        )
-
-    def handle_command(
-        self, sender_id: int, command_id: int, data: bytes
-    ) -> Optional[bytes]:
-        if command_id in self.handlers:
-            return self.handlers[command_id](data, sender_id, self.device_id)
-        return None
-
     def get_voltage(self, data: bytes, snd: int, rcv: int) -> bytes:
         # Standard voltage query returns 3 bytes
         return struct.pack("!i", self.voltage // 1000)[1:]
@@ -61,6 +48,7 @@ class PowerModule(AuxDevice):
         elif rcv == 0xB7:  # CHG
             if len(data) > 0:
                 self.charging = bool(data[0])
+                self.emit(EventType.CHARGER_CHANGED, self.charging)
                 return b""  # Ack
             return bytes([1 if self.charging else 0])
         return b""
@@ -70,3 +58,13 @@ class PowerModule(AuxDevice):
         if rcv == 0xB6:  # BAT
             return struct.pack("!i", self.current)[2:]
         return b""
+
+    # Power specific handlers
+    handlers = {
+        **AuxDevice.handlers,
+        0x01: get_voltage,
+        0x02: get_current,
+        0x03: get_status,
+        0x10: handle_cmd_0x10,
+        0x18: handle_cmd_0x18,
+    }
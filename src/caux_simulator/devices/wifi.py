@@ -3,8 +3,9 @@ Simulated WiFi Module (0xB5).
 """
 
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any
 from .base import AuxDevice
+from ..bus.events import EventType
 
 logger = logging.getLogger(__name__)
 
@@ -12,27 +13,12 @@ logger = logging.getLogger(__name__)
 class WiFiModule(AuxDevice):
     """Simulates the WiFly / Evolution WiFi bridge."""
 
+    __slots__ = ()
+
     def __init__(self, device_id: int, config: Dict[str, Any], version=(2, 40, 0, 0)):
         # WiFly version 2.40
         super().__init__(device_id, version, config)
 
-        # Register Handshake handlers
-        self.handlers.update(
-            {
-                0x30: self.handle_set_time,
-                0x31: self.handle_set_location,
-                0x32: self.handle_config,
-                0x49: self.handle_ping,
-            }
-        )
-
-    def handle_command(
-        self, sender_id: int, command_id: int, data: bytes
-    ) -> Optional[bytes]:
-        if command_id in self.handlers:
-            return self.handlers[command_id](data, sender_id, self.device_id)
-        return None
-
     def handle_set_time(self, data: bytes, snd: int, rcv: int) -> bytes:
         """WiFi command 0x30 (Set Time/Date)."""
         from datetime import datetime, timezone, timedelta
@@ -67,6 +53,7 @@ class WiFiModule(AuxDevice):
                 if "observer" not in self.config:
                     self.config["observer"] = {}
                 self.config["observer"]["time_offset"] = time_diff
+                self.emit(EventType.TIME_SYNCED, time_diff)
 
             except Exception as e:
                 logger.error(f"Error parsing WiFi time: {e}")
@@ -87,6 +74,7 @@ class WiFiModule(AuxDevice):
                 self.config["observer"] = {}
             self.config["observer"]["latitude"] = lat
             self.config["observer"]["longitude"] = lon
+            self.emit(EventType.LOCATION_SYNCED, (lat, lon))
 
         return b"\x01"  # Success
 
@@ -99,3 +87,12 @@ class WiFiModule(AuxDevice):
         """WiFi command 0x49 (Ping/Status)."""
         self.log_cmd(snd, "WIFI_PING", data)
         return b"\x00"  # Success
+
+    # Handshake handlers
+    handlers = {
+        **AuxDevice.handlers,
+        0x30: handle_set_time,
+        0x31: handle_set_location,
+        0x32: handle_config,
+        0x49: handle_ping,
+    }
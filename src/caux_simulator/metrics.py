@@ -0,0 +1,224 @@
+"""
+Simulator Metrics
+
+Cheap in-process counters and histograms, rendered in the Prometheus text
+exposition format on demand. Collection only increments integers and
+bucket counts; names and labels are formatted when `/metrics` is scraped.
+"""
+
+import asyncio
+import logging
+from bisect import bisect_left
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+try:
+    from .bus.protocol import trg_names, cmd_names
+except ImportError:
+    from bus.protocol import trg_names, cmd_names  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+# Handler latency buckets [s]; AUX handlers run in microseconds
+HANDLER_BUCKETS = (5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3, 5e-3)
+# Tick duration and event loop lag buckets [s]
+LOOP_BUCKETS = (1e-4, 5e-4, 1e-3, 2.5e-3, 5e-3, 1e-2, 2.5e-2, 5e-2, 0.1, 0.5, 1.0)
+
+
+class Histogram:
+    """Fixed-bucket histogram (cumulative counts are built at render time)."""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def render(self, name: str, labels: str = "") -> List[str]:
+        sep = "," if labels else ""
+        lines = []
+        acc = 0
+        for le, n in zip(self.buckets, self.counts):
+            acc += n
+            lines.append(f'{name}_bucket{{{labels}{sep}le="{le:g}"}} {acc}')
+        lines.append(f'{name}_bucket{{{labels}{sep}le="+Inf"}} {self.count}')
+        lbl = f"{{{labels}}}" if labels else ""
+        lines.append(f"{name}_sum{lbl} {self.sum:.9g}")
+        lines.append(f"{name}_count{lbl} {self.count}")
+        return lines
+
+
+class BusStats:
+    """Counters filled in by `AuxBus.handle_stream` when attached."""
+
+    __slots__ = (
+        "packets_rx",
+        "packets_tx",
+        "bytes_rx",
+        "bytes_tx",
+        "checksum_errors",
+        "framing_errors",
+        "silenced",
+        "handler_errors",
+        "latency",
+    )
+
+    def __init__(self) -> None:
+        self.packets_rx = 0
+        self.packets_tx = 0
+        self.bytes_rx = 0
+        self.bytes_tx = 0
+        self.checksum_errors = 0
+        self.framing_errors = 0
+        self.silenced = 0
+        self.handler_errors = 0
+        # (dst, cmd) -> handler latency histogram (its count is the command count)
+        self.latency: Dict[Tuple[int, int], Histogram] = {}
+
+    def observe_handler(self, dst: int, cmd: int, seconds: float) -> None:
+        hist = self.latency.get((dst, cmd))
+        if hist is None:
+            hist = self.latency[(dst, cmd)] = Histogram(HANDLER_BUCKETS)
+        hist.observe(seconds)
+
+
+def _metric(lines: List[str], name: str, kind: str, help_text: str) -> None:
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} {kind}")
+
+
+class Metrics:
+    """
+    All simulator metrics of one mount.
+
+    `gauges` and `counters` map a metric name to a callable returning
+    {labels: value}; the server registers its connection counts there.
+    """
+
+    def __init__(self, mount: Any):
+        self.mount = mount
+        self.bus = BusStats()
+        self.tick = Histogram(LOOP_BUCKETS)
+        self.loop_lag = Histogram(LOOP_BUCKETS)
+        self.gauges: Dict[str, Tuple[str, Callable[[], Dict[str, float]]]] = {}
+        self.counters: Dict[str, Tuple[str, Callable[[], Dict[str, float]]]] = {}
+        mount.bus.stats = self.bus
+
+    def add_gauge(
+        self, name: str, help_text: str, fn: Callable[[], Dict[str, float]]
+    ) -> None:
+        self.gauges[name] = (help_text, fn)
+
+    def add_counter(
+        self, name: str, help_text: str, fn: Callable[[], Dict[str, float]]
+    ) -> None:
+        """Like `add_gauge`, for values that only increase (named `*_total`)."""
+        self.counters[name] = (help_text, fn)
+
+    def render(self) -> str:
+        """Returns all metrics in the Prometheus text format."""
+        bus = self.bus
+        lines: List[str] = []
+        for name, help_text, value in (
+            ("caux_packets_received_total", "AUX packets received", bus.packets_rx),
+            ("caux_packets_sent_total", "AUX packets sent", bus.packets_tx),
+            ("caux_bytes_received_total", "AUX bytes received", bus.bytes_rx),
+            ("caux_bytes_sent_total", "AUX bytes sent", bus.bytes_tx),
+            (
+                "caux_checksum_errors_total",
+                "AUX packets dropped for bad checksum",
+                bus.checksum_errors,
+            ),
+            (
+                "caux_framing_errors_total",
+                "Runs of received bytes skipped while resynchronizing to a packet",
+                bus.framing_errors,
+            ),
+            (
+                "caux_silenced_packets_total",
+                "AUX packets to non-simulated devices (no echo, no response)",
+                bus.silenced,
+            ),
+            (
+                "caux_handler_errors_total",
+                "Exceptions raised by command handlers",
+                bus.handler_errors,
+            ),
+        ):
+            _metric(lines, name, "counter", help_text)
+            lines.append(f"{name} {value}")
+
+        items = sorted(bus.latency.items())
+        _metric(lines, "caux_commands_total", "counter", "AUX commands by target")
+        for (dst, cmd), hist in items:
+            lines.append(f"caux_commands_total{{{_labels(dst, cmd)}}} {hist.count}")
+        _metric(lines, "caux_handler_seconds", "histogram", "Command handler latency")
+        for (dst, cmd), hist in items:
+            lines.extend(hist.render("caux_handler_seconds", _labels(dst, cmd)))
+
+        _metric(lines, "caux_tick_seconds", "histogram", "Physics tick duration")
+        lines.extend(self.tick.render("caux_tick_seconds"))
+        _metric(lines, "caux_loop_lag_seconds", "histogram", "Event loop lag")
+        lines.extend(self.loop_lag.render("caux_loop_lag_seconds"))
+
+        motors = (self.mount.azm_motor, self.mount.alt_motor)
+        for name, attr, help_text in (
+            ("caux_motor_gotos_completed_total", "gotos_completed", "GOTOs completed"),
+            ("caux_motor_anti_stall_total", "anti_stall_count", "Anti-stall events"),
+            ("caux_motor_backlash_jumps_total", "backlash_jumps", "Backlash jumps"),
+        ):
+            _metric(lines, name, "counter", help_text)
+            for m in motors:
+                lines.append(f'{name}{{axis="{m.axis_name}"}} {getattr(m, attr)}')
+
+        for kind, metrics in (("counter", self.counters), ("gauge", self.gauges)):
+            for name, (help_text, fn) in metrics.items():
+                _metric(lines, name, kind, help_text)
+                for labels, value in fn().items():
+                    lbl = f"{{{labels}}}" if labels else ""
+                    lines.append(f"{name}{lbl} {value}")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(dst: int, cmd: int) -> str:
+    device = trg_names.get(dst, f"0x{dst:02x}")
+    command = cmd_names.get(cmd, f"0x{cmd:02x}")
+    return f'device="{device}",cmd="{command}"'
+
+
+async def start_metrics_server(
+    render: Callable[[], str], host: str = "", port: int = 9464
+) -> asyncio.AbstractServer:
+    """Minimal HTTP listener serving `GET /metrics` (used without --web)."""
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), 5.0)
+            parts = request.split(b" ", 2)
+            if len(parts) > 1 and parts[0] == b"GET" and parts[1] == b"/metrics":
+                body = render().encode()
+                status = b"200 OK"
+            else:
+                body = b"Not Found\n"
+                status = b"404 Not Found"
+            writer.write(
+                b"HTTP/1.1 " + status + b"\r\n"
+                b"Content-Type: text/plain; version=0.0.4; charset=utf-8\r\n"
+                b"Content-Length: " + str(len(body)).encode() + b"\r\n"
+                b"Connection: close\r\n\r\n" + body
+            )
+            await writer.drain()
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except Exception as e:
+            logger.error(f"Metrics request failed: {e}")
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(handle, host=host, port=port)
@@ -0,0 +1,185 @@
+"""
+Periodic Error (PE) Model
+
+Worm-driven periodic error described either by a harmonic table or by a
+recorded PE curve. The error profile is resampled once into a dense lookup
+table indexed by worm phase and linearly interpolated on every evaluation.
+"""
+
+import logging
+import os
+from math import pi, sin, radians
+from typing import Any, Dict, List, Optional, Sequence
+
+from ..devices.motor import STEPS_PER_REV
+
+logger = logging.getLogger(__name__)
+
+# Default number of samples per worm cycle in the lookup table.
+DEFAULT_TABLE_SIZE = 4096
+
+# Default worm wheel tooth count (one worm cycle = STEPS_PER_REV / teeth).
+DEFAULT_WORM_TEETH = 180
+
+ARCSEC_PER_REV = 360.0 * 3600.0
+
+
+def _resample(points: Sequence[Sequence[float]], size: int) -> List[float]:
+    """Periodic linear resampling of (phase, value) points onto `size` samples."""
+    pts = sorted(((p % 1.0), v) for p, v in points)
+    if not pts:
+        return [0.0] * size
+    # Close the cycle so interpolation wraps around phase 1.0 -> 0.0
+    ext = [(pts[-1][0] - 1.0, pts[-1][1])] + pts + [(pts[0][0] + 1.0, pts[0][1])]
+    out = []
+    j = 0
+    for i in range(size):
+        x = i / size
+        while ext[j + 1][0] < x:
+            j += 1
+        x0, y0 = ext[j]
+        x1, y1 = ext[j + 1]
+        out.append(y0 if x1 == x0 else y0 + (y1 - y0) * (x - x0) / (x1 - x0))
+    return out
+
+
+def load_curve(path: str) -> List[List[float]]:
+    """
+    Loads a recorded PE curve from a text/CSV file.
+
+    Each non-comment line holds either a single value (arcsec, samples evenly
+    spaced over one worm cycle) or a `phase, arcsec` pair with phase in [0, 1).
+    """
+    rows: List[List[float]] = []
+    with open(path) as f:
+        for line in f:
+            line = line.split("#", 1)[0].strip()
+            if not line:
+                continue
+            try:
+                rows.append([float(x) for x in line.replace(",", " ").split()])
+            except ValueError:
+                continue  # Header line
+    return rows
+
+
+class PeriodicErrorModel:
+    """
+    Periodic error as a function of phase within one period.
+
+    The phase source is either the encoder step count (worm angle) or the
+    simulation time for the legacy time-based sine model.
+    Values are returned in fractions of a full revolution.
+    """
+
+    def __init__(
+        self,
+        harmonics: Optional[Sequence[Sequence[float]]] = None,
+        curve: Optional[Sequence[Any]] = None,
+        period: float = STEPS_PER_REV / DEFAULT_WORM_TEETH,
+        table_size: int = DEFAULT_TABLE_SIZE,
+    ):
+        """
+        Args:
+            harmonics: Rows of (harmonic number, amplitude arcsec, phase deg).
+            curve: Recorded PE curve in arcsec, either evenly spaced values
+                or (phase, value) pairs. Overrides harmonics if given.
+            period: Length of one cycle in phase-source units
+                (encoder steps or seconds).
+            table_size: Number of lookup table samples per cycle.
+        """
+        self.period = float(period)
+        self.table_size = int(table_size)
+        n = self.table_size
+
+        if curve:
+            if isinstance(curve[0], (int, float)):
+                points = [(i / len(curve), float(v)) for i, v in enumerate(curve)]
+            elif len(curve[0]) == 1:
+                points = [(i / len(curve), float(v[0])) for i, v in enumerate(curve)]
+            else:
+                points = [(float(p), float(v)) for p, v in curve]
+            table = _resample(points, n)
+        else:
+            table = [0.0] * n
+            for h, amp, phase in harmonics or []:
+                w = 2 * pi * h
+                ph = radians(phase)
+                for i in range(n):
+                    table[i] += amp * sin(w * i / n + ph)
+
+        # Store in fractions of a revolution, with wrap-around samples
+        # so interpolation never needs a modulo on the upper index.
+        self.table = [v / ARCSEC_PER_REV for v in table]
+        self.table += self.table[:2]
+        self._scale = n / self.period
+        self._array: Any = None
+
+    @classmethod
+    def sine(cls, amplitude_arcsec: float, period: float) -> "PeriodicErrorModel":
+        """Single-harmonic model (the legacy `periodic_error_arcsec` setting)."""
+        return cls(harmonics=[(1, amplitude_arcsec, 0.0)], period=period)
+
+    @classmethod
+    def from_config(
+        cls, cfg: Dict[str, Any], base_dir: str = "."
+    ) -> Optional["PeriodicErrorModel"]:
+        """
+        Builds a worm-angle PE model from a per-axis config table:
+
+            worm_teeth = 180            # or worm_period_steps = 93206
+            harmonics = [[1, 7.5, 0.0], [2, 2.0, 45.0]]
+            curve = [0.0, 1.2, ...]     # or curve_file = "pe_azm.csv"
+            table_size = 4096
+        """
+        if not isinstance(cfg, dict):
+            return None
+
+        curve = cfg.get("curve")
+        curve_file = cfg.get("curve_file")
+        if not curve and curve_file:
+            path = os.path.join(base_dir, os.path.expanduser(curve_file))
+            try:
+                curve = load_curve(path)
+            except OSError as e:
+                logger.error(f"Error loading PE curve from {path}: {e}")
+                curve = None
+
+        harmonics = cfg.get("harmonics")
+        if not curve and not harmonics:
+            return None
+
+        period = cfg.get("worm_period_steps")
+        if period is None:
+            period = STEPS_PER_REV / cfg.get("worm_teeth", DEFAULT_WORM_TEETH)
+
+        return cls(
+            harmonics=harmonics,
+            curve=curve,
+            period=period,
+            table_size=cfg.get("table_size", DEFAULT_TABLE_SIZE),
+        )
+
+    def __call__(self, x: float) -> float:
+        """Interpolated PE (fraction of a revolution) at phase source value x."""
+        f = (x * self._scale) % self.table_size
+        i = int(f)
+        t = self.table
+        a = t[i]
+        return a + (t[i + 1] - a) * (f - i)
+
+    def evaluate(self, x: Any) -> Any:
+        """Vectorized evaluation over a NumPy array of phase source values."""
+        import numpy as np
+
+        if self._array is None:
+            self._array = np.asarray(self.table)
+        f = np.mod(np.asarray(x, dtype=float) * self._scale, self.table_size)
+        i = f.astype(np.intp)
+        a = self._array[i]
+        return a + (self._array[i + 1] - a) * (f - i)
+
+    @property
+    def amplitude(self) -> float:
+        """Half of the peak-to-peak error in fractions of a revolution."""
+        return (max(self.table) - min(self.table)) / 2
@@ -0,0 +1,280 @@
+"""
+Pointing Model Pipeline
+
+Converts physical axis positions into actual sky Alt/Az by applying a chain
+of pluggable imperfection terms. The same terms work on Python floats (used
+by `NexStarMount.get_sky_altaz`) and on NumPy arrays (batch evaluation and
+full-sky error maps).
+"""
+
+import math
+from abc import ABC, abstractmethod
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from ..devices.motor import STEPS_PER_REV
+from .periodic_error import PeriodicErrorModel
+
+# Minimal math namespace used by terms for scalar evaluation.
+# Vectorized evaluation passes the `numpy` module instead.
+SCALAR = SimpleNamespace(
+    tan=math.tan,
+    radians=math.radians,
+    maximum=max,
+    clip=lambda x, lo, hi: max(lo, min(hi, x)),
+)
+
+
+class PointingTerm(ABC):
+    """
+    Base class for a pointing model term.
+
+    Angles are fractions of a full revolution. `enc_azm`/`enc_alt` are the
+    encoder positions in steps and `t` is the simulation time in seconds.
+    """
+
+    @abstractmethod
+    def apply(
+        self, azm: Any, alt: Any, enc_azm: Any, enc_alt: Any, t: Any, xp: Any
+    ) -> Tuple[Any, Any]:
+        """Returns the corrected (azm, alt)."""
+
+
+class ConeError(PointingTerm):
+    """Constant Alt offset of the optical axis."""
+
+    def __init__(self, offset: float):
+        self.offset = offset
+
+    def apply(self, azm, alt, enc_azm, enc_alt, t, xp):
+        return azm, alt + self.offset
+
+
+class NonPerpendicularity(PointingTerm):
+    """Azm offset scaling with tan(alt), clamped to avoid the zenith singularity."""
+
+    def __init__(self, offset: float, limit_deg: float = 80.0):
+        self.offset = offset
+        self.limit_deg = limit_deg
+
+    def apply(self, azm, alt, enc_azm, enc_alt, t, xp):
+        alt_deg = xp.clip(
+            enc_alt * (360.0 / STEPS_PER_REV), -self.limit_deg, self.limit_deg
+        )
+        return azm + self.offset * xp.tan(xp.radians(alt_deg)), alt
+
+
+class PeriodicError(PointingTerm):
+    """Worm-angle PE per axis plus the legacy time-based PE on both axes."""
+
+    def __init__(
+        self,
+        azm: Optional[PeriodicErrorModel] = None,
+        alt: Optional[PeriodicErrorModel] = None,
+        time: Optional[PeriodicErrorModel] = None,
+    ):
+        self.azm = azm
+        self.alt = alt
+        self.time = time
+
+    def apply(self, azm, alt, enc_azm, enc_alt, t, xp):
+        if xp is SCALAR:
+            if self.azm:
+                azm += self.azm(enc_azm)
+            if self.alt:
+                alt += self.alt(enc_alt)
+            if self.time:
+                error = self.time(t)
+                azm += error
+                alt += error
+        else:
+            if self.azm:
+                azm = azm + self.azm.evaluate(enc_azm)
+            if self.alt:
+                alt = alt + self.alt.evaluate(enc_alt)
+            if self.time:
+                error = self.time.evaluate(t)
+                azm = azm + error
+                alt = alt + error
+        return azm, alt
+
+
+class Refraction(PointingTerm):
+    """Atmospheric refraction (Bennett's formula)."""
+
+    def apply(self, azm, alt, enc_azm, enc_alt, t, xp):
+        h = xp.maximum(0.1, alt * 360.0)
+        ref_arcmin = 1.0 / xp.tan(xp.radians(h + 7.31 / (h + 4.4)))
+        return azm, alt + ref_arcmin / (60.0 * 360.0)
+
+
+class PointingModel:
+    """An ordered chain of pointing terms."""
+
+    def __init__(self, terms: Optional[Sequence[PointingTerm]] = None):
+        self.terms: List[PointingTerm] = list(terms or [])
+
+    def add(self, term: PointingTerm) -> "PointingModel":
+        """Appends a term to the end of the pipeline."""
+        self.terms.append(term)
+        return self
+
+    @classmethod
+    def from_config(cls, imp: Dict[str, Any], base_dir: str = ".") -> "PointingModel":
+        """
+        Builds the standard pipeline from `[simulator.imperfections]`;
+        relative PE curve files are looked up in `base_dir`.
+        """
+        model = cls()
+        cone = imp.get("cone_error_arcmin", 0.0)
+        if cone:
+            model.add(ConeError(cone / (360.0 * 60.0)))
+        non_perp = imp.get("non_perpendicularity_arcmin", 0.0)
+        if non_perp:
+            model.add(NonPerpendicularity(non_perp / (360.0 * 60.0)))
+
+        pe_cfg = imp.get("periodic_error", {})
+        if not isinstance(pe_cfg, dict):
+            pe_cfg = {}
+        pe_amplitude = imp.get("periodic_error_arcsec", 0.0)
+        pe_period = imp.get("periodic_error_period_sec", 480.0)
+        pe = PeriodicError(
+            azm=PeriodicErrorModel.from_config(pe_cfg.get("azm", {}), base_dir),
+            alt=PeriodicErrorModel.from_config(pe_cfg.get("alt", {}), base_dir),
+            time=(
+                PeriodicErrorModel.sine(pe_amplitude, pe_period)
+                if pe_amplitude and pe_period > 0
+                else None
+            ),
+        )
+        if pe.azm or pe.alt or pe.time:
+            model.add(pe)
+
+        if imp.get("refraction_enabled", False):
+            model.add(Refraction())
+        return model
+
+    def find(self, term_type: type) -> Optional[PointingTerm]:
+        """Returns the first term of the given type, if present."""
+        for term in self.terms:
+            if isinstance(term, term_type):
+                return term
+        return None
+
+    def apply(
+        self, azm: float, alt: float, enc_azm: int, enc_alt: int, t: float
+    ) -> Tuple[float, float]:
+        """Scalar evaluation. Returns sky (azm, alt) as fractions."""
+        for term in self.terms:
+            azm, alt = term.apply(azm, alt, enc_azm, enc_alt, t, SCALAR)
+        return azm % 1.0, alt
+
+    def evaluate(
+        self, azm: Any, alt: Any, enc_azm: Any = None, enc_alt: Any = None, t: Any = 0.0
+    ) -> Tuple[Any, Any]:
+        """
+        Vectorized evaluation on NumPy arrays (broadcast together).
+
+        Encoder positions default to the pointing positions (no backlash).
+        """
+        import numpy as np
+
+        azm = np.asarray(azm, dtype=float)
+        alt = np.asarray(alt, dtype=float)
+        if enc_azm is None:
+            enc_azm = np.floor(np.mod(azm, 1.0) * STEPS_PER_REV)
+        if enc_alt is None:
+            enc_alt = np.floor(np.mod(alt, 1.0) * STEPS_PER_REV)
+        t = np.asarray(t, dtype=float)
+        for term in self.terms:
+            azm, alt = term.apply(azm, alt, enc_azm, enc_alt, t, np)
+        return np.mod(azm, 1.0), alt
+
+
+def error_map(
+    model: PointingModel,
+    n_azm: int = 72,
+    n_alt: int = 17,
+    alt_range: Tuple[float, float] = (0.0, 80.0),
+    t: float = 0.0,
+) -> Dict[str, Any]:
+    """
+    Computes a full-sky pointing error map on an Alt/Az grid.
+
+    Returns a dict of 2-D arrays (shape n_alt x n_azm): `azm` and `alt`
+    (commanded, degrees) and `d_azm`, `d_alt` (sky - commanded, arcsec).
+    """
+    import numpy as np
+
+    azm_deg = np.arange(n_azm) * (360.0 / n_azm)
+    alt_deg = np.linspace(alt_range[0], alt_range[1], n_alt)
+    azm_grid, alt_grid = np.meshgrid(azm_deg, alt_deg)
+
+    azm = azm_grid / 360.0
+    alt = alt_grid / 360.0
+    sky_azm, sky_alt = model.evaluate(azm, alt, t=t)
+
+    d_azm = np.mod(sky_azm - azm + 0.5, 1.0) - 0.5
+    return {
+        "azm": azm_grid,
+        "alt": alt_grid,
+        "d_azm": d_azm * 360.0 * 3600.0,
+        "d_alt": (sky_alt - alt) * 360.0 * 3600.0,
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Command line tool writing a pointing error map to CSV or NPZ."""
+    import argparse
+
+    import numpy as np
+
+    try:
+        from ..nse_simulator import load_config
+    except ImportError:
+        from nse_simulator import load_config  # type: ignore
+
+    parser = argparse.ArgumentParser(
+        description="Full-sky pointing error map for an imperfection config"
+    )
+    parser.add_argument("-c", "--config", help="Custom configuration file path")
+    parser.add_argument("--n-azm", type=int, default=72, help="Azm grid points")
+    parser.add_argument("--n-alt", type=int, default=17, help="Alt grid points")
+    parser.add_argument("--alt-min", type=float, default=0.0, help="Min Alt [deg]")
+    parser.add_argument("--alt-max", type=float, default=80.0, help="Max Alt [deg]")
+    parser.add_argument("-t", "--time", type=float, default=0.0, help="Sim time [s]")
+    parser.add_argument(
+        "-o", "--output", default="-", help="Output .csv or .npz (default: stdout)"
+    )
+    args = parser.parse_args(argv)
+
+    config = load_config(args.config)
+    imp = config.get("simulator", {}).get("imperfections", {})
+    emap = error_map(
+        PointingModel.from_config(imp, config.get("config_dir", ".")),
+        n_azm=args.n_azm,
+        n_alt=args.n_alt,
+        alt_range=(args.alt_min, args.alt_max),
+        t=args.time,
+    )
+
+    if args.output.endswith(".npz"):
+        np.savez_compressed(args.output, **emap)
+        return
+
+    rows = np.column_stack([emap[k].ravel() for k in ("azm", "alt", "d_azm", "d_alt")])
+    header = "azm_deg,alt_deg,d_azm_arcsec,d_alt_arcsec"
+    if args.output == "-":
+        import sys
+
+        np.savetxt(
+            sys.stdout, rows, fmt="%.6f", delimiter=",", header=header, comments=""
+        )
+    else:
+        np.savetxt(
+            args.output, rows, fmt="%.6f", delimiter=",", header=header, comments=""
+        )
+
+
+if __name__ == "__main__":
+    main()
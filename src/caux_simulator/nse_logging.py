@@ -6,7 +6,8 @@ protocol and connection debugging.
 """
 
 import logging
-from typing import Optional
+import time
+from typing import Any, Callable, Dict, Hashable, List, Optional
 
 # Logging category flags (bitmask)
 LOG_CONNECTION = 0x01  # Connection events (connect, disconnect, clients)
@@ -88,6 +89,55 @@ def log_device(
         logger.log(level, f"[DEVICE] {message}")
 
 
+class LogLimiter:
+    """
+    Rate limit for repetitive log messages (e.g. a client sending garbage).
+
+    `allow(key)` admits the first `burst` messages of each key per
+    `interval` seconds; the rest are only counted, and the number suppressed
+    is reported when the key is next admitted. Callers build the message
+    (hex dumps, tracebacks) only when admitted, so a flood costs a dict
+    lookup per packet.
+    """
+
+    def __init__(
+        self,
+        logger: logging.Logger,
+        interval: float = 10.0,
+        burst: int = 5,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.logger = logger
+        self.interval = interval
+        self.burst = burst
+        self.clock = clock
+        # key -> [window start, admitted in window, suppressed]
+        self._windows: Dict[Hashable, List[Any]] = {}
+
+    def allow(self, key: Hashable, level: int = logging.WARNING) -> bool:
+        now = self.clock()
+        window = self._windows.get(key)
+        if window is None:
+            window = self._windows[key] = [now, 0, 0]
+        elif now - window[0] >= self.interval:
+            if window[2]:
+                self.logger.log(
+                    level,
+                    f"{window[2]} similar messages suppressed in the last "
+                    f"{now - window[0]:.0f} s ({key})",
+                )
+            window[:] = [now, 0, 0]
+        if window[1] < self.burst:
+            window[1] += 1
+            return True
+        window[2] += 1
+        return False
+
+    def suppressed(self) -> int:
+        """Messages suppressed in the current windows."""
+        return sum(w[2] for w in self._windows.values())
+
+
 def format_aux_packet(packet: bytes, direction: str = "RX") -> str:
     """
     Formats an AUX packet for logging with hex representation.
@@ -9,22 +9,29 @@ import logging
 import os
 import socket
 import sys
+import time
 from datetime import datetime, timezone
-from typing import List, Optional, Any
-import ephem
+from typing import Dict, List, Optional, Any, Tuple, TYPE_CHECKING
 from math import pi
 import math
 
+if TYPE_CHECKING:
+    import ephem
+
 try:
-    from .nse_telescope import trg_names, cmd_names
     from . import nse_logging as nselog
-    from . import __version__
+    from . import __version__, _import_started
     from .bus.mount import NexStarMount
+    from .bus.capture import RX, TX, CaptureWriter
+    from .bus.pool import MountPool
+    from .bus.transport import AuxSession, FanOut, TokenBucket
 except ImportError:
-    from nse_telescope import trg_names, cmd_names  # type: ignore
     import nse_logging as nselog  # type: ignore
-    from __init__ import __version__  # type: ignore
+    from __init__ import __version__, _import_started  # type: ignore
     from bus.mount import NexStarMount  # type: ignore
+    from bus.capture import RX, TX, CaptureWriter  # type: ignore
+    from bus.pool import MountPool  # type: ignore
+    from bus.transport import AuxSession, FanOut, TokenBucket  # type: ignore
 
 logger = logging.getLogger(__name__)
 
@@ -43,7 +50,11 @@ def deep_merge(base: dict, override: dict) -> dict:
 
 
 def load_config(custom_path: Optional[str] = None):
-    """Loads configuration from TOML files with deep merge."""
+    """
+    Loads configuration from TOML files with deep merge. The directory of
+    the user file is stored as `config_dir`; relative paths in it (e.g. a
+    PE `curve_file`) are resolved against it.
+    """
     config: dict[str, Any] = {}
     # 1. Load defaults from package directory
     pkg_dir = os.path.dirname(os.path.abspath(__file__))
@@ -62,17 +73,69 @@ def load_config(custom_path: Optional[str] = None):
             with open(user_path, "rb") as f:
                 user_config = tomllib.load(f)
                 deep_merge(config, user_config)
+            config["config_dir"] = os.path.dirname(os.path.abspath(user_path))
         except Exception as e:
             logger.error(f"Error loading user config from {user_path}: {e}")
 
     return config
 
 
-# telescope and connections state
-telescope: Optional[NexStarMount] = None
-connections: List[Any] = []
-background_tasks: List[asyncio.Task] = []
-web_console_instance: Optional[Any] = None
+# --- Startup Profiling ---
+
+# Modules pulled in only by optional subsystems (reported by --startup-profile)
+OPTIONAL_MODULES = ["ephem", "numpy", "textual", "fastapi", "uvicorn"]
+
+_startup_marks: List[Tuple[str, float]] = [("imports", _import_started)]
+
+
+def mark_startup(phase: str) -> None:
+    """Records the end of a startup phase (measured from the previous mark)."""
+    _startup_marks.append((phase, time.perf_counter()))
+
+
+def startup_report() -> str:
+    """Formats the recorded startup phases as a human-readable report."""
+    lines = ["Startup profile:"]
+    for (_, t_prev), (phase, t) in zip(_startup_marks, _startup_marks[1:]):
+        lines.append(f"  {phase:<12} {(t - t_prev) * 1000:8.1f} ms")
+    total = _startup_marks[-1][1] - _import_started
+    lines.append(f"  {'total':<12} {total * 1000:8.1f} ms (since package import)")
+    lines.append(f"  {'process cpu':<12} {time.process_time() * 1000:8.1f} ms")
+    loaded = [m for m in OPTIONAL_MODULES if m in sys.modules]
+    lines.append(f"  optional modules loaded: {', '.join(loaded) or 'none'}")
+    return "\n".join(lines)
+
+
+def make_observer(obs_cfg: dict) -> "ephem.Observer":
+    """Creates the ephem observer (imported lazily, only front-ends need it)."""
+    import ephem
+
+    obs = ephem.Observer()
+    obs.lat = str(obs_cfg.get("latitude", 50.0))
+    obs.lon = str(obs_cfg.get("longitude", 20.0))
+    obs.elevation = float(obs_cfg.get("elevation", 400))
+    obs.pressure = 0
+    return obs
+
+
+def make_telemetry(mount: NexStarMount) -> Optional[Any]:
+    """Attaches a telemetry recorder to `mount` (None without NumPy)."""
+    try:
+        try:
+            from .telemetry import TelemetryRecorder
+        except ImportError:
+            from telemetry import TelemetryRecorder  # type: ignore
+    except ImportError:
+        logger.error("Error: Telemetry requires numpy.")
+        logger.info("Run: pip install .[analysis]")
+        return None
+    try:
+        # RA/Dec columns need ephem; the recorder owns its observer
+        observer = make_observer(mount.config.get("observer", {}))
+    except ImportError:
+        observer = None
+    return TelemetryRecorder(observer=observer).attach(mount)
+
 
 # --- Network Helpers ---
 
@@ -98,7 +161,10 @@ async def broadcast(
 
 
 async def timer(
-    seconds_to_sleep: float = 1.0, tel: Optional[NexStarMount] = None
+    seconds_to_sleep: float = 1.0,
+    tel: Optional[NexStarMount] = None,
+    metrics: Optional[Any] = None,
+    pool: Optional[MountPool] = None,
 ) -> None:
     """Timer loop to trigger physical model updates (ticks)."""
     from time import time
@@ -109,68 +175,15 @@ async def timer(
         cur_t = time()
         if tel:
             tel.tick(cur_t - t)
+        if pool is not None:
+            pool.tick(cur_t - t)
+        if metrics is not None:
+            # Oversleep of the loop and the cost of the tick itself
+            metrics.loop_lag.observe(max(0.0, cur_t - t - seconds_to_sleep))
+            metrics.tick.observe(time() - cur_t)
         t = cur_t
 
 
-async def handle_port2000(
-    reader: asyncio.StreamReader, writer: asyncio.StreamWriter
-) -> None:
-    """Handles communication on the AUX port (2000)."""
-    transparent = True
-    global telescope
-    connected = False
-    peer_addr = writer.get_extra_info("peername")
-
-    while True:
-        try:
-            data = await reader.read(1024)
-            if not data:
-                writer.close()
-                if telescope:
-                    telescope.print_msg("Connection closed.")
-                    nselog.log_connection(logger, f"Client {peer_addr} disconnected")
-                return
-            elif not connected:
-                if telescope:
-                    conn_msg = f"Client connected from {peer_addr}"
-                    telescope.print_msg(conn_msg)
-                    nselog.log_connection(logger, conn_msg)
-                connected = True
-
-            resp = b""
-            if transparent:
-                if data[:3] == b"$$$":
-                    transparent = False
-                    resp = b"CMD\r\n"
-                    nselog.log_connection(
-                        logger, f"Client {peer_addr} entered WiFly command mode"
-                    )
-                else:
-                    if telescope:
-                        resp = telescope.handle_msg(data)
-            else:
-                message = data.decode("ascii", errors="ignore").strip()
-                if message == "exit":
-                    transparent = True
-                    resp = data + b"\r\nEXIT\r\n"
-                    nselog.log_connection(
-                        logger, f"Client {peer_addr} exited WiFly command mode"
-                    )
-                else:
-                    resp = data + b"\r\nAOK\r\n<2.40-CEL> "
-
-            if resp:
-                writer.write(resp)
-                await writer.drain()
-        except Exception as e:
-            if telescope:
-                telescope.print_msg(f"Error handling AUX port: {e}")
-            nselog.log_connection(
-                logger, f"Error on connection from {peer_addr}: {e}", logging.ERROR
-            )
-            break
-
-
 def to_le(n: int, size: int) -> bytes:
     return n.to_bytes(size, "little")
 
@@ -197,8 +210,10 @@ def handle_stellarium_cmd(tel: NexStarMount, d: bytes) -> int:
     return p
 
 
-def make_stellarium_status(tel: NexStarMount, obs: ephem.Observer) -> bytes:
+def make_stellarium_status(tel: NexStarMount, obs: "ephem.Observer") -> bytes:
     """Generates Stellarium status packet (Position report)."""
+    import ephem
+
     # Update observer position from potentially updated config
     obs.lat = str(tel.config.get("observer", {}).get("latitude", obs.lat))
     obs.lon = str(tel.config.get("observer", {}).get("longitude", obs.lon))
@@ -221,30 +236,51 @@ def make_stellarium_status(tel: NexStarMount, obs: ephem.Observer) -> bytes:
 async def report_scope_pos(
     sleep: float = 0.1,
     scope: Optional[NexStarMount] = None,
-    obs: Optional[ephem.Observer] = None,
+    obs: Optional["ephem.Observer"] = None,
+    connections: Optional[List[Any]] = None,
+    idle: float = 1.0,
 ) -> None:
-    """Broadcasts current position to all connected Stellarium clients."""
-    while True:
-        await asyncio.sleep(sleep)
-        for tr in connections:
-            try:
-                if scope and obs:
-                    tr.write(make_stellarium_status(scope, obs))
-            except Exception:
-                pass
+    """
+    Sends the current position to all connected Stellarium clients when the
+    mount reports a change, and every `idle` seconds otherwise (the sky
+    position drifts even when the mount stands still). `sleep` is the
+    polling interval used without a mount.
+    """
+    sub = scope.events.subscribe() if scope else None
+    try:
+        while True:
+            if sub is not None:
+                await sub.wait(idle)
+            else:
+                await asyncio.sleep(sleep)
+            for tr in connections or []:
+                try:
+                    if scope and obs:
+                        tr.write(make_stellarium_status(scope, obs))
+                except Exception:
+                    pass
+    finally:
+        if sub is not None:
+            sub.close()
 
 
 class StellariumServer(asyncio.Protocol):
     """Asynchronous protocol implementation for Stellarium TCP server."""
 
-    def __init__(self, tel: Optional[NexStarMount], obs: ephem.Observer) -> None:
+    def __init__(
+        self,
+        tel: Optional[NexStarMount],
+        obs: "ephem.Observer",
+        connections: List[Any],
+    ) -> None:
         self.telescope = tel
         self.obs = obs
+        self.connections = connections
         self.transport: Optional[asyncio.Transport] = None
 
     def connection_made(self, transport: asyncio.BaseTransport) -> None:
         self.transport = transport  # type: ignore
-        connections.append(transport)
+        self.connections.append(transport)
         peer_addr = transport.get_extra_info("peername")
         if self.telescope:
             msg = "Stellarium client connected."
@@ -255,7 +291,7 @@ class StellariumServer(asyncio.Protocol):
         try:
             if self.transport:
                 peer_addr = self.transport.get_extra_info("peername")
-                connections.remove(self.transport)
+                self.connections.remove(self.transport)
                 nselog.log_connection(
                     logger, f"Stellarium client disconnected from {peer_addr}"
                 )
@@ -267,7 +303,397 @@ class StellariumServer(asyncio.Protocol):
             handle_stellarium_cmd(self.telescope, data)
 
 
+class SimulatorServer:
+    """
+    A complete, embeddable simulator instance.
+
+    Owns the mount, the AUX (and optionally Stellarium and web console)
+    servers and the background tasks. Several instances can run in one
+    process; use port 0 to bind ephemeral ports and read the bound ports
+    from `aux_port`, `stellarium_port` and `web_port` after `start()`.
+    """
+
+    def __init__(
+        self,
+        config: Optional[dict] = None,
+        host: str = "",
+        port: int = 2000,
+        hc_enabled: bool = False,
+        stellarium: bool = False,
+        stellarium_port: int = 10001,
+        web: bool = False,
+        web_host: str = "127.0.0.1",
+        web_port: int = 8080,
+        discovery: bool = False,
+        tick_interval: float = 0.1,
+        metrics: bool = False,
+        metrics_port: Optional[int] = None,
+        metrics_host: str = "127.0.0.1",
+        telemetry: bool = False,
+        capture: Optional[str] = None,
+        fanout: bool = False,
+        isolated: bool = False,
+    ) -> None:
+        self.config = config if config is not None else load_config()
+        self.host = host
+        self.aux_port = port
+        self.stellarium = stellarium
+        self.stellarium_port = stellarium_port
+        self.web = web
+        self.web_host = web_host
+        self.web_port = web_port
+        self.discovery = discovery
+        self.tick_interval = tick_interval
+        self.metrics_port = metrics_port
+        self.metrics_host = metrics_host
+
+        self.mount = NexStarMount(config=self.config, hc_enabled=hc_enabled)
+        self.metrics: Optional[Any] = None
+        if metrics:
+            try:
+                from .metrics import Metrics
+            except ImportError:
+                from metrics import Metrics  # type: ignore
+
+            self.metrics = Metrics(self.mount)
+            self.metrics.add_gauge(
+                "caux_connections", "Active client connections", self._connections
+            )
+            self.metrics.add_counter(
+                "caux_aux_disconnects_total",
+                "AUX connections refused or closed by the server",
+                self._disconnect_counts,
+            )
+            self.metrics.add_gauge(
+                "caux_aux_connection_bytes",
+                "Bytes exchanged by each AUX connection",
+                lambda: self._session_counts("bytes"),
+            )
+            self.metrics.add_gauge(
+                "caux_aux_connection_packets",
+                "AUX packets exchanged by each AUX connection",
+                lambda: self._session_counts("packets"),
+            )
+        self.telemetry: Optional[Any] = None
+        if telemetry:
+            self.telemetry = make_telemetry(self.mount)
+        # Raw AUX port traffic recorder (see bus/capture.py)
+        self.capture: Optional[CaptureWriter] = None
+        if capture:
+            self.capture = CaptureWriter(capture)
+        self._conn_seq = 0
+        sim_cfg = self.config.get("simulator", {})
+        # Per-connection protocol error budget (0 disables it)
+        self.error_budget = sim_cfg.get("error_budget", 50)
+        self.error_budget_refill = sim_cfg.get("error_budget_refill", 5.0)
+        self.error_policy = sim_cfg.get("error_policy", "drop")
+        self.error_drop_seconds = sim_cfg.get("error_drop_seconds", 10.0)
+        # Admission control and slow-reader protection (0 disables each)
+        self.max_connections = sim_cfg.get("max_connections", 16)
+        self.command_rate = sim_cfg.get("command_rate", 0)
+        self.command_burst = sim_cfg.get("command_burst", 100)
+        self.drain_timeout = sim_cfg.get("drain_timeout", 5.0)
+        if self.error_budget and self.error_budget_refill <= 0:
+            raise ValueError("error_budget_refill must be positive")
+        if self.command_rate < 0:
+            raise ValueError("command_rate must be positive (or 0 to disable it)")
+        # A fresh mount per AUX connection (front-ends follow `self.mount`)
+        self.pool: Optional[MountPool] = None
+        if isolated:
+            if fanout:
+                raise ValueError("Bus fan-out needs a shared mount (not isolated)")
+            self.pool = MountPool(
+                self.config, sim_cfg.get("mount_pool_size", 4), hc_enabled
+            )
+            if self.metrics is not None:
+                pool = self.pool
+                self.metrics.add_gauge(
+                    "caux_mount_pool",
+                    "Isolated mounts in use and ready",
+                    lambda: {f'state="{k}"': v for k, v in pool.counts().items()},
+                )
+        # Repeat all bus traffic on every AUX connection, like the main board
+        self.fanout: Optional[FanOut] = None
+        if fanout:
+            self.fanout = FanOut(sim_cfg.get("fanout_buffer", 262144))
+        # AUX connections refused or closed by the server, by reason
+        self.disconnects = {"rejected": 0, "drain_timeout": 0, "error_budget": 0}
+        self.observer: Optional["ephem.Observer"] = None
+        self.connections: List[Any] = []  # Stellarium transports
+        self.tasks: List[asyncio.Task] = []
+        self.web_console: Optional[Any] = None
+        self._aux_server: Optional[asyncio.AbstractServer] = None
+        self._stell_server: Optional[asyncio.AbstractServer] = None
+        self._metrics_server: Optional[asyncio.AbstractServer] = None
+        self._writers: List[asyncio.StreamWriter] = []
+        self.sessions: Dict[int, AuxSession] = {}  # By connection id
+
+    @property
+    def telescope(self) -> NexStarMount:
+        return self.mount
+
+    @property
+    def running(self) -> bool:
+        return self._aux_server is not None
+
+    def _connections(self) -> dict:
+        counts = {
+            'kind="aux"': len(self._writers),
+            'kind="stellarium"': len(self.connections),
+        }
+        if self.web_console:
+            counts['kind="web"'] = len(self.web_console.clients)
+        return counts
+
+    def _disconnect_counts(self) -> dict:
+        counts = dict(self.disconnects)
+        if self.fanout:
+            counts["fanout_overflow"] = self.fanout.overflows
+        return {f'reason="{k}"': v for k, v in counts.items()}
+
+    def _session_counts(self, unit: str) -> dict:
+        counts = {}
+        for conn_id, session in self.sessions.items():
+            for direction in ("rx", "tx"):
+                counts[f'conn="{conn_id}",direction="{direction}"'] = getattr(
+                    session, f"{unit}_{direction}"
+                )
+        return counts
+
+    def get_observer(self) -> "ephem.Observer":
+        """Returns the shared ephem observer, creating it on first use."""
+        if self.observer is None:
+            self.observer = make_observer(self.config.get("observer", {}))
+        return self.observer
+
+    def make_session(self, peer: Any = None) -> AuxSession:
+        """Protocol state of a new AUX port connection."""
+        mount = self.mount
+        if self.pool is not None:
+            mount = self.pool.acquire()
+            if self.metrics is not None:
+                mount.bus.stats = self.metrics.bus
+        budget = rate_limit = None
+        if self.error_budget:
+            budget = TokenBucket(self.error_budget, self.error_budget_refill)
+        if self.command_rate:
+            rate_limit = TokenBucket(self.command_burst, self.command_rate)
+        return AuxSession(
+            mount,
+            peer,
+            budget,
+            self.error_policy,
+            self.error_drop_seconds,
+            rate_limit,
+        )
+
+    async def handle_port2000(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Handles communication on the AUX port (2000)."""
+        telescope = self.mount
+        connected = False
+        peer_addr = writer.get_extra_info("peername")
+        if self.max_connections and len(self._writers) >= self.max_connections:
+            self.disconnects["rejected"] += 1
+            logger.warning(
+                f"Refusing AUX connection from {peer_addr}: "
+                f"{self.max_connections} clients connected"
+            )
+            writer.close()
+            return
+        session = self.make_session(peer_addr)
+        self._writers.append(writer)
+        self._conn_seq += 1
+        conn_id = self._conn_seq
+        self.sessions[conn_id] = session
+        capture = self.capture
+        fanout = self.fanout
+        if fanout:
+            fanout.subscribe(conn_id, writer.transport)
+
+        try:
+            while True:
+                try:
+                    pause = session.throttle()
+                    if pause:
+                        await asyncio.sleep(pause)
+                    data = await reader.read(1024)
+                    if not data:
+                        writer.close()
+                        telescope.print_msg("Connection closed.")
+                        nselog.log_connection(
+                            logger,
+                            f"Client {peer_addr} disconnected: {session.summary()}",
+                        )
+                        return
+                    elif not connected:
+                        conn_msg = f"Client connected from {peer_addr}"
+                        telescope.print_msg(conn_msg)
+                        nselog.log_connection(logger, conn_msg)
+                        connected = True
+
+                    if capture:
+                        capture.write(time.time(), RX, conn_id, data)
+                    bus_traffic = session.transparent
+                    resp = session.feed(data)
+
+                    if resp:
+                        if capture:
+                            capture.write(time.time(), TX, conn_id, resp)
+                        if fanout and bus_traffic and session.transparent:
+                            fanout.publish(resp)
+                        else:
+                            writer.write(resp)
+                        if self.drain_timeout:
+                            await asyncio.wait_for(writer.drain(), self.drain_timeout)
+                        else:
+                            await writer.drain()
+                    else:
+                        # Reads from a full buffer do not yield: let the
+                        # other connections in between a client's chunks
+                        await asyncio.sleep(0)
+                    if session.closed:
+                        self.disconnects["error_budget"] += 1
+                        writer.close()
+                        return
+                except asyncio.TimeoutError:
+                    # The peer stopped reading: its unsent replies would
+                    # pile up, and this coroutine would wait on it forever
+                    self.disconnects["drain_timeout"] += 1
+                    logger.warning(
+                        f"Client {peer_addr} is not reading its replies "
+                        f"(drain timeout {self.drain_timeout:g} s), disconnecting"
+                    )
+                    writer.transport.abort()
+                    return
+                except Exception as e:
+                    telescope.print_msg(f"Error handling AUX port: {e}")
+                    nselog.log_connection(
+                        logger,
+                        f"Error on connection from {peer_addr}: {e}",
+                        logging.ERROR,
+                    )
+                    break
+        except asyncio.CancelledError:
+            # Event loop shut down while the connection was paused
+            writer.close()
+        finally:
+            self._writers.remove(writer)
+            del self.sessions[conn_id]
+            if fanout:
+                fanout.unsubscribe(conn_id)
+            if self.pool is not None:
+                self.pool.release(session.mount)
+
+    async def start(self) -> "SimulatorServer":
+        """Starts servers and background tasks; returns once listening."""
+        loop = asyncio.get_running_loop()
+        self._aux_server = await asyncio.start_server(
+            self.handle_port2000, host=self.host, port=self.aux_port
+        )
+        self.aux_port = self._aux_server.sockets[0].getsockname()[1]
+
+        self.tasks.append(
+            asyncio.create_task(
+                timer(self.tick_interval, self.mount, self.metrics, self.pool)
+            )
+        )
+        if self.discovery:
+            self.tasks.append(asyncio.create_task(broadcast(sport=self.aux_port)))
+
+        if self.stellarium:
+            obs = self.get_observer()
+            self._stell_server = await loop.create_server(
+                lambda: StellariumServer(self.mount, obs, self.connections),
+                host=self.host,
+                port=self.stellarium_port,
+            )
+            self.stellarium_port = self._stell_server.sockets[0].getsockname()[1]
+            self.tasks.append(
+                asyncio.create_task(
+                    report_scope_pos(0.1, self.mount, obs, self.connections)
+                )
+            )
+
+        if self.web:
+            try:
+                try:
+                    from .web_console import WebConsole
+                except (ImportError, ValueError):
+                    from web_console import WebConsole  # type: ignore
+
+                self.web_console = WebConsole(
+                    self.mount,
+                    self.get_observer(),
+                    host=self.web_host,
+                    port=self.web_port,
+                    metrics=self.metrics,
+                )
+                self.web_console.run()
+                if self.web_port == 0:
+                    self.web_port = await self.web_console.wait_port()
+            except ImportError:
+                logger.error(
+                    "Error: Web dependencies (fastapi, uvicorn) not installed."
+                )
+                logger.info("Run: pip install .[web]")
+
+        # Standalone /metrics listener when the web console does not serve it
+        if self.metrics and self.metrics_port is not None and not self.web_console:
+            try:
+                from .metrics import start_metrics_server
+            except ImportError:
+                from metrics import start_metrics_server  # type: ignore
+
+            self._metrics_server = await start_metrics_server(
+                self.metrics.render, host=self.metrics_host, port=self.metrics_port
+            )
+            self.metrics_port = self._metrics_server.sockets[0].getsockname()[1]
+
+        return self
+
+    async def stop(self) -> None:
+        """Closes all servers and connections and cancels background tasks."""
+        servers = [
+            srv
+            for srv in (self._aux_server, self._stell_server, self._metrics_server)
+            if srv
+        ]
+        for srv in servers:
+            srv.close()
+        for writer in list(self._writers):
+            writer.close()
+        for transport in list(self.connections):
+            transport.close()
+
+        # Graceful shutdown of background tasks
+        if self.web_console:
+            await self.web_console.stop()
+            self.web_console = None
+
+        for task in self.tasks:
+            task.cancel()
+        if self.tasks:
+            await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks.clear()
+
+        for srv in servers:
+            await srv.wait_closed()
+        self._aux_server = self._stell_server = self._metrics_server = None
+        if self.capture:
+            self.capture.close()
+
+    async def __aenter__(self) -> "SimulatorServer":
+        return await self.start()
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.stop()
+
+
 async def main_async():
+    mark_startup("imports")
+
     # Initial parse to get config path
     pre_parser = argparse.ArgumentParser(add_help=False)
     pre_parser.add_argument("-c", "--config")
@@ -346,7 +772,93 @@ async def main_async():
         default=sim_cfg.get("web_host", "127.0.0.1"),
         help="Web console host (default: 127.0.0.1)",
     )
+    parser.add_argument(
+        "--tui-refresh",
+        type=float,
+        default=sim_cfg.get("tui_refresh_hz", 10.0),
+        metavar="HZ",
+        help="TUI refresh rate (default: 10)",
+    )
+    parser.add_argument(
+        "--metrics",
+        action="store_true",
+        default=sim_cfg.get("metrics_enabled", False),
+        help="Collect metrics and serve them at /metrics "
+        "(web console, or --metrics-port without --web)",
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        default=sim_cfg.get("metrics_port", 9464),
+        help="Standalone metrics port when --web is off (default: 9464)",
+    )
+    parser.add_argument(
+        "--metrics-host",
+        default=sim_cfg.get("metrics_host", "127.0.0.1"),
+        help="Standalone metrics host (default: 127.0.0.1)",
+    )
+    parser.add_argument(
+        "--telemetry",
+        action="store_true",
+        default=sim_cfg.get("telemetry_enabled", False),
+        help="Record per-tick telemetry history (requires numpy)",
+    )
+    parser.add_argument(
+        "--telemetry-export",
+        metavar="FILE",
+        help="Stream telemetry to FILE.csv while running, or write FILE.npz "
+        "at shutdown (implies --telemetry)",
+    )
+    parser.add_argument(
+        "--capture",
+        metavar="FILE",
+        help="Record raw AUX port traffic to FILE (see caux-sim-analyze)",
+    )
+    parser.add_argument(
+        "--fanout",
+        action="store_true",
+        default=sim_cfg.get("aux_fanout", False),
+        help="Repeat all AUX bus traffic to every connected client (like the "
+        "real main board)",
+    )
+    parser.add_argument(
+        "--isolated",
+        action="store_true",
+        default=sim_cfg.get("isolated_mounts", False),
+        help="Give every AUX connection its own freshly reset mount (shared CI "
+        "simulators)",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="caux-profile",
+        metavar="PREFIX",
+        help="Sample the event loop for the whole run; write PREFIX.collapsed "
+        "and PREFIX.pstats at shutdown",
+    )
+    parser.add_argument(
+        "--profile-signal",
+        action="store_true",
+        help="Toggle profiling windows with SIGUSR1 instead",
+    )
+    parser.add_argument(
+        "--profile-interval",
+        type=float,
+        default=0.005,
+        help="Profiler sampling interval [s] (default: 0.005)",
+    )
+    parser.add_argument(
+        "--startup-profile",
+        action="store_true",
+        help="Print startup timing once the AUX port is listening, then exit",
+    )
     args = parser.parse_args()
+    if args.tui_refresh <= 0:
+        # Also catches a non-positive tui_refresh_hz from the configuration
+        parser.error(f"--tui-refresh must be positive, not {args.tui_refresh:g}")
+    if args.startup_profile:
+        args.text = True
+    mark_startup("config")
 
     # Configure logging
     log_cfg = config.get("logging", {})
@@ -402,6 +914,7 @@ async def main_async():
         )
 
     logger.info(f"NexStar AUX Simulator version {__version__}")
+    mark_startup("logging")
 
     if args.perfect:
         if "simulator" in config and "imperfections" in config["simulator"]:
@@ -411,48 +924,83 @@ async def main_async():
             config["simulator"]["imperfections"]["refraction_enabled"] = False
             config["simulator"]["imperfections"]["clock_drift"] = 0.0
 
-    global telescope
-    obs = ephem.Observer()
-    obs.lat = str(obs_cfg.get("latitude", 50.0))
-    obs.lon = str(obs_cfg.get("longitude", 20.0))
-    obs.elevation = float(obs_cfg.get("elevation", 400))
-    obs.pressure = 0
-
-    telescope = NexStarMount(config=config, hc_enabled=args.hc)
+    server = SimulatorServer(
+        config,
+        port=args.port,
+        hc_enabled=args.hc,
+        stellarium=args.stellarium,
+        stellarium_port=args.stellarium_port,
+        web=args.web,
+        web_host="0.0.0.0",
+        web_port=args.web_port,
+        discovery=True,
+        metrics=args.metrics,
+        metrics_port=args.metrics_port,
+        metrics_host=args.metrics_host,
+        telemetry=args.telemetry or bool(args.telemetry_export),
+        capture=args.capture,
+        fanout=args.fanout,
+        isolated=args.isolated,
+    )
+    mark_startup("mount")
+    if server.telemetry and args.telemetry_export:
+        if not args.telemetry_export.endswith(".npz"):
+            server.telemetry.start_stream(args.telemetry_export)
 
-    background_tasks.append(asyncio.create_task(broadcast(sport=args.port)))
-    background_tasks.append(asyncio.create_task(timer(0.1, telescope)))
+    # ephem is only needed by the front-ends (TUI, web, Stellarium)
+    if args.stellarium or args.web or not args.text:
+        server.get_observer()
+        mark_startup("ephem")
 
-    stell_server = None
-    if args.stellarium:
-        background_tasks.append(
-            asyncio.create_task(report_scope_pos(0.1, telescope, obs))
-        )
-        loop = asyncio.get_running_loop()
-        stell_server = await loop.create_server(
-            lambda: StellariumServer(telescope, obs), host="", port=args.stellarium_port
-        )
+    await server.start()
+    mark_startup("listening")
 
-    if args.web:
+    profiler = profile_window = None
+    if args.profile or args.profile_signal:
         try:
-            try:
-                from .web_console import WebConsole
-            except (ImportError, ValueError):
-                from web_console import WebConsole  # type: ignore
-
-            global web_console_instance
-            web_console_instance = WebConsole(
-                telescope, obs, host="0.0.0.0", port=args.web_port
-            )
-            web_console_instance.run()
+            from .profiler import ProfileWindow, SamplingProfiler
         except ImportError:
-            logger.error("Error: Web dependencies (fastapi, uvicorn) not installed.")
-            logger.info("Run: pip install .[web]")
+            from profiler import ProfileWindow, SamplingProfiler  # type: ignore
+
+        prefix = args.profile or "caux-profile"
+        if args.profile_signal:
+            profile_window = ProfileWindow(prefix, args.profile_interval)
+            if profile_window.install(asyncio.get_running_loop()):
+                logger.info(
+                    f"Send SIGUSR1 (kill -USR1 {os.getpid()}) to open/close "
+                    f"a profiling window ({prefix}-N.collapsed/.pstats)"
+                )
+            else:
+                logger.error("Signal-triggered profiling is not supported here")
+        else:
+            profiler = SamplingProfiler(args.profile_interval)
+            profiler.start()
 
-    scope_server = await asyncio.start_server(handle_port2000, host="", port=args.port)
+    try:
+        await run_frontend(args, server, obs_cfg)
+    finally:
+        if profiler:
+            profiler.stop()
+            profiler.save(args.profile)
+        if profile_window:
+            profile_window.close()
+
+    await server.stop()
+    if server.telemetry and args.telemetry_export:
+        if args.telemetry_export.endswith(".npz"):
+            server.telemetry.export_npz(args.telemetry_export)
+        else:
+            server.telemetry.stop_stream()
+        logger.info(f"Telemetry written to {args.telemetry_export}")
 
-    if args.text:
-        logger.info(f"Simulator running in headless mode on port {args.port}")
+
+async def run_frontend(args: Any, server: SimulatorServer, obs_cfg: dict) -> None:
+    """Runs the TUI (or the headless loop) until the user quits."""
+    telescope = server.mount
+    if args.startup_profile:
+        print(startup_report())
+    elif args.text:
+        logger.info(f"Simulator running in headless mode on port {server.aux_port}")
         try:
             while True:
                 await asyncio.sleep(1.0)
@@ -465,7 +1013,9 @@ async def main_async():
             except (ImportError, ValueError):
                 from nse_tui import SimulatorApp  # type: ignore
 
-            app = SimulatorApp(telescope, obs, args, obs_cfg)
+            app = SimulatorApp(
+                telescope, server.get_observer(), args, obs_cfg, args.tui_refresh
+            )
             await app.run_async()
         except ImportError:
             logger.error("Error: Textual TUI not installed.")
@@ -473,20 +1023,6 @@ async def main_async():
             while True:
                 await asyncio.sleep(1.0)
 
-    scope_server.close()
-    if stell_server:
-        stell_server.close()
-
-    # Graceful shutdown of background tasks
-    if web_console_instance:
-        await web_console_instance.stop()
-
-    for task in background_tasks:
-        task.cancel()
-
-    if background_tasks:
-        await asyncio.gather(*background_tasks, return_exceptions=True)
-
 
 def main():
     try:
@@ -3,9 +3,10 @@ Textual-based TUI for the Celestron AUX Simulator.
 """
 
 import logging
+import time
 from datetime import datetime, timezone
 from collections import deque
-from typing import Deque, Any, Dict
+from typing import Deque, Any, Dict, List
 import ephem
 from math import pi
 from textual.app import App, ComposeResult
@@ -83,8 +84,10 @@ class SimulatorApp(App):
         obs: ephem.Observer,
         args: Any,
         obs_cfg: Dict[str, Any],
+        refresh_rate: float = 10.0,
     ) -> None:
         super().__init__()
+        self.refresh_rate = refresh_rate
         self.telescope = tel
         self.obs = obs
         self.args = args
@@ -92,6 +95,13 @@ class SimulatorApp(App):
         self.ra_samples: Deque[float] = deque(maxlen=10)
         self.dec_samples: Deque[float] = deque(maxlen=10)
         self.time_samples: Deque[datetime] = deque(maxlen=10)
+        # Read cursor into the mount's command log
+        self._cmd_seq = 0
+        self._events = tel.events.subscribe()
+        self._last_redraw = 0.0
+        # Widget references and the text they currently show
+        self._widgets: Dict[str, Static] = {}
+        self._shown: Dict[str, str] = {}
 
     def compose(self) -> ComposeResult:
         yield Header(show_clock=True)
@@ -116,12 +126,9 @@ class SimulatorApp(App):
                 yield Static(id="status-offset")
                 yield Static("")
                 yield Static("IMPERFECTIONS", classes="panel-title")
-                yield Static(id="imp-backlash")
-                yield Static(id="imp-pe")
-                yield Static(id="imp-cone")
-                yield Static(id="imp-jitter")
-                yield Static(id="imp-nonperp")
-                yield Static(id="imp-drift")
+                # Fixed at startup: rendered once
+                for line in self.imperfection_lines():
+                    yield Static(line)
 
             with Vertical(id="right-panel"):
                 yield Static("AUX BUS LOG", classes="panel-title")
@@ -131,14 +138,47 @@ class SimulatorApp(App):
                 yield Log(id="sys-messages")
         yield Footer()
 
+    def imperfection_lines(self) -> List[str]:
+        tel = self.telescope
+        pe_arcsec = tel.pe_amplitude * 360 * 3600
+        cone_arcmin = tel.cone_error * 360 * 60
+        jitter_steps = tel.jitter_sigma * 16777216
+        nonperp_arcmin = tel.non_perp * 360 * 60
+        return [
+            f"Backlash: [cyan]{tel.backlash_steps}[/cyan] steps",
+            f'Periodic Error: [cyan]{pe_arcsec:.1f}[/cyan]"',
+            f"Cone Error: [cyan]{cone_arcmin:.1f}[/cyan]'",
+            f"Jitter: [cyan]{jitter_steps:.1f}[/cyan] steps",
+            f"Non-perp: [cyan]{nonperp_arcmin:.1f}[/cyan]'",
+            f"Clock Drift: [cyan]{tel.clock_drift * 100:.3f}%[/cyan]",
+        ]
+
     def on_mount(self) -> None:
-        self.set_interval(0.1, self.update_stats)
+        self._widgets = {w.id: w for w in self.query(Static) if w.id}
+        self._aux_log = self.query_one("#aux-log", Log)
+        self._sys_log = self.query_one("#sys-messages", Log)
+        self.set_interval(1.0 / self.refresh_rate, self.update_stats)
         self.log_sys(f"Simulator started on port {self.args.port}")
         if self.args.stellarium:
             self.log_sys(f"Stellarium server on port {self.args.stellarium_port}")
         self.log_sys(f"Location: {self.obs_cfg.get('name', 'Default')}")
 
     def update_stats(self) -> None:
+        # Redraw the mount panel on state change events; the sky position
+        # still drifts while the mount is idle, so refresh it once a second
+        now = time.monotonic()
+        if self._events.drain() or now - self._last_redraw >= 1.0:
+            self._last_redraw = now
+            self.update_mount()
+        self.update_logs()
+
+    def _set(self, widget_id: str, text: str) -> None:
+        """Updates a widget only when its text changed."""
+        if self._shown.get(widget_id) != text:
+            self._shown[widget_id] = text
+            self._widgets[widget_id].update(text)
+
+    def update_mount(self) -> None:
         alt_str = repr_angle(self.telescope.alt, signed=True)
         azm_str = repr_angle(self.telescope.azm)
 
@@ -151,23 +191,28 @@ class SimulatorApp(App):
         sky_azm, sky_alt = self.telescope.get_sky_altaz()
         rajnow, decjnow = self.obs.radec_of(sky_azm * 2 * pi, sky_alt * 2 * pi)
 
-        self.ra_samples.append(float(rajnow))
-        self.dec_samples.append(float(decjnow))
-        self.time_samples.append(now)
-
         v_ra = 0.0
         v_dec = 0.0
-        if len(self.time_samples) > 1:
-            dt = (self.time_samples[-1] - self.time_samples[0]).total_seconds()
-            if dt > 0:
-                d_ra = self.ra_samples[-1] - self.ra_samples[0]
-                if d_ra > pi:
-                    d_ra -= 2 * pi
-                if d_ra < -pi:
-                    d_ra += 2 * pi
-                d_dec = self.dec_samples[-1] - self.dec_samples[0]
-                v_ra = (d_ra * (180.0 / pi)) / dt
-                v_dec = (d_dec * (180.0 / pi)) / dt
+        recorder = getattr(self.telescope, "telemetry", None)
+        if recorder is not None and recorder.observer is not None:
+            # Sky velocities from the per-tick telemetry history
+            v_ra = recorder.velocity("ra", 1.0)
+            v_dec = recorder.velocity("dec", 1.0)
+        else:
+            self.ra_samples.append(float(rajnow))
+            self.dec_samples.append(float(decjnow))
+            self.time_samples.append(now)
+            if len(self.time_samples) > 1:
+                dt = (self.time_samples[-1] - self.time_samples[0]).total_seconds()
+                if dt > 0:
+                    d_ra = self.ra_samples[-1] - self.ra_samples[0]
+                    if d_ra > pi:
+                        d_ra -= 2 * pi
+                    if d_ra < -pi:
+                        d_ra += 2 * pi
+                    d_dec = self.dec_samples[-1] - self.dec_samples[0]
+                    v_ra = (d_ra * (180.0 / pi)) / dt
+                    v_dec = (d_dec * (180.0 / pi)) / dt
 
         mode = (
             "SLEWING"
@@ -177,70 +222,46 @@ class SimulatorApp(App):
         tracking = "ON" if self.telescope.guiding else "OFF"
         battery = f"{self.telescope.bat_voltage / 1e6:.2f}V"
 
-        self.query_one("#pos-alt", Static).update(f"Alt: [cyan]{alt_str}[/cyan]")
-        self.query_one("#pos-azm", Static).update(f"Azm: [cyan]{azm_str}[/cyan]")
-        self.query_one("#vel-alt", Static).update(f"vAlt: [blue]{v_alt:+.4f}°/s[/blue]")
-        self.query_one("#vel-azm", Static).update(f"vAzm: [blue]{v_azm:+.4f}°/s[/blue]")
+        self._set("pos-alt", f"Alt: [cyan]{alt_str}[/cyan]")
+        self._set("pos-azm", f"Azm: [cyan]{azm_str}[/cyan]")
+        self._set("vel-alt", f"vAlt: [blue]{v_alt:+.4f}°/s[/blue]")
+        self._set("vel-azm", f"vAzm: [blue]{v_azm:+.4f}°/s[/blue]")
 
-        self.query_one("#pos-ra", Static).update(f"RA:  [yellow]{rajnow}[/yellow]")
-        self.query_one("#pos-dec", Static).update(f"Dec: [yellow]{decjnow}[/yellow]")
-        self.query_one("#vel-ra", Static).update(
-            f'vRA:  [blue]{v_ra * 3600:+.2f}"/s[/blue]'
-        )
-        self.query_one("#vel-dec", Static).update(
-            f'vDec: [blue]{v_dec * 3600:+.2f}"/s[/blue]'
-        )
+        self._set("pos-ra", f"RA:  [yellow]{rajnow}[/yellow]")
+        self._set("pos-dec", f"Dec: [yellow]{decjnow}[/yellow]")
+        self._set("vel-ra", f'vRA:  [blue]{v_ra * 3600:+.2f}"/s[/blue]')
+        self._set("vel-dec", f'vDec: [blue]{v_dec * 3600:+.2f}"/s[/blue]')
 
-        self.query_one("#status-mode", Static).update(f"Mode: [green]{mode}[/green]")
-        self.query_one("#status-tracking", Static).update(
-            f"Tracking: [magenta]{tracking}[/magenta]"
-        )
-        self.query_one("#status-battery", Static).update(
-            f"Battery: [red]{battery}[/red]"
-        )
+        self._set("status-mode", f"Mode: [green]{mode}[/green]")
+        self._set("status-tracking", f"Tracking: [magenta]{tracking}[/magenta]")
+        self._set("status-battery", f"Battery: [red]{battery}[/red]")
         time_offset = self.telescope.config.get("observer", {}).get("time_offset", 0.0)
-        self.query_one("#status-offset", Static).update(
-            f"Time Offset: [magenta]{time_offset:+.1f}s[/magenta]"
+        self._set(
+            "status-offset", f"Time Offset: [magenta]{time_offset:+.1f}s[/magenta]"
         )
 
-        self.query_one("#imp-backlash", Static).update(
-            f"Backlash: [cyan]{self.telescope.backlash_steps}[/cyan] steps"
-        )
-        pe_arcsec = self.telescope.pe_amplitude * 360 * 3600
-        self.query_one("#imp-pe", Static).update(
-            f'Periodic Error: [cyan]{pe_arcsec:.1f}[/cyan]"'
-        )
-        cone_arcmin = self.telescope.cone_error * 360 * 60
-        self.query_one("#imp-cone", Static).update(
-            f"Cone Error: [cyan]{cone_arcmin:.1f}[/cyan]'"
-        )
-        jitter_steps = self.telescope.jitter_sigma * 16777216
-        self.query_one("#imp-jitter", Static).update(
-            f"Jitter: [cyan]{jitter_steps:.1f}[/cyan] steps"
-        )
-        nonperp_arcmin = self.telescope.non_perp * 360 * 60
-        self.query_one("#imp-nonperp", Static).update(
-            f"Non-perp: [cyan]{nonperp_arcmin:.1f}[/cyan]'"
-        )
-        self.query_one("#imp-drift", Static).update(
-            f"Clock Drift: [cyan]{self.telescope.clock_drift * 100:.3f}%[/cyan]"
-        )
-
-        while self.telescope.cmd_log:
-            entry = self.telescope.cmd_log.popleft()
-            self.query_one("#aux-log", Log).write_line(
-                f"[blue]{datetime.now().strftime('%H:%M:%S')}[/blue] {entry}"
-            )
+    def update_logs(self) -> None:
+        cmd_log = self.telescope.cmd_log
+        if cmd_log.seq != self._cmd_seq:
+            aux_log = self._aux_log
+            # Format at most the 30 newest records per refresh
+            for rec in cmd_log.since(max(self._cmd_seq, cmd_log.seq - 30)):
+                stamp = datetime.fromtimestamp(rec.time).strftime("%H:%M:%S")
+                aux_log.write_line(f"[blue]{stamp}[/blue] {rec}")
+            self._cmd_seq = cmd_log.seq
 
         while self.telescope.msg_log:
             msg = self.telescope.msg_log.popleft()
             self.log_sys(msg)
 
     def log_sys(self, message: str) -> None:
-        self.query_one("#sys-messages", Log).write_line(
+        self._sys_log.write_line(
             f"[blue]{datetime.now().strftime('%H:%M:%S')}[/blue] {message}"
         )
 
+    def on_unmount(self) -> None:
+        self._events.close()
+
     async def action_park(self) -> None:
         self.log_sys("Parking request...")
         self.telescope.trg_alt = 0
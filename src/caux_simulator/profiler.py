@@ -0,0 +1,173 @@
+"""
+Sampling Profiler
+
+Samples the stack of the event loop thread from a background thread at a
+fixed interval, so the simulator can be profiled under load without code
+changes. Results are written as collapsed stacks (for flamegraph.pl,
+speedscope or inferno) and as a pstats file built from the samples
+(times are sample counts multiplied by the interval).
+"""
+
+import logging
+import marshal
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (filename, first line, function name), as used by pstats
+FuncKey = Tuple[str, int, str]
+
+
+class SamplingProfiler:
+    """Statistical profiler of one thread (the calling thread by default)."""
+
+    def __init__(self, interval: float = 0.005, thread_id: Optional[int] = None):
+        self.interval = interval
+        self.thread_id = thread_id or threading.get_ident()
+        self.samples: Counter = Counter()
+        self.started: Optional[float] = None
+        self.duration = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self) -> None:
+        if self._thread:
+            return
+        self._stop.clear()
+        self.started = time.monotonic()
+        self._thread = threading.Thread(
+            target=self._run, name="caux-profiler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        if not self._thread:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        if self.started is not None:
+            self.duration += time.monotonic() - self.started
+
+    def clear(self) -> None:
+        self.samples.clear()
+        self.duration = 0.0
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None or self.thread_id == own:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append((code.co_filename, code.co_firstlineno, code.co_name))
+                frame = frame.f_back
+            self.samples[tuple(reversed(stack))] += 1
+
+    # --- Output ---
+
+    @staticmethod
+    def _label(key: FuncKey) -> str:
+        filename, line, name = key
+        return f"{name} ({os.path.basename(filename)}:{line})"
+
+    def collapsed(self) -> List[str]:
+        """Stacks in the collapsed format: `root;...;leaf count`."""
+        lines = []
+        for stack, count in self.samples.most_common():
+            lines.append(";".join(self._label(f) for f in stack) + f" {count}")
+        return lines
+
+    def pstats_dict(self) -> Dict[FuncKey, tuple]:
+        """Samples converted to the `pstats` raw stats dict."""
+        dt = self.interval
+        stats: Dict[FuncKey, list] = {}
+        for stack, count in self.samples.items():
+            seen = set()
+            for i, func in enumerate(stack):
+                entry = stats.setdefault(func, [0, 0, 0.0, 0.0, {}])
+                if i == len(stack) - 1:
+                    entry[2] += count * dt  # own time
+                if func in seen:
+                    continue  # recursion: count cumulative time once
+                seen.add(func)
+                entry[0] += count
+                entry[1] += count
+                entry[3] += count * dt
+                if i > 0:
+                    caller = stack[i - 1]
+                    c = entry[4].get(caller, (0, 0, 0.0, 0.0))
+                    own = count * dt if i == len(stack) - 1 else 0.0
+                    entry[4][caller] = (
+                        c[0] + count,
+                        c[1] + count,
+                        c[2] + own,
+                        c[3] + count * dt,
+                    )
+        return {k: (v[0], v[1], v[2], v[3], v[4]) for k, v in stats.items()}
+
+    def save(self, prefix: str) -> Tuple[str, str]:
+        """Writes `<prefix>.collapsed` and `<prefix>.pstats`; returns the paths."""
+        collapsed_path = f"{prefix}.collapsed"
+        pstats_path = f"{prefix}.pstats"
+        with open(collapsed_path, "w") as f:
+            f.write("\n".join(self.collapsed()) + "\n")
+        with open(pstats_path, "wb") as f:
+            marshal.dump(self.pstats_dict(), f)
+        total = sum(self.samples.values())
+        logger.info(
+            f"Profile: {total} samples over {self.duration:.1f}s written to "
+            f"{collapsed_path} and {pstats_path}"
+        )
+        return collapsed_path, pstats_path
+
+
+class ProfileWindow:
+    """
+    Signal-controlled profiling: each signal toggles a window; closing a
+    window writes `<prefix>-<n>.collapsed/.pstats`.
+    """
+
+    def __init__(self, prefix: str = "caux-profile", interval: float = 0.005):
+        self.prefix = prefix
+        self.profiler = SamplingProfiler(interval)
+        self.windows = 0
+
+    def toggle(self) -> None:
+        if not self.profiler.running:
+            self.profiler.clear()
+            self.profiler.start()
+            logger.warning("Profiling window opened")
+        else:
+            self.close()
+
+    def close(self) -> None:
+        if self.profiler.running:
+            self.profiler.stop()
+            self.windows += 1
+            self.profiler.save(f"{self.prefix}-{self.windows}")
+            logger.warning(f"Profiling window {self.windows} closed")
+
+    def install(self, loop, signum: Optional[int] = None) -> bool:
+        """Installs the toggle on `signum` (SIGUSR1); returns False if unsupported."""
+        import signal
+
+        signum = signum or getattr(signal, "SIGUSR1", None)
+        if signum is None:
+            return False
+        try:
+            loop.add_signal_handler(signum, self.toggle)
+        except (NotImplementedError, RuntimeError):
+            return False
+        return True
@@ -0,0 +1,134 @@
+"""
+Pytest plugin providing simulator fixtures.
+
+Registered through the `pytest11` entry point when the package is installed.
+One simulator is started per test session, i.e. per pytest-xdist worker,
+on an ephemeral port, so parallel runs never collide. Mount state is reset
+in place between tests instead of restarting the simulator.
+
+Fixtures:
+    caux_config   Configuration dict used for the simulator (override it in
+                  conftest.py to test other imperfection settings).
+    caux_server   Session-scoped simulator listening on 127.0.0.1:<port>.
+    caux_sim      `caux_server` with the mount reset before each test.
+    caux_channel  In-process `LoopbackChannel` on a freshly reset mount.
+
+Without installing the package, enable it with
+`pytest -p caux_simulator.pytest_plugin`, or list it in `pytest_plugins` of
+conftest.py when the entry point is absent (as tests/conftest.py does), so
+that it is not registered twice.
+"""
+
+import asyncio
+import copy
+import logging
+import threading
+from typing import Any, Dict, Iterator, Optional
+
+import pytest
+
+from .bus.mount import NexStarMount
+from .bus.transport import LoopbackChannel
+from .nse_simulator import SimulatorServer
+
+logger = logging.getLogger(__name__)
+
+
+class ThreadedSimulator:
+    """`SimulatorServer` running on its own event loop in a background thread."""
+
+    def __init__(self, config: Dict[str, Any], host: str = "127.0.0.1"):
+        self.server = SimulatorServer(copy.deepcopy(config), host=host, port=0)
+        self.mount = self.server.mount
+        self.host = host
+        self.loop = asyncio.new_event_loop()
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+        self._error: Optional[BaseException] = None
+
+    @property
+    def port(self) -> int:
+        return self.server.aux_port
+
+    @property
+    def address(self) -> tuple:
+        return (self.host, self.port)
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.loop.run_until_complete(self.server.start())
+        except BaseException as e:
+            # Reported by start() in the calling thread
+            self._error = e
+            self.loop.run_until_complete(self.server.stop())
+            self.loop.close()
+            self._ready.set()
+            return
+        self._ready.set()
+        try:
+            self.loop.run_forever()
+        finally:
+            self.loop.run_until_complete(self.server.stop())
+            self.loop.close()
+
+    def start(self, timeout: float = 10.0) -> "ThreadedSimulator":
+        self._thread = threading.Thread(
+            target=self._run, name="caux-simulator", daemon=True
+        )
+        self._thread.start()
+        if not self._ready.wait(timeout):
+            raise TimeoutError(f"Simulator did not start within {timeout:g} s")
+        if self._error is not None:
+            self._thread.join()
+            self._thread = None
+            raise self._error
+        return self
+
+    def stop(self) -> None:
+        if self._thread:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._thread.join()
+            self._thread = None
+
+    def call(self, fn: Any, *args: Any) -> Any:
+        """Runs `fn(*args)` on the simulator loop thread and returns its result."""
+
+        async def _call() -> Any:
+            return fn(*args)
+
+        return asyncio.run_coroutine_threadsafe(_call(), self.loop).result()
+
+    def reset(self) -> None:
+        """Resets the mount state between ticks and packets."""
+        self.call(self.mount.reset)
+
+
+@pytest.fixture(scope="session")
+def caux_config() -> Dict[str, Any]:
+    return {"simulator": {"imperfections": {}}}
+
+
+@pytest.fixture(scope="session")
+def caux_server(caux_config: Dict[str, Any]) -> Iterator[ThreadedSimulator]:
+    sim = ThreadedSimulator(caux_config).start()
+    logger.info(f"caux simulator listening on {sim.host}:{sim.port}")
+    yield sim
+    sim.stop()
+
+
+@pytest.fixture
+def caux_sim(caux_server: ThreadedSimulator) -> ThreadedSimulator:
+    caux_server.reset()
+    return caux_server
+
+
+@pytest.fixture(scope="session")
+def _caux_loopback_mount(caux_config: Dict[str, Any]) -> NexStarMount:
+    return NexStarMount(config=copy.deepcopy(caux_config))
+
+
+@pytest.fixture
+def caux_channel(_caux_loopback_mount: NexStarMount) -> LoopbackChannel:
+    _caux_loopback_mount.reset()
+    return LoopbackChannel(_caux_loopback_mount)
@@ -0,0 +1,322 @@
+// Celestron AUX 3D Console: scene, pose extrapolation and telemetry display.
+// Geometry and version are read from /api/config; state arrives on /ws.
+
+async function main() {
+    const config = await (await fetch('/api/config')).json();
+    const geo = config.geometry;
+    document.title = 'Celestron AUX 3D Console v' + config.version;
+    document.getElementById('version').innerText = 'v' + config.version;
+
+    const scene = new THREE.Scene();
+    const camera = new THREE.PerspectiveCamera(geo.camera_fov, window.innerWidth / window.innerHeight, 0.1, 1000);
+
+    // Use the geo value if it exists, otherwise fallback
+    const cam_dist = geo.camera_distance || 15.0;
+    const renderer = new THREE.WebGLRenderer({ antialias: true });
+    renderer.setSize(window.innerWidth, window.innerHeight);
+    document.body.appendChild(renderer.domElement);
+
+    const controls = new THREE.OrbitControls(camera, renderer.domElement);
+
+    // Lighting
+    const light = new THREE.DirectionalLight(0xffffff, 1);
+    light.position.set(5, 10, 5).normalize();
+    scene.add(light);
+    scene.add(new THREE.AmbientLight(0x404040));
+
+    // Grid & Axis
+    scene.add(new THREE.GridHelper(geo.grid_size, geo.grid_divisions, 0x414868, 0x24283b));
+
+    // --- Utility for text labels ---
+    function createLabel(text, color = '#7aa2f7', fontSize = geo.label_font_size, scale = geo.label_cardinal_scale) {
+        const canvas = document.createElement('canvas');
+        const ctx = canvas.getContext('2d');
+        canvas.width = 256;
+        canvas.height = 256;
+        ctx.fillStyle = color;
+        ctx.font = `bold ${fontSize}px monospace`;
+        ctx.textAlign = 'center';
+        ctx.textBaseline = 'middle';
+        ctx.fillText(text, 128, 128);
+        const texture = new THREE.CanvasTexture(canvas);
+        const spriteMaterial = new THREE.SpriteMaterial({ map: texture });
+        const sprite = new THREE.Sprite(spriteMaterial);
+        sprite.scale.set(scale, scale, 1);
+        return sprite;
+    }
+
+    // --- Mount Model ---
+    const mountMaterial = new THREE.MeshPhongMaterial({ color: 0x414868 });
+    const otaMaterial = new THREE.MeshPhongMaterial({ color: 0x7aa2f7 });
+    const cameraMaterial = new THREE.MeshPhongMaterial({ color: 0xbb9af7 });
+    const scaleMaterial = new THREE.LineBasicMaterial({ color: 0x565f89 });
+    const indicatorMaterial = new THREE.MeshBasicMaterial({ color: 0xf7768e });
+
+    // Base
+    const base = new THREE.Mesh(new THREE.CylinderGeometry(0.3, 0.4, geo.base_height, 32), mountMaterial);
+    base.position.y = geo.base_height / 2;
+    scene.add(base);
+
+    // Azimuth Scale (Stationary)
+    const azScale = new THREE.Group();
+    for (let i = 0; i < 360; i += 10) {
+        const isMajor = i % 30 === 0;
+        const length = isMajor ? 0.08 : 0.04;
+        const rad = THREE.MathUtils.degToRad(i);
+        const tickGeom = new THREE.BufferGeometry().setFromPoints([
+            new THREE.Vector3(Math.sin(rad) * geo.az_scale_radius, 0, Math.cos(rad) * geo.az_scale_radius),
+            new THREE.Vector3(Math.sin(rad) * (geo.az_scale_radius + length), 0, Math.cos(rad) * (geo.az_scale_radius + length))
+        ]);
+        const tick = new THREE.Line(tickGeom, scaleMaterial);
+        // Azimuth 0 is North (Z+)
+        tick.rotation.y = THREE.MathUtils.degToRad(-i);
+        azScale.add(tick);
+
+        if (isMajor) {
+            const label = createLabel(i.toString(), '#565f89', geo.label_font_size, geo.label_scale_scale);
+            label.position.set(Math.sin(rad) * (geo.az_scale_radius + 0.2), 0, Math.cos(rad) * (geo.az_scale_radius + 0.2));
+            azScale.add(label);
+        }
+    }
+    azScale.position.y = geo.base_height;
+    scene.add(azScale);
+
+    // Azimuth Group (Rotates around Y)
+    const azmGroup = new THREE.Group();
+    azmGroup.position.y = geo.base_height;
+    scene.add(azmGroup);
+
+    // Azimuth Indicator Dot (Red - Viewing Direction Z+)
+    const azDot = new THREE.Mesh(new THREE.SphereGeometry(geo.indicator_size), indicatorMaterial);
+    azDot.position.set(0, geo.indicator_size, geo.az_scale_radius);
+    azmGroup.add(azDot);
+
+    // Cardinal points (Standard Top-down: North=+Z, South=-Z, East=-X, West=+X for right-handed coordinate system)
+    // Correcting based on user feedback that E/W were switched.
+    const cardinalN = createLabel("N", "#f7768e", geo.label_font_size, geo.label_cardinal_scale); cardinalN.position.set(0, geo.base_height, 0.8); scene.add(cardinalN);
+    const cardinalS = createLabel("S", "#7aa2f7", geo.label_font_size, geo.label_cardinal_scale); cardinalS.position.set(0, geo.base_height, -0.8); scene.add(cardinalS);
+    const cardinalE = createLabel("E", "#7aa2f7", geo.label_font_size, geo.label_cardinal_scale); cardinalE.position.set(-0.9, geo.base_height, 0); scene.add(cardinalE);
+    const cardinalW = createLabel("W", "#7aa2f7", geo.label_font_size, geo.label_cardinal_scale); cardinalW.position.set(0.9, geo.base_height, 0); scene.add(cardinalW);
+
+    // Fork Arm
+    const arm = new THREE.Mesh(new THREE.BoxGeometry(geo.arm_thickness, geo.fork_height, 0.2), mountMaterial);
+    arm.position.set(geo.fork_width, geo.fork_height/2, 0);
+    azmGroup.add(arm);
+
+    // Pivot Axis
+    const pivot = new THREE.Mesh(new THREE.CylinderGeometry(0.05, 0.05, geo.fork_width, 16), mountMaterial);
+    pivot.rotation.z = Math.PI / 2;
+    pivot.position.set(geo.fork_width/2, geo.fork_height * 0.8, 0);
+    azmGroup.add(pivot);
+
+    // Altitude Scale (Vertical radial lines stationary on the fork)
+    const altScale = new THREE.Group();
+    const altRadius = geo.alt_scale_radius;
+    for (let i = -20; i <= 90; i += 10) {
+        const isMajor = i % 30 === 0;
+        const length = isMajor ? 0.08 : 0.04;
+        const rad = THREE.MathUtils.degToRad(i);
+        const tickGeom = new THREE.BufferGeometry().setFromPoints([
+            new THREE.Vector3(0, Math.sin(rad) * altRadius, Math.cos(rad) * altRadius),
+            new THREE.Vector3(0, Math.sin(rad) * (altRadius + length), Math.cos(rad) * (altRadius + length))
+        ]);
+        const tick = new THREE.Line(tickGeom, scaleMaterial);
+        altScale.add(tick);
+
+        if (isMajor) {
+            const label = createLabel(i.toString(), '#565f89', geo.label_font_size, geo.label_scale_scale);
+            label.position.set(0.05, Math.sin(rad) * (altRadius + 0.15), Math.cos(rad) * (altRadius + 0.15));
+            altScale.add(label);
+        }
+    }
+    altScale.position.set(geo.fork_width + geo.arm_thickness/2, geo.fork_height * 0.8, 0);
+    azmGroup.add(altScale);
+
+    // Altitude Group (Rotates around X)
+    const altGroup = new THREE.Group();
+    altGroup.position.set(0, geo.fork_height * 0.8, 0);
+    azmGroup.add(altGroup);
+
+    // Altitude Indicator Dot (Moves with OTA)
+    const altDot = new THREE.Mesh(new THREE.SphereGeometry(geo.indicator_size), indicatorMaterial);
+    altDot.position.set(geo.fork_width + geo.arm_thickness/2 + geo.indicator_size, 0, altRadius);
+    altGroup.add(altDot);
+
+    // OTA
+    const ota = new THREE.Mesh(new THREE.CylinderGeometry(geo.ota_radius, geo.ota_radius, geo.ota_length, 32), otaMaterial);
+    ota.rotation.x = Math.PI / 2;
+    altGroup.add(ota);
+
+    // Visual Back / Camera
+    const cam = new THREE.Mesh(new THREE.BoxGeometry(0.12, 0.12, geo.camera_length), cameraMaterial);
+    cam.position.set(0, 0, -geo.ota_length/2 - geo.camera_length/2);
+    altGroup.add(cam);
+
+    const cam_alt = THREE.MathUtils.degToRad(geo.camera_alt);
+    const cam_az = THREE.MathUtils.degToRad(geo.camera_az);
+    camera.position.x = cam_dist * Math.cos(cam_alt) * Math.sin(cam_az);
+    camera.position.y = cam_dist * Math.sin(cam_alt);
+    camera.position.z = cam_dist * Math.cos(cam_alt) * Math.cos(cam_az);
+    controls.target.set(0, 0.5, 0);
+    controls.update();
+
+    // Sky View Canvas
+    const skyCanvas = document.getElementById('sky-canvas');
+    const skyCtx = skyCanvas.getContext('2d');
+    const zoomCanvas = document.getElementById('zoom-canvas');
+    const zoomCtx = zoomCanvas.getContext('2d');
+
+    function resizeSky() {
+        const skyCont = document.getElementById('sky-view');
+        skyCanvas.width = skyCont.clientWidth;
+        skyCanvas.height = skyCont.clientHeight;
+        const zoomCont = document.getElementById('zoom-view');
+        zoomCanvas.width = zoomCont.clientWidth;
+        zoomCanvas.height = zoomCont.clientHeight;
+    }
+    window.addEventListener('resize', resizeSky);
+    resizeSky();
+
+    function drawSkyView(ctx, canvas, stars, fov, isZoom = false) {
+        const w = canvas.width;
+        const h = canvas.height;
+        const center = w / 2;
+
+        ctx.fillStyle = 'black';
+        ctx.fillRect(0, 0, w, h);
+
+        ctx.strokeStyle = isZoom ? '#f7768e' : '#414868';
+        ctx.lineWidth = 1;
+        ctx.beginPath();
+        ctx.moveTo(center, center - center*0.2); ctx.lineTo(center, center + center*0.2);
+        ctx.moveTo(center - center*0.2, center); ctx.lineTo(center + center*0.2, center);
+        ctx.stroke();
+
+        if (isZoom) {
+            ctx.setLineDash([5, 5]);
+            // Three circles: 10, 20, 30 arcmin (1/6, 1/3, 1/2 deg)
+            // center * (radius_deg / fov_radius_deg)
+            // fov_radius_deg = 0.5
+            ctx.beginPath(); ctx.arc(center, center, center * (1/3), 0, Math.PI*2); ctx.stroke(); // 10'
+            ctx.beginPath(); ctx.arc(center, center, center * (2/3), 0, Math.PI*2); ctx.stroke(); // 20'
+            ctx.beginPath(); ctx.arc(center, center, center, 0, Math.PI*2); ctx.stroke(); // 30'
+            ctx.setLineDash([]);
+        }
+
+        stars.forEach(s => {
+            const scale = 30.0 / fov;
+            const px = center + s.x * center * scale;
+            const py = center - s.y * center * scale;
+            const dist = Math.sqrt(Math.pow(px-center, 2) + Math.pow(py-center, 2));
+            if (dist > center) return;
+
+            const size = Math.max(1, (isZoom ? 10 : 7 - s.mag) * (w/600));
+            ctx.fillStyle = 'white';
+            ctx.beginPath();
+            ctx.arc(px, py, size, 0, Math.PI*2);
+            ctx.fill();
+            if (s.mag < (isZoom ? 4 : 2.5)) {
+                ctx.font = (12 * (w/600)) + 'px monospace';
+                ctx.fillText(s.name, px + 8, py + 8);
+            }
+        });
+    }
+
+    // Pose model: the last reported pose is extrapolated with the reported
+    // velocities at display frame rate (clamped to the GOTO target); the jump
+    // to each new report is blended out over CORRECTION_MS.
+    const CORRECTION_MS = 250;
+    const pose = {azm: 0, alt: 0, v_azm: 0, v_alt: 0, rem_azm: null, rem_alt: null, t: 0};
+    const correction = {azm: 0, alt: 0, t: 0};
+    let poseValid = false;
+
+    function wrap180(d) {
+        return ((d + 180) % 360 + 360) % 360 - 180;
+    }
+
+    function advance(v, rem, dt) {
+        let d = v * dt;
+        if (rem !== null && Math.abs(d) > Math.abs(rem)) d = rem;
+        return d;
+    }
+
+    function currentPose(now) {
+        const dt = Math.max(0, (now - pose.t) / 1000);
+        let azm = pose.azm + advance(pose.v_azm, pose.rem_azm, dt);
+        let alt = pose.alt + advance(pose.v_alt, pose.rem_alt, dt);
+        const k = Math.max(0, 1 - (now - correction.t) / CORRECTION_MS);
+        return {azm: azm + correction.azm * k, alt: alt + correction.alt * k};
+    }
+
+    function setPose(data, now) {
+        if (poseValid) {
+            const shown = currentPose(now);
+            correction.azm = wrap180(shown.azm - data.azm);
+            correction.alt = shown.alt - data.alt;
+            correction.t = now;
+        }
+        const rem = data.goto_remaining || {};
+        pose.azm = data.azm; pose.alt = data.alt;
+        pose.v_azm = data.v_azm; pose.v_alt = data.v_alt;
+        pose.rem_azm = (rem.azm === undefined) ? null : rem.azm;
+        pose.rem_alt = (rem.alt === undefined) ? null : rem.alt;
+        pose.t = now;
+        poseValid = true;
+    }
+
+    function animate(now) {
+        requestAnimationFrame(animate);
+        if (poseValid) {
+            const p = currentPose(now);
+            azmGroup.rotation.y = -THREE.MathUtils.degToRad(p.azm);
+            altGroup.rotation.x = -THREE.MathUtils.degToRad(p.alt);
+            document.getElementById('azm').innerText = (((p.azm % 360) + 360) % 360).toFixed(4);
+            document.getElementById('alt').innerText = p.alt.toFixed(4);
+
+            const worldPos = new THREE.Vector3();
+            cam.getWorldPosition(worldPos);
+            const isCollision = (worldPos.y < geo.base_height + 0.05);
+            document.getElementById('collision').style.display = isCollision ? 'block' : 'none';
+            otaMaterial.color.setHex(isCollision ? 0xf7768e : 0x7aa2f7);
+        }
+        renderer.render(scene, camera);
+    }
+    requestAnimationFrame(animate);
+
+    const ws = new WebSocket('ws://' + window.location.host + '/ws');
+    ws.onmessage = function(event) {
+        const data = JSON.parse(event.data);
+        setPose(data, performance.now());
+        document.getElementById('v_azm').innerText = (data.v_azm * 3600.0).toFixed(4);
+        document.getElementById('v_alt').innerText = (data.v_alt * 3600.0).toFixed(4);
+
+        // Format RA/Dec/LST with decimal seconds for consistency
+        document.getElementById('ra').innerText = data.ra;
+        document.getElementById('dec').innerText = data.dec;
+        document.getElementById('lst').innerText = data.lst;
+        document.getElementById('offset').innerText = data.time_offset.toFixed(1) + 's';
+        document.getElementById('geo').innerText = data.lat + ', ' + data.lon;
+
+        let pwrStr = data.voltage.toFixed(1) + 'V';
+        if (data.charging) pwrStr += ' [CHG]';
+        pwrStr += ' (' + (data.current/1000).toFixed(2) + 'A)';
+        document.getElementById('pwr').innerText = pwrStr;
+
+        document.getElementById('status').innerText = (data.slewing ? 'SLEWING' : (data.guiding ? 'TRACKING' : 'IDLE'));
+
+        // Lights Display
+        const l = data.lights;
+        document.getElementById('lights').innerText = `Tray: ${l.tray} | Logo: ${l.logo} | WiFi: ${l.wifi}`;
+
+        drawSkyView(skyCtx, skyCanvas, data.stars || [], 30.0, false);
+        drawSkyView(zoomCtx, zoomCanvas, data.stars || [], 1.0, true);
+    };
+
+    window.addEventListener('resize', () => {
+        camera.aspect = window.innerWidth / window.innerHeight;
+        camera.updateProjectionMatrix();
+        renderer.setSize(window.innerWidth, window.innerHeight);
+    });
+}
+
+main();
@@ -0,0 +1,298 @@
+"""
+Telemetry Recorder
+
+Records the mount state of every tick into a preallocated NumPy ring
+buffer (encoder and pointing steps, rates, guide rates, sky Alt/Az and
+RA/Dec) and feeds downsampled tiers covering longer windows. Queries pick
+the finest tier that covers the requested window; history can be
+streamed to CSV while recording or exported to NPZ.
+
+Requires NumPy (`pip install .[analysis]`).
+"""
+
+import logging
+import math
+from typing import IO, Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    from .devices.motor import STEPS_PER_REV
+except ImportError:
+    from devices.motor import STEPS_PER_REV  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+# Columns of a record; angles in degrees, rates in steps/s,
+# `t` is the simulation clock and `utc` the synced UNIX time
+FIELDS = (
+    "t",
+    "utc",
+    "azm_steps",
+    "alt_steps",
+    "azm_pnt",
+    "alt_pnt",
+    "azm_rate",
+    "alt_rate",
+    "azm_guide",
+    "alt_guide",
+    "sky_azm",
+    "sky_alt",
+    "ra",
+    "dec",
+)
+INDEX = {name: i for i, name in enumerate(FIELDS)}
+# Wrapping columns are downsampled by taking the last value of the window
+# (averaging across 0/360 would be wrong); all others are averaged
+WRAPPING = ("azm_steps", "azm_pnt", "sky_azm", "ra")
+
+# (ticks per sample, capacity) of the downsampled tiers: 1 s for 24 h and
+# 1 min for 30 days at the default 10 Hz tick
+DEFAULT_TIERS: Tuple[Tuple[int, int], ...] = ((10, 86400), (600, 43200))
+
+
+class Ring:
+    """Fixed-capacity ring of float64 rows."""
+
+    def __init__(self, capacity: int, width: int = len(FIELDS)):
+        self.data = np.full((capacity, width), np.nan)
+        self.capacity = capacity
+        self.count = 0  # Total rows ever appended
+
+    def __len__(self) -> int:
+        return min(self.count, self.capacity)
+
+    def append(self, row: Any) -> None:
+        self.data[self.count % self.capacity] = row
+        self.count += 1
+
+    def rows(self, last: Optional[int] = None) -> np.ndarray:
+        """The newest `last` rows (all by default), oldest first, as a copy."""
+        n = len(self) if last is None else min(last, len(self))
+        end = self.count % self.capacity
+        if n <= end:
+            return self.data[end - n : end].copy()
+        return np.concatenate((self.data[end - n :], self.data[:end]))
+
+    def clear(self) -> None:
+        self.count = 0
+
+    def first_time(self) -> float:
+        if not self.count:
+            return math.inf
+        return float(self.data[(self.count - len(self)) % self.capacity, 0])
+
+
+class Tier(Ring):
+    """Downsampled ring fed by the full-rate records."""
+
+    def __init__(self, factor: int, capacity: int):
+        super().__init__(capacity)
+        self.factor = factor
+        self._sum = np.zeros(len(FIELDS))
+        self._n = 0
+        self._wrap = np.array([INDEX[f] for f in WRAPPING])
+
+    def feed(self, row: np.ndarray) -> None:
+        self._sum += row
+        self._n += 1
+        if self._n == self.factor:
+            mean = self._sum / self._n
+            mean[self._wrap] = row[self._wrap]
+            self.append(mean)
+            self._sum[:] = 0.0
+            self._n = 0
+
+    def clear(self) -> None:
+        super().clear()
+        self._sum[:] = 0.0
+        self._n = 0
+
+
+class TelemetryRecorder:
+    """
+    Per-tick telemetry history of one mount.
+
+    `observer` (an ephem.Observer owned by the recorder) enables RA/Dec;
+    without it those columns are NaN.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 36000,
+        tiers: Sequence[Tuple[int, int]] = DEFAULT_TIERS,
+        observer: Optional[Any] = None,
+    ):
+        self.raw = Ring(capacity)
+        self.tiers = [Tier(f, c) for f, c in tiers]
+        self.observer = observer
+        self._row = np.zeros(len(FIELDS))
+        self._location: Optional[Tuple[Any, Any]] = None
+        self._stream: Optional[IO[str]] = None
+        self._stream_pending = 0
+        self._stream_every = 0
+
+    def attach(self, mount: Any) -> "TelemetryRecorder":
+        mount.telemetry = self
+        return self
+
+    def clear(self) -> None:
+        """Drops the history (the simulation clock restarts on mount reset)."""
+        self.flush_stream()
+        for ring in [self.raw] + self.tiers:
+            ring.clear()
+
+    # --- Recording ---
+
+    def record(self, mount: Any) -> None:
+        """Appends the current state of `mount` (called at the end of a tick)."""
+        row = self._row
+        azm, alt = mount.azm_motor, mount.alt_motor
+        utc = mount.get_utc_now()
+        sky_azm, sky_alt = mount.get_sky_altaz()
+        row[0] = mount.sim_time
+        row[1] = utc.timestamp()
+        row[2] = azm.steps
+        row[3] = alt.steps
+        row[4] = azm.pointing_steps
+        row[5] = alt.pointing_steps
+        row[6] = azm.rate_steps
+        row[7] = alt.rate_steps
+        row[8] = azm.guide_rate_steps
+        row[9] = alt.guide_rate_steps
+        row[10] = (sky_azm % 1.0) * 360.0
+        row[11] = sky_alt * 360.0
+        if self.observer is not None:
+            ra, dec = self._radec(mount, utc, sky_azm, sky_alt)
+            row[12] = math.degrees(ra)
+            row[13] = math.degrees(dec)
+        else:
+            row[12] = row[13] = math.nan
+
+        self.raw.append(row)
+        for tier in self.tiers:
+            tier.feed(row)
+        if self._stream is not None:
+            self._stream_pending += 1
+            if self._stream_pending >= self._stream_every:
+                self.flush_stream()
+
+    def _radec(self, mount: Any, utc: Any, sky_azm: float, sky_alt: float):
+        import ephem
+
+        obs = self.observer
+        cfg = mount.config.get("observer", {})
+        location = (cfg.get("latitude"), cfg.get("longitude"))
+        if location != self._location:
+            self._location = location
+            if location[0] is not None:
+                obs.lat = str(location[0])
+            if location[1] is not None:
+                obs.lon = str(location[1])
+        obs.date = ephem.Date(utc)
+        obs.epoch = obs.date
+        return obs.radec_of(sky_azm * 2 * math.pi, sky_alt * 2 * math.pi)
+
+    # --- Queries ---
+
+    def query(
+        self,
+        seconds: Optional[float] = None,
+        fields: Optional[Sequence[str]] = None,
+        max_points: Optional[int] = None,
+    ) -> Dict[str, np.ndarray]:
+        """
+        The last `seconds` of history (everything kept by default) from the
+        finest tier that covers the window, thinned to `max_points`.
+        Returns {field: array}; `t` is always included.
+        """
+        names = list(fields) if fields else list(FIELDS)
+        for name in names:
+            if name not in INDEX:
+                raise ValueError(f"Unknown telemetry field: {name}")
+        if "t" not in names:
+            names.insert(0, "t")
+
+        rows = self._window(seconds)
+        if max_points and len(rows) > max_points:
+            step = math.ceil(len(rows) / max_points)
+            # Keep the newest row; thin out older ones
+            rows = rows[(len(rows) - 1) % step :: step]
+        return {name: rows[:, INDEX[name]] for name in names}
+
+    def _window(self, seconds: Optional[float]) -> np.ndarray:
+        if not self.raw.count:
+            return self.raw.rows(0)
+        now = float(self.raw.data[(self.raw.count - 1) % self.raw.capacity, 0])
+        start = -math.inf if seconds is None else now - seconds
+        for ring in [self.raw] + self.tiers:
+            if ring.first_time() <= start:
+                rows = ring.rows()
+                return rows[rows[:, 0] >= start]
+        # Nothing reaches back far enough: the longest history available
+        ring = min([self.raw] + self.tiers, key=lambda r: r.first_time())
+        rows = ring.rows()
+        return rows[rows[:, 0] >= start]
+
+    def velocity(self, field: str, seconds: float = 1.0) -> float:
+        """Mean rate of change of `field` [unit/s] over the last `seconds`."""
+        data = self.query(seconds, [field])
+        t, v = data["t"], data[field]
+        if len(t) < 2 or t[-1] <= t[0]:
+            return 0.0
+        dv = v[-1] - v[0]
+        if field in WRAPPING:
+            period = 360.0 if field in ("sky_azm", "ra") else STEPS_PER_REV
+            dv = (dv + period / 2) % period - period / 2
+        return float(dv / (t[-1] - t[0]))
+
+    @staticmethod
+    def to_json(data: Dict[str, np.ndarray]) -> Dict[str, List[Optional[float]]]:
+        """Query result as JSON-ready lists (NaN becomes None)."""
+        return {
+            name: [None if math.isnan(v) else v for v in values.tolist()]
+            for name, values in data.items()
+        }
+
+    # --- Export ---
+
+    def export_npz(self, path: str) -> None:
+        """Writes the raw history and every tier to a compressed NPZ file."""
+        arrays: Dict[str, Any] = {"fields": np.array(FIELDS)}
+        arrays["raw"] = self.raw.rows()
+        for tier in self.tiers:
+            arrays[f"tier_{tier.factor}"] = tier.rows()
+        np.savez_compressed(path, **arrays)
+
+    def export_csv(self, path: str, tier: int = 0) -> None:
+        """Writes one level (0 = raw, n = n-th tier) to CSV."""
+        ring = self.raw if tier == 0 else self.tiers[tier - 1]
+        with open(path, "w") as f:
+            f.write(",".join(FIELDS) + "\n")
+            np.savetxt(f, ring.rows(), delimiter=",", fmt="%.10g")
+
+    def start_stream(self, path: str, every: int = 100) -> None:
+        """Appends full-rate records to a CSV file in chunks of `every` rows."""
+        self.stop_stream()
+        self._stream = open(path, "w")
+        self._stream.write(",".join(FIELDS) + "\n")
+        self._stream_every = max(1, min(every, self.raw.capacity))
+        self._stream_pending = 0
+
+    def flush_stream(self) -> None:
+        if self._stream is None or not self._stream_pending:
+            return
+        np.savetxt(
+            self._stream,
+            self.raw.rows(self._stream_pending),
+            delimiter=",",
+            fmt="%.10g",
+        )
+        self._stream.flush()
+        self._stream_pending = 0
+
+    def stop_stream(self) -> None:
+        if self._stream is not None:
+            self.flush_stream()
+            self._stream.close()
+            self._stream = None
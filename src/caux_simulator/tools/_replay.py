@@ -0,0 +1,68 @@
+"""
+Trace Replay
+
+Feeds the requests of a trace to mounts in lockstep. Also run as a script
+in a subprocess to replay against another build (`caux-sim-tracediff`
+with a DIR variant): it then imports nothing from that build but
+`caux_simulator.bus.mount`, whose `handle_msg` and `tick` every version
+has.
+"""
+
+import pickle
+import sys
+import time
+from typing import Any, List, NamedTuple, Sequence, Tuple
+
+
+class Exchange(NamedTuple):
+    """One request chunk and everything the simulator sent back for it."""
+
+    t: float
+    conn: int
+    request: bytes
+    response: bytes
+    elapsed: float  # Handling time [s]
+
+
+Request = Tuple[float, int, bytes]
+
+
+def replay(
+    mounts: Sequence[Any], requests: Sequence[Request], dt: float = 0.1
+) -> List[List[Exchange]]:
+    """
+    Feeds the requests to all `mounts` in lockstep, advancing their
+    physics by whole ticks of `dt` to the request times of the trace.
+    Returns the exchanges of every mount.
+    """
+    results: List[List[Exchange]] = [[] for _ in mounts]
+    t0 = requests[0][0] if requests else 0.0
+    ticks = 0
+    for t, conn, data in requests:
+        due = int((t - t0) / dt + 1e-9) if t == t else ticks
+        while ticks < due:
+            for mount in mounts:
+                mount.tick(dt)
+            ticks += 1
+        for mount, result in zip(mounts, results):
+            start = time.perf_counter()
+            resp = mount.handle_msg(data)
+            result.append(Exchange(t, conn, data, resp, time.perf_counter() - start))
+    return results
+
+
+def worker() -> int:
+    """Replay worker: (config, requests, dt) on stdin, exchanges on stdout."""
+    import logging
+
+    from caux_simulator.bus.mount import NexStarMount  # type: ignore
+
+    logging.basicConfig(level=logging.ERROR)
+    config, requests, dt = pickle.load(sys.stdin.buffer)
+    (result,) = replay([NexStarMount(config)], requests, dt)
+    pickle.dump([tuple(ex) for ex in result], sys.stdout.buffer)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(worker())
@@ -0,0 +1,386 @@
+"""
+AUX Trace Analyzer
+
+Decodes the AUX traffic of a session into columnar NumPy arrays and
+reports what the clients did: a command histogram, inter-arrival and
+response-time distributions and per-client polling rates.
+
+Inputs are either text logs with the PROTOCOL logging category enabled
+(`[PROTO] RX: <hex>` / `[PROTO] TX Total: <hex>` lines, timestamps taken
+from the `asctime` prefix) or binary captures written with `caux-sim
+--capture`. Packet framing and checksums are computed on the whole byte
+stream at once, so million-packet captures take seconds.
+
+Requires NumPy (`pip install .[analysis]`).
+"""
+
+import binascii
+import json
+import sys
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from ..bus.capture import PROTO_LINE, RX, TX, is_capture, read_capture
+from ..bus.protocol import cmd_names, trg_names
+
+# Packet columns produced by `decode`
+COLUMNS = ("t", "direction", "conn", "src", "dst", "cmd", "length", "chk_ok")
+
+# Inter-arrival/response-time histogram bins [s]: decades from 0.1 ms to 100 s
+BINS = 10.0 ** np.arange(-4, 3)
+
+
+class Chunks(NamedTuple):
+    """Byte chunks as read from (RX) or written to (TX) a connection."""
+
+    t: np.ndarray
+    direction: np.ndarray
+    conn: np.ndarray
+    data: np.ndarray  # All chunks concatenated (uint8)
+    start: np.ndarray  # Offset of every chunk in `data`
+
+
+def _chunks(
+    t: Any, direction: Sequence[int], conn: Sequence[int], data: List[bytes]
+) -> Chunks:
+    sizes = np.fromiter(map(len, data), np.int64, len(data))
+    return Chunks(
+        np.asarray(t, dtype=np.float64),
+        np.asarray(direction, dtype=np.uint8),
+        np.asarray(conn, dtype=np.uint16),
+        np.frombuffer(b"".join(data), dtype=np.uint8),
+        np.cumsum(sizes) - sizes,
+    )
+
+
+def read_text_log(path: str) -> Chunks:
+    """Chunks from the `[PROTO]` lines of a text log."""
+    with open(path, "rb") as f:
+        matches = PROTO_LINE.findall(f.read())
+    stamps = np.array([m[0] or b"NaT" for m in matches], dtype="S23")
+    iso = np.char.replace(np.char.replace(stamps, b",", b"."), b" ", b"T")
+    when = iso.astype("U23").astype("datetime64[ms]")
+    # Naive local time; only differences matter
+    t = np.where(np.isnat(when), np.nan, when.astype(np.int64) / 1000.0)
+    return _chunks(
+        t,
+        [RX if m[1] == b"RX" else TX for m in matches],
+        [0] * len(matches),
+        [binascii.unhexlify(m[2]) for m in matches],
+    )
+
+
+def read_capture_file(path: str) -> Chunks:
+    """Chunks from a binary capture."""
+    records = list(read_capture(path))
+    return _chunks(
+        [r.time for r in records],
+        [r.direction for r in records],
+        [r.conn for r in records],
+        [r.data for r in records],
+    )
+
+
+def decode(chunks: Chunks) -> Dict[str, np.ndarray]:
+    """
+    Frames AUX packets in all chunks at once.
+
+    Every `;` is a candidate packet start. A candidate is plausible when its
+    length fits in its chunk and either the checksum matches or the next
+    byte after it is another `;` or the end of the chunk (so packets with a
+    bad checksum are still counted). Plausible candidates lying inside an
+    earlier accepted packet (a `;` byte in a payload) are dropped.
+    Returns the packet columns (`COLUMNS`); `length` is the payload length.
+    """
+    buf = chunks.data
+    n = len(buf)
+    end = np.append(chunks.start[1:], n)
+
+    cand = np.flatnonzero(buf == 0x3B)
+    ci = np.searchsorted(chunks.start, cand, side="right") - 1
+    cend = end[ci]
+    has_len = cand + 1 < cend
+    length = np.zeros(len(cand), dtype=np.int64)
+    length[has_len] = buf[cand[has_len] + 1]
+    pend = cand + length + 3
+    fits = has_len & (length >= 3) & (pend <= cend)
+    cand, ci, cend, length, pend = (
+        cand[fits],
+        ci[fits],
+        cend[fits],
+        length[fits],
+        pend[fits],
+    )
+
+    csum = np.concatenate(([0], np.cumsum(buf, dtype=np.int64)))
+    total = csum[cand + length + 2] - csum[cand + 1]
+    chk_ok = (-total & 0xFF) == buf[cand + length + 2]
+    follows = pend == cend
+    inner = pend < n
+    follows[inner] |= buf[pend[inner]] == 0x3B
+    plausible = chk_ok | follows
+
+    # Greedy left-to-right selection of non-overlapping packets, iterated
+    # to its fixed point (one pass per level of nesting)
+    keep = plausible
+    while True:
+        ends = np.maximum.accumulate(np.where(keep, pend, 0))
+        covered = np.concatenate(([0], ends[:-1])) > cand
+        new = plausible & ~covered
+        if np.array_equal(new, keep):
+            break
+        keep = new
+
+    p = cand[keep]
+    ci = ci[keep]
+    return {
+        "t": chunks.t[ci],
+        "direction": chunks.direction[ci],
+        "conn": chunks.conn[ci],
+        "src": buf[p + 2],
+        "dst": buf[p + 3],
+        "cmd": buf[p + 4],
+        "length": (length[keep] - 3).astype(np.uint8),
+        "chk_ok": chk_ok[keep],
+    }
+
+
+def load(path: str) -> Dict[str, np.ndarray]:
+    """Decoded packets of a capture or text log."""
+    chunks = read_capture_file(path) if is_capture(path) else read_text_log(path)
+    return decode(chunks)
+
+
+# --- Reports ---
+
+
+def _name(table: Dict[int, str], value: int) -> str:
+    return table.get(value, f"0x{value:02x}")
+
+
+def client_name(conn: int, src: int) -> str:
+    return f"{conn}:{_name(trg_names, src)}"
+
+
+def requests(packets: Dict[str, np.ndarray]) -> np.ndarray:
+    """Mask of the client requests (received packets with a valid checksum)."""
+    return (packets["direction"] == RX) & packets["chk_ok"]
+
+
+def responses(packets: Dict[str, np.ndarray]) -> np.ndarray:
+    """Mask of the device responses (sent packets that are not echoes)."""
+    clients = np.unique(packets["src"][requests(packets)])
+    return (packets["direction"] == TX) & ~np.isin(packets["src"], clients)
+
+
+def distribution(values: np.ndarray) -> Dict[str, Any]:
+    """Summary statistics and a log-binned histogram of durations [s]."""
+    values = values[np.isfinite(values)]
+    if not len(values):
+        return {}
+    p50, p90, p99 = np.percentile(values, (50, 90, 99))
+    counts, _ = np.histogram(np.clip(values, BINS[0], BINS[-1]), BINS)
+    return {
+        "count": int(len(values)),
+        "mean": float(values.mean()),
+        "p50": float(p50),
+        "p90": float(p90),
+        "p99": float(p99),
+        "max": float(values.max()),
+        "histogram": {"edges": BINS.tolist(), "counts": counts.tolist()},
+    }
+
+
+def _client_keys(packets: Dict[str, np.ndarray], mask: np.ndarray) -> np.ndarray:
+    return packets["conn"][mask].astype(np.int64) << 8 | packets["src"][mask]
+
+
+def command_histogram(packets: Dict[str, np.ndarray]) -> List[Dict[str, Any]]:
+    """Request counts per (device, command), most frequent first."""
+    mask = requests(packets)
+    keys = packets["dst"][mask].astype(np.int64) << 8 | packets["cmd"][mask]
+    values, counts = np.unique(keys, return_counts=True)
+    order = np.argsort(-counts, kind="stable")
+    return [
+        {
+            "device": _name(trg_names, int(values[i]) >> 8),
+            "cmd": _name(cmd_names, int(values[i]) & 0xFF),
+            "count": int(counts[i]),
+        }
+        for i in order
+    ]
+
+
+def inter_arrival(packets: Dict[str, np.ndarray]) -> Dict[str, Any]:
+    """Gaps between consecutive requests of the same client."""
+    mask = requests(packets)
+    keys = _client_keys(packets, mask)
+    t = packets["t"][mask]
+    order = np.lexsort((t, keys))
+    keys, t = keys[order], t[order]
+    same = keys[1:] == keys[:-1]
+    gaps = np.diff(t)
+    per_client = {}
+    for key in np.unique(keys):
+        sel = same & (keys[1:] == key)
+        per_client[client_name(int(key) >> 8, int(key) & 0xFF)] = distribution(
+            gaps[sel]
+        )
+    return {"all": distribution(gaps[same]), "clients": per_client}
+
+
+def response_times(packets: Dict[str, np.ndarray]) -> np.ndarray:
+    """
+    Time from each request to its response (NaN for unanswered requests).
+
+    A response answers the earliest request on the same connection with
+    swapped source/destination and the same command, provided no repeated
+    request came in between.
+    """
+    req = requests(packets)
+    resp = responses(packets)
+    conn = packets["conn"].astype(np.int64) << 24
+    src = packets["src"].astype(np.int64)
+    dst = packets["dst"].astype(np.int64)
+    cmd = packets["cmd"].astype(np.int64)
+    keys = np.concatenate(
+        (
+            (conn | src << 16 | dst << 8 | cmd)[req],
+            (conn | dst << 16 | src << 8 | cmd)[resp],
+        )
+    )
+    t = np.concatenate((packets["t"][req], packets["t"][resp]))
+    is_resp = np.concatenate(
+        (np.zeros(req.sum(), dtype=bool), np.ones(resp.sum(), dtype=bool))
+    )
+    order = np.lexsort((is_resp, t, keys))
+    keys, t, is_resp = keys[order], t[order], is_resp[order]
+
+    # Position of the next response / next request at or after each row
+    big = len(keys)
+    pos = np.arange(big)
+    next_resp = np.minimum.accumulate(np.where(is_resp, pos, big)[::-1])[::-1]
+    later_req = np.append(np.where(~is_resp, pos, big)[1:], big)
+    next_req = np.minimum.accumulate(later_req[::-1])[::-1]
+
+    rows = np.flatnonzero(~is_resp)
+    j = next_resp[rows]
+    found = j < big
+    found[found] &= keys[j[found]] == keys[rows[found]]
+    found &= j < next_req[rows]
+    latency = np.full(len(rows), np.nan)
+    latency[found] = t[j[found]] - t[rows[found]]
+    return latency
+
+
+def polling_rates(packets: Dict[str, np.ndarray]) -> Dict[str, Any]:
+    """Requests per second of every client, overall and per (device, command)."""
+    mask = requests(packets)
+    clients = _client_keys(packets, mask)
+    t = packets["t"][mask]
+    commands = packets["dst"][mask].astype(np.int64) << 8 | packets["cmd"][mask]
+    report = {}
+    for key in np.unique(clients):
+        sel = clients == key
+        ts = t[sel]
+        span = float(np.nanmax(ts) - np.nanmin(ts)) if len(ts) > 1 else 0.0
+        values, counts = np.unique(commands[sel], return_counts=True)
+        order = np.argsort(-counts, kind="stable")
+        report[client_name(int(key) >> 8, int(key) & 0xFF)] = {
+            "requests": int(sel.sum()),
+            "span": span,
+            "rate": float(sel.sum() / span) if span > 0 else None,
+            "commands": {
+                f"{_name(trg_names, int(values[i]) >> 8)} "
+                f"{_name(cmd_names, int(values[i]) & 0xFF)}": (
+                    float(counts[i] / span) if span > 0 else None
+                )
+                for i in order
+            },
+        }
+    return report
+
+
+def summarize(packets: Dict[str, np.ndarray]) -> Dict[str, Any]:
+    """All reports of one trace as a JSON-ready dict."""
+    return {
+        "packets": int(len(packets["t"])),
+        "requests": int(requests(packets).sum()),
+        "responses": int(responses(packets).sum()),
+        "checksum_errors": int((~packets["chk_ok"]).sum()),
+        "commands": command_histogram(packets),
+        "inter_arrival": inter_arrival(packets),
+        "response_time": distribution(response_times(packets)),
+        "polling": polling_rates(packets),
+    }
+
+
+def _ms(dist: Dict[str, Any]) -> str:
+    if not dist:
+        return "-"
+    return f"n={dist['count']}  " + "  ".join(
+        f"{k}={dist[k] * 1000:.1f}ms" for k in ("mean", "p50", "p90", "p99", "max")
+    )
+
+
+def format_summary(summary: Dict[str, Any], top: int = 20) -> str:
+    lines = [
+        f"Packets: {summary['packets']}  requests: {summary['requests']}  "
+        f"responses: {summary['responses']}  "
+        f"checksum errors: {summary['checksum_errors']}",
+        "Commands:",
+    ]
+    for entry in summary["commands"][:top]:
+        lines.append(f"  {entry['count']:>9}  {entry['device']:<6} {entry['cmd']}")
+    lines.append(f"Response time: {_ms(summary['response_time'])}")
+    lines.append(f"Inter-arrival: {_ms(summary['inter_arrival']['all'])}")
+    for name, dist in summary["inter_arrival"]["clients"].items():
+        lines.append(f"  {name:<12} {_ms(dist)}")
+    lines.append("Polling rates:")
+    for name, client in summary["polling"].items():
+        rate = client["rate"]
+        lines.append(
+            f"  {name:<12} {client['requests']} requests in {client['span']:.1f} s"
+            + (f" ({rate:.1f}/s)" if rate else "")
+        )
+        for cmd, cmd_rate in list(client["commands"].items())[:top]:
+            if cmd_rate:
+                lines.append(f"      {cmd_rate:8.2f}/s  {cmd}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Command line entry point (`caux-sim-analyze`)."""
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(
+        description="Analyze AUX traffic from a session log or capture"
+    )
+    parser.add_argument("file", help="Text log ([PROTO] lines) or --capture file")
+    parser.add_argument("--json", action="store_true", help="Print JSON")
+    parser.add_argument("--top", type=int, default=20, help="Rows per table")
+    parser.add_argument("--npz", help="Also save the packet columns to NPZ")
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    try:
+        packets = load(args.file)
+    except (OSError, ValueError) as e:
+        print(f"Cannot read {args.file}: {e}", file=sys.stderr)
+        return 1
+    summary = summarize(packets)
+    wall = time.perf_counter() - t0
+    if args.npz:
+        np.savez_compressed(args.npz, **packets)
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print(format_summary(summary, args.top))
+        print(f"  analyzed in {wall:.2f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
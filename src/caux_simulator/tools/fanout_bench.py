@@ -0,0 +1,152 @@
+"""
+Fan-out Benchmark
+
+Throughput of the AUX bus fan-out (`--fanout`) as the number of clients
+grows: one client polls the mount as fast as it is answered while the
+others only listen, as a second planetarium app or a bus sniffer would.
+Each listener hashes the stream it receives; at the end all streams must be
+identical (same chunks in the same order) and as long as the published
+traffic.
+"""
+
+import asyncio
+import hashlib
+import sys
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+from ..bus.client import AuxClient
+from .soak import POLL_CYCLE, percentile
+
+try:
+    from ..nse_simulator import SimulatorServer, load_config
+except ImportError:
+    from nse_simulator import SimulatorServer, load_config  # type: ignore
+
+CLIENTS = (1, 2, 4, 8, 16, 32)
+
+
+class Listener:
+    """Reads everything the port sends and hashes it."""
+
+    def __init__(self) -> None:
+        self.digest = hashlib.sha1()
+        self.bytes = 0
+        self.task: Optional[asyncio.Task] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+
+    async def connect(self, port: int) -> "Listener":
+        reader, self.writer = await asyncio.open_connection("127.0.0.1", port)
+        self.task = asyncio.create_task(self._read(reader))
+        return self
+
+    async def _read(self, reader: asyncio.StreamReader) -> None:
+        while data := await reader.read(65536):
+            self.digest.update(data)
+            self.bytes += len(data)
+
+    async def close(self) -> None:
+        if self.task:
+            self.task.cancel()
+            await asyncio.gather(self.task, return_exceptions=True)
+        if self.writer:
+            self.writer.close()
+
+
+async def measure(
+    clients: int, duration: float, config: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """One poller and `clients - 1` listeners on a fan-out server."""
+    config = config if config is not None else load_config()
+    config.setdefault("simulator", {})["max_connections"] = clients + 1
+    server = SimulatorServer(config, host="127.0.0.1", port=0, fanout=True)
+    async with server:
+        listeners = [
+            await Listener().connect(server.aux_port) for _ in range(clients - 1)
+        ]
+        while len(server.sessions) < clients - 1:
+            await asyncio.sleep(0.001)
+        client = await AuxClient(timeout=2.0).connect("127.0.0.1", server.aux_port)
+        latencies: List[float] = []
+        requests = 0
+        t0 = time.perf_counter()
+        deadline = t0 + duration
+        try:
+            while time.perf_counter() < deadline:
+                replies = await client.pipeline(POLL_CYCLE)
+                latencies.extend(r.latency for r in replies if r.latency)
+                requests += len(replies)
+            elapsed = time.perf_counter() - t0
+            fanout = server.fanout
+            assert fanout is not None
+            # Let the listeners catch up with the published traffic
+            while any(lst.bytes < fanout.bytes for lst in listeners):
+                if time.perf_counter() > deadline + 5.0:
+                    break
+                await asyncio.sleep(0.001)
+        finally:
+            await client.close()
+            for lst in listeners:
+                await lst.close()
+    lats = [x * 1e3 for x in latencies]
+    digests = {lst.digest.hexdigest() for lst in listeners}
+    return {
+        "clients": clients,
+        "requests": requests,
+        "rate": requests / elapsed,
+        "chunks_per_s": fanout.chunks / elapsed,
+        "delivered_mb_s": fanout.bytes * clients / elapsed / 1e6,
+        "lat_p50_ms": percentile(lats, 0.5),
+        "lat_p99_ms": percentile(lats, 0.99),
+        "identical": len(digests) <= 1
+        and all(lst.bytes == fanout.bytes for lst in listeners),
+        "overflows": fanout.overflows,
+    }
+
+
+def format_results(results: Sequence[Dict[str, Any]]) -> str:
+    lines = [
+        f"{'clients':>7}{'req/s':>10}{'chunks/s':>10}{'MB/s out':>10}"
+        f"{'p50 ms':>9}{'p99 ms':>9}  streams"
+    ]
+    for r in results:
+        lines.append(
+            f"{r['clients']:>7}{r['rate']:>10,.0f}{r['chunks_per_s']:>10,.0f}"
+            f"{r['delivered_mb_s']:>10.2f}{r['lat_p50_ms']:>9.2f}"
+            f"{r['lat_p99_ms']:>9.2f}  "
+            + ("identical" if r["identical"] else "DIFFER")
+            + (f" ({r['overflows']} overflows)" if r["overflows"] else "")
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Command line entry point (`caux-sim-fanoutbench`)."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="AUX bus fan-out throughput versus the number of clients"
+    )
+    parser.add_argument("-c", "--config", help="Custom configuration file path")
+    parser.add_argument(
+        "--duration", type=float, default=3.0, help="Seconds per client count"
+    )
+    parser.add_argument(
+        "--clients",
+        type=int,
+        nargs="+",
+        default=list(CLIENTS),
+        help="Client counts to measure (default: %(default)s)",
+    )
+    args = parser.parse_args(argv)
+
+    results = [
+        asyncio.run(measure(n, args.duration, load_config(args.config)))
+        for n in args.clients
+    ]
+    print(format_results(results))
+    return 0 if all(r["identical"] for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
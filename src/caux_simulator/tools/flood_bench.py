@@ -0,0 +1,213 @@
+"""
+Flood Benchmark
+
+Measures the steady-state AUX throughput and latency of well-behaved
+clients, first alone and then while one more client floods the port with
+garbage (random bytes with `;` preambles, so every chunk exercises the
+resynchronization path). The flooder's protocol errors are charged to its
+error budget, and the bus log messages emitted during each phase are
+counted to show that reporting stays bounded.
+"""
+
+import asyncio
+import logging
+import random
+import sys
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+from ..bus.client import AuxClient
+from .soak import POLL_CYCLE, percentile
+
+try:
+    from ..nse_simulator import SimulatorServer, load_config
+except ImportError:
+    from nse_simulator import SimulatorServer, load_config  # type: ignore
+
+# Loggers of the per-packet error messages
+BUS_LOGGERS = ("caux_simulator.bus.aux_bus", "caux_simulator.bus.transport")
+
+
+class _CountingHandler(logging.Handler):
+    def __init__(self) -> None:
+        super().__init__(logging.WARNING)
+        self.count = 0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.count += 1
+
+
+def garbage(rng: random.Random, size: int) -> bytes:
+    """Random bytes with a `;` about every 8 bytes (bogus packet starts)."""
+    data = bytearray(rng.randbytes(size))
+    for i in range(0, size, 8):
+        data[i + rng.randrange(min(8, size - i))] = 0x3B
+    return bytes(data)
+
+
+class FloodBench:
+    """Good polling clients against a server, with and without a flooder."""
+
+    def __init__(self, server: SimulatorServer, clients: int = 4, chunk: int = 4096):
+        self.server = server
+        self.clients = clients
+        self.chunk = chunk
+        self._latencies: List[float] = []
+        self._requests = 0
+        self._timeouts = 0
+        self._flood_bytes = 0
+        self._flood_closed = False
+        self._running = False
+
+    async def good_client(self, src_id: int) -> None:
+        """Closed-loop polling: the next cycle is sent when the last is answered."""
+        client = await AuxClient(src_id=src_id, timeout=2.0).connect(
+            "127.0.0.1", self.server.aux_port
+        )
+        try:
+            while self._running:
+                try:
+                    replies = await client.pipeline(POLL_CYCLE)
+                    self._latencies.extend(r.latency for r in replies)
+                    self._requests += len(replies)
+                except asyncio.TimeoutError:
+                    self._timeouts += 1
+        finally:
+            await client.close()
+
+    async def flooder(self, seed: int = 0) -> None:
+        """Writes garbage as fast as the server accepts it; discards replies."""
+        rng = random.Random(seed)
+        reader, writer = await asyncio.open_connection(
+            "127.0.0.1", self.server.aux_port
+        )
+        chunks = [garbage(rng, self.chunk) for _ in range(16)]
+
+        async def discard() -> None:
+            while await reader.read(65536):
+                pass
+
+        reading = asyncio.create_task(discard())
+        try:
+            i = 0
+            while not writer.is_closing():
+                writer.write(chunks[i % len(chunks)])
+                await writer.drain()
+                self._flood_bytes += self.chunk
+                i += 1
+            self._flood_closed = True
+        except (ConnectionError, OSError):
+            self._flood_closed = True
+        finally:
+            reading.cancel()
+            writer.close()
+            await asyncio.gather(reading, return_exceptions=True)
+
+    async def phase(self, duration: float, flood: bool) -> Dict[str, Any]:
+        """Runs the clients (and the flooder) for `duration` seconds."""
+        self._latencies, self._requests, self._timeouts = [], 0, 0
+        self._flood_bytes, self._flood_closed = 0, False
+        bus = self.server.mount.bus
+        errors = bus.errors
+        counter = _CountingHandler()
+        for name in BUS_LOGGERS:
+            logging.getLogger(name).addHandler(counter)
+        self._running = True
+        tasks = [
+            asyncio.create_task(self.good_client(0x20 + i)) for i in range(self.clients)
+        ]
+        flooding = asyncio.create_task(self.flooder()) if flood else None
+        t0 = time.perf_counter()
+        try:
+            await asyncio.sleep(duration)
+            elapsed = time.perf_counter() - t0
+            requests = self._requests
+        finally:
+            # Clients finish their cycle (cancelling one mid-pipeline would
+            # leave its replies unretrieved)
+            self._running = False
+            if flooding:
+                flooding.cancel()  # May be blocked by TCP flow control
+                tasks.append(flooding)
+            await asyncio.gather(*tasks, return_exceptions=True)
+            for name in BUS_LOGGERS:
+                logging.getLogger(name).removeHandler(counter)
+        lats = [x * 1e3 for x in self._latencies if x is not None]
+        return {
+            "flood": flood,
+            "seconds": elapsed,
+            "requests": requests,
+            "rate": requests / elapsed,
+            "timeouts": self._timeouts,
+            "lat_p50_ms": percentile(lats, 0.5),
+            "lat_p99_ms": percentile(lats, 0.99),
+            "flood_kb": self._flood_bytes / 1024,
+            "flooder_disconnected": self._flood_closed,
+            "bus_errors": bus.errors - errors,
+            "log_messages": counter.count,
+        }
+
+    async def run(self, duration: float) -> List[Dict[str, Any]]:
+        """Baseline and flood phases of `duration` seconds each."""
+        started_here = not self.server.running
+        if started_here:
+            await self.server.start()
+        try:
+            return [
+                await self.phase(duration, flood=False),
+                await self.phase(duration, flood=True),
+            ]
+        finally:
+            if started_here:
+                await self.server.stop()
+
+
+def format_results(results: Sequence[Dict[str, Any]]) -> str:
+    lines = [
+        f"{'phase':<9}{'req/s':>10}{'p50 ms':>9}{'p99 ms':>9}{'timeouts':>10}"
+        f"{'flood kB':>11}{'errors':>9}{'logged':>8}"
+    ]
+    for r in results:
+        lines.append(
+            f"{'flood' if r['flood'] else 'baseline':<9}{r['rate']:>10,.0f}"
+            f"{r['lat_p50_ms']:>9.2f}{r['lat_p99_ms']:>9.2f}{r['timeouts']:>10}"
+            f"{r['flood_kb']:>11,.0f}{r['bus_errors']:>9}{r['log_messages']:>8}"
+        )
+    if len(results) == 2 and results[0]["rate"] > 0:
+        ratio = results[1]["rate"] / results[0]["rate"]
+        lines.append(f"good-client throughput under flood: {ratio:.0%} of baseline")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Command line entry point (`caux-sim-floodbench`)."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Good-client AUX throughput while one client floods garbage"
+    )
+    parser.add_argument("-c", "--config", help="Custom configuration file path")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds per phase")
+    parser.add_argument("--clients", type=int, default=4, help="Good clients")
+    parser.add_argument(
+        "--policy",
+        choices=("drop", "disconnect", "none"),
+        help="Error budget policy (default: from the configuration)",
+    )
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    config = load_config(args.config)
+    if args.policy == "none":
+        config["simulator"]["error_budget"] = 0
+    elif args.policy:
+        config["simulator"]["error_policy"] = args.policy
+    server = SimulatorServer(config, host="127.0.0.1", port=0)
+    bench = FloodBench(server, clients=args.clients)
+    results = asyncio.run(bench.run(args.duration))
+    print(format_results(results))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,352 @@
+"""
+AUX Fuzzer
+
+Grammar-based, in-process fuzzing of `NexStarMount.handle_msg`. Inputs are
+AUX packets for every registered (device, command) handler and for unknown
+targets, with random payloads, and mutations of them: bad checksums, wrong
+length bytes, truncation, concatenation and random bytes around `;`
+preambles. The bus re-raises handler exceptions while fuzzing
+(`AuxBus.raise_errors`), and after every input the invariants are checked:
+
+    - no exception from the bus, a handler or the physics tick
+    - every output packet is well formed (length and checksum)
+    - the output size is bounded by the input
+    - motor encoder, pointing and target positions stay in [0, 2**24)
+
+The mount is reset every `reset_every` inputs, so a failure reproduces from
+the inputs since the last reset; these are minimized (delta debugging over
+the inputs, then over the bytes of each input) before being reported.
+"""
+
+import logging
+import random
+import sys
+import time
+import traceback
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from ..bus.mount import NexStarMount
+from ..bus.utils import encode_packet, make_checksum, split_cmds
+from ..devices.motor import STEPS_PER_REV
+
+# Client IDs seen on real buses (main board, hand controller, apps)
+SOURCES = (0x04, 0x0D, 0x20, 0x22)
+# Longest response payload a handler may return
+MAX_RESPONSE = 32
+# Payload byte values that tend to hit edge cases
+SPECIAL_BYTES = (0x00, 0x01, 0x3B, 0x7F, 0x80, 0xFE, 0xFF)
+
+Check = Tuple[str, str]  # (signature, detail)
+
+
+class Failure(NamedTuple):
+    signature: str
+    detail: str
+    inputs: List[bytes]  # Minimized reproducer (from a reset mount)
+    count: int
+
+
+class FuzzStats(NamedTuple):
+    inputs: int
+    seconds: float
+    failures: List[Failure]
+
+    @property
+    def rate(self) -> float:
+        return self.inputs / self.seconds if self.seconds > 0 else 0.0
+
+
+class Fuzzer:
+    """Generates inputs, runs them against a mount and checks invariants."""
+
+    def __init__(
+        self,
+        config: Optional[Dict[str, Any]] = None,
+        seed: int = 0,
+        tick_every: int = 64,
+        reset_every: int = 256,
+        dt: float = 0.1,
+    ):
+        self.config = config or {"simulator": {"imperfections": {}}}
+        self.rng = random.Random(seed)
+        self.tick_every = tick_every
+        self.reset_every = reset_every
+        self.dt = dt
+        self.mount = self._make_mount()
+        self.handlers = [
+            (dev_id, cmd)
+            for dev_id, device in sorted(self.mount.bus.devices.items())
+            for cmd in sorted(device.handlers)
+        ]
+        self._mutators: List[Callable[[], bytes]] = [
+            self._valid,
+            self._valid,
+            self._valid,
+            self._valid,
+            self._unknown_target,
+            self._bad_checksum,
+            self._bad_length,
+            self._concatenated,
+            self._garbage,
+        ]
+
+    def _make_mount(self) -> NexStarMount:
+        mount = NexStarMount(self.config)
+        mount.bus.raise_errors = True
+        return mount
+
+    # --- Input generation ---
+
+    def _payload(self) -> bytes:
+        rng = self.rng
+        n = rng.choice((0, 1, 2, 3, 3, 4, rng.randrange(9)))
+        if rng.random() < 0.3:
+            return bytes(rng.choice(SPECIAL_BYTES) for _ in range(n))
+        return rng.randbytes(n)
+
+    def _valid(self) -> bytes:
+        dst, cmd = self.rng.choice(self.handlers)
+        return encode_packet(self.rng.choice(SOURCES), dst, cmd, self._payload())
+
+    def _unknown_target(self) -> bytes:
+        rng = self.rng
+        return encode_packet(
+            rng.randrange(256), rng.randrange(256), rng.randrange(256), self._payload()
+        )
+
+    def _bad_checksum(self) -> bytes:
+        pkt = bytearray(self._valid())
+        pkt[-1] ^= 1 << self.rng.randrange(8)
+        return bytes(pkt)
+
+    def _bad_length(self) -> bytes:
+        pkt = bytearray(self._valid())
+        rng = self.rng
+        pkt[1] = (
+            rng.randrange(256)
+            if rng.random() < 0.5
+            else (pkt[1] + rng.choice((-3, -2, -1, 1, 2, 3))) & 0xFF
+        )
+        return bytes(pkt)
+
+    def _concatenated(self) -> bytes:
+        rng = self.rng
+        data = b"".join(self.generate() for _ in range(rng.randrange(2, 5)))
+        if rng.random() < 0.3:
+            data = data[: rng.randrange(1, len(data) + 1)]
+        return data
+
+    def _garbage(self) -> bytes:
+        rng = self.rng
+        data = bytearray(rng.randbytes(rng.randrange(1, 33)))
+        for _ in range(rng.randrange(4)):
+            data[rng.randrange(len(data))] = 0x3B
+        return bytes(data)
+
+    def generate(self) -> bytes:
+        return self.rng.choice(self._mutators)()
+
+    # --- Execution ---
+
+    def check(self, mount: NexStarMount, data: bytes) -> Optional[Check]:
+        """Runs one input; returns (signature, detail) of a violation."""
+        try:
+            out = mount.handle_msg(data)
+        except Exception as e:
+            return _exception_check("handler", e)
+        if len(out) > len(data) + data.count(b";") * (MAX_RESPONSE + 5):
+            return "output-size", f"{len(out)} bytes out for {len(data)} in"
+        if out:
+            if out[0] != 0x3B:
+                return "output-framing", out.hex()
+            packets = split_cmds(out)
+            if sum(len(p) + 1 for p in packets) != len(out):
+                return "output-framing", out.hex()
+            for p in packets:
+                if len(p) < 5 or p[0] != len(p) - 2 or make_checksum(p[:-1]) != p[-1]:
+                    return "output-packet", p.hex()
+        return self._check_state(mount)
+
+    def _check_state(self, mount: NexStarMount) -> Optional[Check]:
+        for motor in (mount.azm_motor, mount.alt_motor):
+            for attr in ("steps", "pointing_steps", "trg_steps"):
+                value = getattr(motor, attr)
+                if not 0 <= value < STEPS_PER_REV:
+                    return (
+                        f"position-range:{motor.axis_name}.{attr}",
+                        f"{attr} = {value}",
+                    )
+        return None
+
+    def _tick(self, mount: NexStarMount) -> Optional[Check]:
+        try:
+            mount.tick(self.dt)
+        except Exception as e:
+            return _exception_check("tick", e)
+        return self._check_state(mount)
+
+    def execute(self, mount: NexStarMount, inputs: Sequence[bytes]) -> Optional[Check]:
+        """Runs a session of inputs from a reset mount (ticking as in `run`)."""
+        mount.reset()
+        for i, data in enumerate(inputs):
+            result = self.check(mount, data)
+            if result is None and (i + 1) % self.tick_every == 0:
+                result = self._tick(mount)
+            if result is not None:
+                return result
+        return None
+
+    def run(
+        self,
+        iterations: Optional[int] = None,
+        seconds: Optional[float] = None,
+        minimize: bool = True,
+    ) -> FuzzStats:
+        """Fuzzes for `iterations` inputs or `seconds` (whichever comes first)."""
+        mount = self.mount
+        failures: Dict[str, Failure] = {}
+        session: List[bytes] = []
+        start = time.perf_counter()
+        deadline = start + seconds if seconds is not None else None
+        count = 0
+        previous = logging.root.manager.disable
+        logging.disable(logging.CRITICAL)  # Checksum warnings are expected
+        try:
+            mount.reset()
+            while iterations is None or count < iterations:
+                if deadline is not None and count % 1024 == 0:
+                    if time.perf_counter() >= deadline:
+                        break
+                data = self.generate()
+                session.append(data)
+                count += 1
+                result = self.check(mount, data)
+                if result is None and len(session) % self.tick_every == 0:
+                    result = self._tick(mount)
+                if result is not None:
+                    self._record(failures, result, session, minimize)
+                    session = []
+                    mount.reset()
+                elif len(session) >= self.reset_every:
+                    session = []
+                    mount.reset()
+        finally:
+            logging.disable(previous)
+        return FuzzStats(count, time.perf_counter() - start, list(failures.values()))
+
+    def _record(
+        self,
+        failures: Dict[str, Failure],
+        result: Check,
+        session: List[bytes],
+        minimize: bool,
+    ) -> None:
+        signature, detail = result
+        known = failures.get(signature)
+        if known is not None:
+            failures[signature] = known._replace(count=known.count + 1)
+            return
+        inputs = list(session)
+        if minimize:
+            inputs = self.minimize(inputs, signature)
+        failures[signature] = Failure(signature, detail, inputs, 1)
+
+    # --- Minimization ---
+
+    def minimize(
+        self, inputs: List[bytes], signature: str, budget: int = 2000
+    ) -> List[bytes]:
+        """Smallest session (and inputs) found that still fails with `signature`."""
+        mount = self._make_mount()
+        runs = [0]
+
+        def fails(candidate: List[bytes]) -> bool:
+            if runs[0] >= budget:
+                return False
+            runs[0] += 1
+            result = self.execute(mount, candidate)
+            return result is not None and result[0] == signature
+
+        if not fails(inputs):
+            return inputs  # Depends on state before the session
+        inputs = _ddmin(inputs, fails)
+        for i in range(len(inputs)):
+
+            def fails_with(data: List[int], i: int = i) -> bool:
+                return fails(inputs[:i] + [bytes(data)] + inputs[i + 1 :])
+
+            inputs[i] = bytes(_ddmin(list(inputs[i]), fails_with))
+        return inputs
+
+
+def _exception_check(where: str, e: Exception) -> Check:
+    frame = traceback.extract_tb(e.__traceback__)[-1]
+    location = f"{frame.filename.rsplit('/', 1)[-1]}:{frame.lineno}"
+    detail = "".join(traceback.format_exception(type(e), e, e.__traceback__))
+    return f"{where}:{type(e).__name__}@{location}", detail
+
+
+def _ddmin(items: List[Any], fails: Callable[[List[Any]], bool]) -> List[Any]:
+    """Delta debugging: removes chunks of `items` while `fails` holds."""
+    n = 2
+    while len(items) >= 2:
+        size = len(items) // n
+        removed = False
+        for start in range(0, len(items), size):
+            candidate = items[:start] + items[start + size :]
+            if candidate and fails(candidate):
+                items = candidate
+                n = max(n - 1, 2)
+                removed = True
+                break
+        if not removed:
+            if n >= len(items):
+                break
+            n = min(n * 2, len(items))
+    return items
+
+
+def format_stats(stats: FuzzStats) -> str:
+    lines = [
+        f"{stats.inputs} inputs in {stats.seconds:.1f} s "
+        f"({stats.rate:,.0f}/s), {len(stats.failures)} distinct failures"
+    ]
+    for f in stats.failures:
+        lines.append(f"  {f.signature} (x{f.count})")
+        lines.append("    reproducer: " + " ".join(d.hex() for d in f.inputs))
+        lines.extend("    " + line for line in f.detail.rstrip().splitlines()[-4:])
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Command line entry point (`caux-sim-fuzz`)."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Fuzz the AUX bus in-process and report invariant violations"
+    )
+    parser.add_argument("--seconds", type=float, default=10.0, help="Run time")
+    parser.add_argument("--iterations", type=int, help="Stop after N inputs")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument("-c", "--config", help="Custom configuration file path")
+    parser.add_argument(
+        "--no-minimize", action="store_true", help="Report full sessions"
+    )
+    args = parser.parse_args(argv)
+
+    config = None
+    if args.config:
+        try:
+            from ..nse_simulator import load_config
+        except ImportError:
+            from nse_simulator import load_config  # type: ignore
+
+        config = load_config(args.config)
+    fuzzer = Fuzzer(config, seed=args.seed)
+    stats = fuzzer.run(args.iterations, args.seconds, not args.no_minimize)
+    print(format_stats(stats))
+    return 1 if stats.failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,319 @@
+"""
+GOTO Benchmark
+
+Commands GOTOs to a grid of targets across the sky and runs the motor
+physics in simulated time (much faster than real time). For every GOTO it
+records the time to slew-done, the final encoder and pointing errors and
+the anti-stall triggers, then summarizes the distributions. A summary can
+be saved as a baseline and later runs checked against it.
+"""
+
+import copy
+import csv
+import json
+import logging
+import statistics
+import sys
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from ..bus.mount import NexStarMount
+from ..bus.transport import LoopbackChannel
+from ..bus.utils import pack_int3_raw
+from ..devices.motor import STEPS_PER_REV
+
+ARCSEC_PER_STEP = 1296000.0 / STEPS_PER_REV
+
+# Metrics compared against the baseline (higher is worse for all of them)
+BASELINE_METRICS = ("t_slew", "enc_err", "pnt_err")
+
+
+def sky_grid(
+    n_azm: int = 36, n_alt: int = 28, alt_range: Tuple[float, float] = (5.0, 85.0)
+) -> List[Tuple[float, float]]:
+    """
+    Targets (azm, alt) in degrees, visited in a boustrophedon order so that
+    consecutive GOTOs mix short and long moves in both directions.
+    """
+    targets = []
+    for j in range(n_alt):
+        alt = alt_range[0] + (alt_range[1] - alt_range[0]) * j / max(1, n_alt - 1)
+        row = [(i * 360.0 / n_azm, alt) for i in range(n_azm)]
+        targets.extend(row if j % 2 == 0 else row[::-1])
+    return targets
+
+
+def wrap_steps(d: int) -> int:
+    """Signed step difference wrapped to [-STEPS_PER_REV/2, STEPS_PER_REV/2)."""
+    return (d + STEPS_PER_REV // 2) % STEPS_PER_REV - STEPS_PER_REV // 2
+
+
+class GotoBenchmark:
+    """
+    Drives a mount through GOTOs in simulated time via the AUX protocol.
+
+    Handover strategies:
+        "fast"       single GOTO_FAST to the target.
+        "fast-slow"  GOTO_FAST to a point `handover_deg` short of the target
+                     on the approach side, then GOTO_SLOW to the target,
+                     as the hand controller and drivers do.
+    """
+
+    def __init__(
+        self,
+        config: Dict[str, Any],
+        handover: str = "fast-slow",
+        handover_deg: float = 1.0,
+        approach: int = 0,
+        backlash_corr: int = 0,
+        dt: float = 0.1,
+        timeout: float = 300.0,
+    ):
+        if handover not in ("fast", "fast-slow"):
+            raise ValueError(f"Unknown handover strategy: {handover}")
+        self.mount = NexStarMount(config=copy.deepcopy(config))
+        self.channel = LoopbackChannel(self.mount)
+        self.handover = handover
+        self.handover_steps = int(handover_deg / 360.0 * STEPS_PER_REV)
+        self.approach = approach
+        self.dt = dt
+        self.timeout = timeout
+        self.motors = {0x10: self.mount.azm_motor, 0x11: self.mount.alt_motor}
+        for dev_id, motor in self.motors.items():
+            # Anti-stall timer follows simulated, not wall-clock, time
+            motor.clock = lambda: self.mount.sim_time
+            self.channel.exchange(dev_id, 0xFD, bytes([approach]))
+            self.channel.exchange(dev_id, 0x10, bytes([backlash_corr]))
+            self.channel.exchange(dev_id, 0x11, bytes([backlash_corr]))
+
+    def _slewing(self) -> bool:
+        return any(m.slewing for m in self.motors.values())
+
+    def _run_until_done(self, deadline: float) -> bool:
+        while self._slewing():
+            if self.mount.sim_time >= deadline:
+                return False
+            self.mount.tick(self.dt)
+        return True
+
+    def goto(self, azm_deg: float, alt_deg: float) -> Dict[str, Any]:
+        """Performs one GOTO and returns its record."""
+        targets = {
+            0x10: int(azm_deg / 360.0 * STEPS_PER_REV) % STEPS_PER_REV,
+            0x11: int(alt_deg / 360.0 * STEPS_PER_REV) % STEPS_PER_REV,
+        }
+        stalls = {k: m.anti_stall_count for k, m in self.motors.items()}
+        t0 = self.mount.sim_time
+        deadline = t0 + self.timeout
+        sign = -1 if self.approach else 1
+
+        if self.handover == "fast-slow":
+            for dev_id, trg in targets.items():
+                pre = trg - sign * self.handover_steps
+                if dev_id == 0x10:
+                    pre %= STEPS_PER_REV
+                else:
+                    pre = max(0, min(STEPS_PER_REV - 1, pre))
+                self.channel.exchange(dev_id, 0x02, pack_int3_raw(pre))
+            done = self._run_until_done(deadline)
+            if done:
+                for dev_id, trg in targets.items():
+                    self.channel.exchange(dev_id, 0x17, pack_int3_raw(trg))
+                done = self._run_until_done(deadline)
+        else:
+            for dev_id, trg in targets.items():
+                self.channel.exchange(dev_id, 0x02, pack_int3_raw(trg))
+            done = self._run_until_done(deadline)
+
+        rec: Dict[str, Any] = {
+            "azm": azm_deg,
+            "alt": alt_deg,
+            "t_slew": self.mount.sim_time - t0,
+            "timeout": int(not done),
+        }
+        for dev_id, motor in self.motors.items():
+            axis = motor.axis_name
+            enc = abs(wrap_steps(targets[dev_id] - motor.steps))
+            pnt = abs(wrap_steps(targets[dev_id] - motor.pointing_steps))
+            rec[f"{axis}_enc_err"] = enc * ARCSEC_PER_STEP
+            rec[f"{axis}_pnt_err"] = pnt * ARCSEC_PER_STEP
+            rec[f"{axis}_anti_stall"] = motor.anti_stall_count - stalls[dev_id]
+        rec["enc_err"] = max(rec["azm_enc_err"], rec["alt_enc_err"])
+        rec["pnt_err"] = max(rec["azm_pnt_err"], rec["alt_pnt_err"])
+        rec["anti_stall"] = rec["azm_anti_stall"] + rec["alt_anti_stall"]
+        return rec
+
+    def run(self, targets: Sequence[Tuple[float, float]]) -> List[Dict[str, Any]]:
+        return [self.goto(azm, alt) for azm, alt in targets]
+
+
+def distribution(values: Sequence[float]) -> Dict[str, float]:
+    """Summary statistics of one metric."""
+    vals = sorted(values)
+    if not vals:
+        return {}
+    if len(vals) > 1:
+        q = statistics.quantiles(vals, n=100, method="inclusive")
+        p50, p90, p99 = q[49], q[89], q[98]
+    else:
+        p50 = p90 = p99 = vals[0]
+    return {
+        "min": vals[0],
+        "mean": statistics.fmean(vals),
+        "p50": p50,
+        "p90": p90,
+        "p99": p99,
+        "max": vals[-1],
+    }
+
+
+def summarize(records: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+    """Distributions and counts over all GOTO records."""
+    summary: Dict[str, Any] = {"gotos": len(records)}
+    for key in BASELINE_METRICS + (
+        "azm_enc_err",
+        "alt_enc_err",
+        "azm_pnt_err",
+        "alt_pnt_err",
+    ):
+        summary[key] = distribution([r[key] for r in records])
+    summary["anti_stall"] = sum(r["anti_stall"] for r in records)
+    summary["anti_stall_gotos"] = sum(1 for r in records if r["anti_stall"])
+    summary["timeouts"] = sum(r["timeout"] for r in records)
+    return summary
+
+
+def compare(
+    summary: Dict[str, Any], baseline: Dict[str, Any], tolerance: float = 0.1
+) -> List[str]:
+    """
+    Checks a summary against a baseline.
+
+    Returns a list of regressions: p50/p99 of the baseline metrics or the
+    anti-stall/timeout counts exceeding the baseline by more than `tolerance`
+    (relative), with a small absolute allowance for values close to zero.
+    """
+    problems = []
+    for key in BASELINE_METRICS:
+        for stat in ("p50", "p99"):
+            old = baseline.get(key, {}).get(stat)
+            new = summary.get(key, {}).get(stat)
+            if old is None or new is None:
+                continue
+            if new > old * (1.0 + tolerance) + 1e-3:
+                problems.append(f"{key}.{stat}: {new:.3f} > baseline {old:.3f}")
+    for key in ("anti_stall", "timeouts"):
+        old, new = baseline.get(key, 0), summary.get(key, 0)
+        if new > old * (1.0 + tolerance):
+            problems.append(f"{key}: {new} > baseline {old}")
+    return problems
+
+
+def format_summary(summary: Dict[str, Any]) -> str:
+    lines = [f"GOTOs: {summary['gotos']}"]
+    units = {"t_slew": "s"}
+    for key, dist in summary.items():
+        if isinstance(dist, dict) and dist and key != "params":
+            unit = units.get(key, '"')
+            stats = "  ".join(f"{k}={v:.2f}" for k, v in dist.items())
+            lines.append(f"  {key:<12} [{unit}] {stats}")
+    lines.append(
+        f"  anti-stall triggers: {summary['anti_stall']} "
+        f"({summary['anti_stall_gotos']} GOTOs)  timeouts: {summary['timeouts']}"
+    )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Command line entry point (`caux-sim-gotobench`)."""
+    import argparse
+
+    try:
+        from ..nse_simulator import load_config
+    except ImportError:
+        from nse_simulator import load_config  # type: ignore
+
+    parser = argparse.ArgumentParser(
+        description="GOTO convergence benchmark in accelerated simulation time"
+    )
+    parser.add_argument("-c", "--config", help="Custom configuration file path")
+    parser.add_argument("--n-azm", type=int, default=36, help="Azm grid points")
+    parser.add_argument("--n-alt", type=int, default=28, help="Alt grid points")
+    parser.add_argument("--alt-min", type=float, default=5.0, help="Min Alt [deg]")
+    parser.add_argument("--alt-max", type=float, default=85.0, help="Max Alt [deg]")
+    parser.add_argument(
+        "--handover", choices=("fast", "fast-slow"), default="fast-slow"
+    )
+    parser.add_argument(
+        "--handover-deg", type=float, default=1.0, help="GOTO_SLOW distance [deg]"
+    )
+    parser.add_argument(
+        "--approach", type=int, choices=(0, 1), default=0, help="0=pos, 1=neg"
+    )
+    parser.add_argument(
+        "--backlash", type=int, help="Physical backlash [steps] (overrides config)"
+    )
+    parser.add_argument(
+        "--backlash-corr", type=int, default=0, help="MC backlash correction [steps]"
+    )
+    parser.add_argument("--dt", type=float, default=0.1, help="Physics tick [s]")
+    parser.add_argument("--records", help="Write per-GOTO records to CSV")
+    parser.add_argument("--save-baseline", help="Write the summary as JSON baseline")
+    parser.add_argument("--baseline", help="Compare against a JSON baseline")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.1, help="Relative regression tolerance"
+    )
+    args = parser.parse_args(argv)
+    # Anti-stall warnings are counted in the summary instead
+    logging.basicConfig(level=logging.ERROR)
+
+    config = load_config(args.config)
+    if args.backlash is not None:
+        imp = config.setdefault("simulator", {}).setdefault("imperfections", {})
+        imp["backlash_steps"] = args.backlash
+        imp.pop("azm_backlash_steps", None)
+        imp.pop("alt_backlash_steps", None)
+
+    bench = GotoBenchmark(
+        config,
+        handover=args.handover,
+        handover_deg=args.handover_deg,
+        approach=args.approach,
+        backlash_corr=args.backlash_corr,
+        dt=args.dt,
+    )
+    targets = sky_grid(args.n_azm, args.n_alt, (args.alt_min, args.alt_max))
+    t0 = time.perf_counter()
+    records = bench.run(targets)
+    wall = time.perf_counter() - t0
+
+    summary = summarize(records)
+    summary["params"] = {
+        k: getattr(args, k)
+        for k in ("handover", "handover_deg", "approach", "backlash_corr", "dt")
+    }
+    print(format_summary(summary))
+    print(
+        f"  simulated {bench.mount.sim_time:.0f} s in {wall:.1f} s wall "
+        f"({bench.mount.sim_time / wall:.0f}x real time)"
+    )
+
+    if args.records:
+        with open(args.records, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(records[0]))
+            writer.writeheader()
+            writer.writerows(records)
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(summary, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            problems = compare(summary, json.load(f), args.tolerance)
+        for p in problems:
+            print(f"REGRESSION {p}", file=sys.stderr)
+        return 1 if problems else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
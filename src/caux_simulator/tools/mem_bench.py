@@ -0,0 +1,91 @@
+"""
+Memory Benchmark
+
+Per-mount memory footprint, for sizing hosts that keep many mounts (the
+isolated mode of the AUX port, one mount per connection). Mounts are built
+the way the mount pool builds them, each with a private copy of the
+configuration, and measured with `tracemalloc`; the simulated devices of a
+mount are also measured one class at a time.
+"""
+
+import copy
+import gc
+import sys
+import tracemalloc
+from typing import Any, Callable, Dict, Optional, Sequence
+
+from ..bus.mount import NexStarMount
+from ..bus.pool import MountPool
+
+try:
+    from ..nse_simulator import load_config
+except ImportError:
+    from nse_simulator import load_config  # type: ignore
+
+
+def allocated(build: Callable[[], Any]) -> int:
+    """Bytes still allocated after `build()`, with its result kept alive."""
+    gc.collect()
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        kept = build()
+        gc.collect()
+        size = tracemalloc.get_traced_memory()[0] - before
+        del kept
+        return size
+    finally:
+        if started:
+            tracemalloc.stop()
+
+
+def measure(count: int, config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Average bytes per mount and per device instance over `count` objects."""
+    config = config if config is not None else load_config()
+    # Warm-up: module-level caches and interned strings are not per mount
+    prototype = NexStarMount(copy.deepcopy(config))
+    MountPool(config, size=1)
+
+    mounts = allocated(lambda: MountPool(config, size=count).idle)
+    devices: Dict[str, float] = {}
+    for device in prototype.bus.devices.values():
+        cls = type(device)
+        if cls.__name__ in devices:
+            continue
+        size = allocated(
+            lambda: [cls(device.device_id, config) for _ in range(count)]  # noqa: B023
+        )
+        devices[cls.__name__] = size / count
+    return {"mounts": count, "per_mount": mounts / count, "devices": devices}
+
+
+def format_results(result: Dict[str, Any]) -> str:
+    lines = [f"{'object':<18}{'bytes':>10}"]
+    lines.append(f"{'NexStarMount':<18}{result['per_mount']:>10,.0f}")
+    for name, size in sorted(result["devices"].items()):
+        lines.append(f"  {name:<16}{size:>10,.0f}")
+    lines.append(f"averaged over {result['mounts']} instances")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Command line entry point (`caux-sim-membench`)."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Memory footprint of a simulated mount and its devices"
+    )
+    parser.add_argument("-c", "--config", help="Custom configuration file path")
+    parser.add_argument(
+        "--mounts", type=int, default=1000, help="Mounts to build (default: 1000)"
+    )
+    args = parser.parse_args(argv)
+
+    print(format_results(measure(args.mounts, load_config(args.config))))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
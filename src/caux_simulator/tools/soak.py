@@ -0,0 +1,461 @@
+"""
+Soak Harness
+
+Runs an in-process simulator for hours under a steady synthetic AUX
+workload plus Stellarium (and optionally web console) clients, and samples
+process RSS, tracemalloc, event-loop lag, AUX latency and the sizes of
+known buffers into SQLite or CSV. At the end, series that keep growing
+are flagged as probable leaks.
+"""
+
+import asyncio
+import csv
+import json
+import logging
+import os
+import sqlite3
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from ..bus.client import AuxClient
+from ..bus.utils import pack_int3_raw
+
+try:
+    from ..nse_simulator import SimulatorServer, load_config
+except ImportError:
+    from nse_simulator import SimulatorServer, load_config  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_FIELDS = (
+    "t",
+    "rss_kb",
+    "traced_kb",
+    "lag_mean_ms",
+    "lag_max_ms",
+    "requests",
+    "errors",
+    "lat_p50_ms",
+    "lat_p99_ms",
+    "lat_max_ms",
+)
+
+# Columns of the tracemalloc top allocations
+ALLOCATION_FIELDS = ("t", "rank", "size_kb", "count", "location")
+
+# Series checked for growth at the end of the run, with the minimal
+# absolute rise that counts (below it, drift is measurement noise)
+GROWTH_FIELDS = {
+    "rss_kb": 4096.0,
+    "traced_kb": 1024.0,
+    "lag_max_ms": 10.0,
+    "lat_p99_ms": 5.0,
+}
+
+# A poll cycle of a planetarium app: positions and slew state of both axes
+POLL_CYCLE = [
+    (0x10, 0x01, b""),
+    (0x11, 0x01, b""),
+    (0x10, 0x13, b""),
+    (0x11, 0x13, b""),
+    (0xB6, 0x10, b""),
+]
+
+
+def read_rss_kb() -> int:
+    """Current resident set size in KiB (peak RSS where /proc is missing)."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, ValueError, IndexError):
+        import resource
+
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def allocations_path(output: str) -> str:
+    """Top allocations file of a CSV output (`soak.csv` -> `soak.allocations.csv`)."""
+    return os.path.splitext(output)[0] + ".allocations.csv"
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    if not values:
+        return 0.0
+    vals = sorted(values)
+    return vals[min(len(vals) - 1, int(q * len(vals)))]
+
+
+def growth(
+    samples: Sequence[Dict[str, Any]],
+    key: str,
+    rel: float = 0.1,
+    min_rise: float = 0.0,
+    warmup: float = 0.2,
+) -> Optional[str]:
+    """
+    Flags a series whose least-squares trend after the warm-up grows by
+    more than `rel` (relative to its first post-warm-up value) and by more
+    than `min_rise` in absolute terms.
+    """
+    data = samples[int(len(samples) * warmup) :]
+    if len(data) < 5:
+        return None
+    xs = [s["t"] for s in data]
+    ys = [float(s[key]) for s in data]
+    if xs[-1] == xs[0]:
+        return None
+    slope = statistics.linear_regression(xs, ys).slope
+    rise = slope * (xs[-1] - xs[0])
+    base = max(abs(ys[0]), 1.0)
+    if rise > rel * base and rise > min_rise:
+        per_hour = slope * 3600.0
+        return f"{key}: +{rise:.1f} over run ({per_hour:+.1f}/h)"
+    return None
+
+
+class SoakHarness:
+    """
+    Drives a `SimulatorServer` and records resource usage over time.
+
+    `watch` maps names to callables returning the size of a buffer or
+    container; they are sampled with the other metrics and checked for
+    growth.
+    """
+
+    def __init__(
+        self,
+        server: SimulatorServer,
+        output: str = "soak.db",
+        interval: float = 10.0,
+        rate: float = 50.0,
+        top: int = 10,
+        top_interval: float = 300.0,
+        stalled_clients: int = 0,
+    ):
+        self.server = server
+        self.output = output
+        self.interval = interval
+        self.rate = rate
+        self.top = top
+        self.top_interval = top_interval
+        self.stalled_clients = stalled_clients
+        self.samples: List[Dict[str, Any]] = []
+        self.watch: Dict[str, Callable[[], int]] = {
+            "bus_msg_log": lambda: len(server.mount.bus.msg_log),
+            "cmd_log": lambda: len(server.mount.cmd_log),
+            "stell_buffer": lambda: sum(
+                tr.get_write_buffer_size() for tr in server.connections
+            ),
+            "tasks": lambda: len(asyncio.all_tasks()),
+        }
+        self._latencies: List[float] = []
+        self._lags: List[float] = []
+        self._errors = 0
+        self._requests = 0
+        self._last_snapshot: Optional[float] = None
+        self._skip_lag = False
+        self._db: Optional[sqlite3.Connection] = None
+        self._csv_file: Optional[Any] = None
+        self._csv: Optional[Any] = None
+        self._top_file: Optional[Any] = None
+        self._top_csv: Optional[Any] = None
+
+    # --- Workload ---
+
+    async def aux_workload(self) -> None:
+        """Steady planetarium-like polling with a GOTO every ~10 s."""
+        client = await AuxClient(timeout=2.0).connect("127.0.0.1", self.server.aux_port)
+        period = len(POLL_CYCLE) / self.rate
+        n = 0
+        try:
+            while True:
+                t0 = time.perf_counter()
+                requests = list(POLL_CYCLE)
+                n += 1
+                if n % max(1, int(10.0 / period)) == 0:
+                    trg = pack_int3_raw((n * 0x12345) & 0xFFFFFF)
+                    requests.append((0x10, 0x02, trg))
+                try:
+                    replies = await client.pipeline(requests)
+                    self._latencies.extend(r.latency for r in replies)
+                except (asyncio.TimeoutError, ConnectionError):
+                    self._errors += 1
+                self._requests += len(requests)
+                await asyncio.sleep(max(0.0, period - (time.perf_counter() - t0)))
+        finally:
+            await client.close()
+
+    async def stellarium_client(self, read: bool = True) -> None:
+        """A Stellarium client; a stalled one connects but never reads."""
+        reader, writer = await asyncio.open_connection(
+            "127.0.0.1", self.server.stellarium_port
+        )
+        try:
+            if read:
+                while await reader.read(4096):
+                    pass
+            else:
+                await asyncio.Event().wait()
+        finally:
+            writer.close()
+
+    async def web_client(self) -> None:
+        import websockets
+
+        url = f"ws://127.0.0.1:{self.server.web_port}/ws"
+        async with websockets.connect(url) as ws:
+            async for _ in ws:
+                pass
+
+    async def loop_lag(self, period: float = 0.1) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            t0 = loop.time()
+            await asyncio.sleep(period)
+            if self._skip_lag:
+                # The loop was blocked by our own tracemalloc snapshot
+                self._skip_lag = False
+                continue
+            self._lags.append(max(0.0, loop.time() - t0 - period))
+
+    # --- Sampling ---
+
+    def _open_output(self) -> None:
+        fields = list(SAMPLE_FIELDS) + list(self.watch)
+        if self.output.endswith(".csv"):
+            self._csv_file = open(self.output, "w", newline="")
+            self._csv = csv.DictWriter(self._csv_file, fieldnames=fields)
+            self._csv.writeheader()
+            # tracemalloc top allocations go to a sibling file
+            self._top_file = open(allocations_path(self.output), "w", newline="")
+            self._top_csv = csv.writer(self._top_file)
+            self._top_csv.writerow(ALLOCATION_FIELDS)
+            return
+        self._db = sqlite3.connect(self.output)
+        cols = ", ".join(f"{f} REAL" for f in fields)
+        self._db.execute(f"CREATE TABLE IF NOT EXISTS samples ({cols})")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS allocations "
+            "(t REAL, rank INTEGER, size_kb REAL, count INTEGER, location TEXT)"
+        )
+        self._db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT, value TEXT)")
+
+    def _close_output(self) -> None:
+        if self._db:
+            self._db.commit()
+            self._db.close()
+            self._db = None
+        if self._csv:
+            self._csv_file.close()
+            self._top_file.close()
+            self._csv = self._top_csv = None
+
+    def sample(self, t: float) -> Dict[str, Any]:
+        """Takes one sample and writes it to the output."""
+        lats = [x * 1e3 for x in self._latencies]
+        lags = [x * 1e3 for x in self._lags]
+        self._latencies, self._lags = [], []
+        traced, _ = tracemalloc.get_traced_memory()
+        row: Dict[str, Any] = {
+            "t": t,
+            "rss_kb": read_rss_kb(),
+            "traced_kb": traced / 1024,
+            "lag_mean_ms": statistics.fmean(lags) if lags else 0.0,
+            "lag_max_ms": max(lags, default=0.0),
+            "requests": self._requests,
+            "errors": self._errors,
+            "lat_p50_ms": percentile(lats, 0.5),
+            "lat_p99_ms": percentile(lats, 0.99),
+            "lat_max_ms": max(lats, default=0.0),
+        }
+        for name, fn in self.watch.items():
+            row[name] = fn()
+        self.samples.append(row)
+
+        if self._csv:
+            self._csv.writerow(row)
+        elif self._db:
+            self._db.execute(
+                f"INSERT INTO samples ({', '.join(row)}) "
+                f"VALUES ({', '.join('?' * len(row))})",
+                list(row.values()),
+            )
+        has_output = self._top_csv is not None or self._db is not None
+        if (
+            self.top
+            and has_output
+            and (
+                self._last_snapshot is None
+                or t - self._last_snapshot >= self.top_interval
+            )
+        ):
+            self._last_snapshot = t
+            self._skip_lag = True
+            stats = tracemalloc.take_snapshot().statistics("lineno")
+            top = [
+                (t, i, st.size / 1024, st.count, str(st.traceback))
+                for i, st in enumerate(stats[: self.top])
+            ]
+            if self._top_csv:
+                self._top_csv.writerows(top)
+            elif self._db:
+                self._db.executemany(
+                    "INSERT INTO allocations VALUES (?, ?, ?, ?, ?)", top
+                )
+        if self._csv:
+            self._csv_file.flush()
+            self._top_file.flush()
+        elif self._db:
+            self._db.commit()
+        return row
+
+    def report(self) -> List[str]:
+        """Growth findings over the recorded samples."""
+        findings = []
+        for key, min_rise in GROWTH_FIELDS.items():
+            msg = growth(self.samples, key, min_rise=min_rise)
+            if msg:
+                findings.append(msg)
+        for key in self.watch:
+            msg = growth(self.samples, key, min_rise=0.5)
+            if msg and self.samples[-1][key] > self.samples[0][key]:
+                findings.append(msg)
+        return findings
+
+    async def run(self, duration: float) -> List[str]:
+        """Runs the soak for `duration` seconds and returns the findings."""
+        tracing_here = not tracemalloc.is_tracing()
+        if tracing_here:
+            tracemalloc.start()
+        self._open_output()
+        if self._db:
+            self._db.executemany(
+                "INSERT INTO meta VALUES (?, ?)",
+                [
+                    ("started", time.strftime("%Y-%m-%dT%H:%M:%S")),
+                    ("duration", str(duration)),
+                    ("rate", str(self.rate)),
+                ],
+            )
+
+        started_here = not self.server.running
+        if started_here:
+            await self.server.start()
+        tasks = [
+            asyncio.create_task(self.loop_lag()),
+            asyncio.create_task(self.aux_workload()),
+        ]
+        if self.server.stellarium:
+            tasks.append(asyncio.create_task(self.stellarium_client()))
+            tasks += [
+                asyncio.create_task(self.stellarium_client(read=False))
+                for _ in range(self.stalled_clients)
+            ]
+        if self.server.web_console:
+            tasks.append(asyncio.create_task(self.web_client()))
+
+        t0 = time.monotonic()
+        try:
+            while (elapsed := time.monotonic() - t0) < duration:
+                await asyncio.sleep(min(self.interval, duration - elapsed))
+                row = self.sample(time.monotonic() - t0)
+                logger.info(
+                    f"t={row['t']:.0f}s rss={row['rss_kb']}kB "
+                    f"lag={row['lag_max_ms']:.1f}ms p99={row['lat_p99_ms']:.2f}ms"
+                )
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if started_here:
+                await self.server.stop()
+            if tracing_here:
+                tracemalloc.stop()
+            findings = self.report()
+            if self._db:
+                self._db.execute(
+                    "INSERT INTO meta VALUES (?, ?)", ("findings", json.dumps(findings))
+                )
+            self._close_output()
+        return findings
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Command line entry point (`caux-sim-soak`)."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Long-running soak test with memory and latency tracking"
+    )
+    parser.add_argument("-c", "--config", help="Custom configuration file path")
+    parser.add_argument(
+        "--duration", type=float, default=3600.0, help="Run time [s] (default: 1h)"
+    )
+    parser.add_argument(
+        "--interval", type=float, default=10.0, help="Sample interval [s]"
+    )
+    parser.add_argument(
+        "--rate", type=float, default=50.0, help="AUX requests per second"
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        default="soak.db",
+        help="SQLite database or .csv file (allocations in .allocations.csv)",
+    )
+    parser.add_argument(
+        "--top", type=int, default=10, help="tracemalloc allocations per sample"
+    )
+    parser.add_argument(
+        "--top-interval",
+        type=float,
+        default=300.0,
+        help="Seconds between tracemalloc snapshots (they block the loop)",
+    )
+    parser.add_argument("--web", action="store_true", help="Add a web console client")
+    parser.add_argument(
+        "--stalled-clients",
+        type=int,
+        default=0,
+        help="Stellarium clients that never read (exposes write buffer growth)",
+    )
+    parser.add_argument("-v", "--verbose", action="store_true")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.ERROR)
+    logger.setLevel(logging.INFO)
+    logger.addHandler(logging.StreamHandler())
+    logger.propagate = False
+
+    server = SimulatorServer(
+        load_config(args.config),
+        host="127.0.0.1",
+        port=0,
+        stellarium=True,
+        stellarium_port=0,
+        web=args.web,
+        web_host="127.0.0.1",
+        web_port=0,
+    )
+    harness = SoakHarness(
+        server,
+        output=args.output,
+        interval=args.interval,
+        rate=args.rate,
+        top=args.top,
+        top_interval=args.top_interval,
+        stalled_clients=args.stalled_clients,
+    )
+    findings = asyncio.run(harness.run(args.duration))
+    for msg in findings:
+        print(f"GROWTH {msg}", file=sys.stderr)
+    print(f"{len(harness.samples)} samples written to {args.output}")
+    return 1 if findings else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,329 @@
+"""
+Trace Diff
+
+Replays the requests of a stored AUX trace (a `caux-sim --capture` file or
+a text log with the PROTOCOL category) against two simulator variants and
+reports every response that changed, per (device, command), with the
+differing payload offsets. Handling times are summarized separately.
+
+A variant is one of:
+    trace      the responses recorded in the trace itself
+    default    this build with the bundled configuration
+    FILE.toml  this build with a configuration override
+    DIR        another build (a source tree containing `caux_simulator`),
+               replayed in a subprocess
+    FILE       the responses recorded in another capture or log
+
+Variants of this build are replayed in-process and in lockstep (request by
+request), so responses that depend on the wall clock agree. The exit code
+is 1 when any response differs, so a recorded session works as a
+regression gate.
+"""
+
+import os
+import pickle
+import subprocess
+import sys
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from ..bus.protocol import cmd_names, commands, targets, trg_names
+from ..bus.utils import split_cmds
+from . import _replay
+from ._replay import Exchange, Request, replay
+
+# Examples kept per (device, command)
+MAX_EXAMPLES = 3
+
+
+def trace_requests(records: Sequence[Any]) -> List[Request]:
+    """(time, connection, bytes) of the received chunks of a trace."""
+    return [(r.time, r.conn, r.data) for r in records if r.direction == 0]
+
+
+def recorded_exchanges(records: Sequence[Any]) -> List[Exchange]:
+    """
+    Pairs every received chunk with the bytes sent back on the same
+    connection before its next request (empty when the mount was silent).
+    """
+    exchanges: List[Exchange] = []
+    pending: Dict[int, int] = {}  # conn -> index of the open exchange
+    for r in records:
+        if r.direction == 0:
+            pending[r.conn] = len(exchanges)
+            exchanges.append(Exchange(r.time, r.conn, r.data, b"", 0.0))
+        elif r.conn in pending:
+            i = pending[r.conn]
+            ex = exchanges[i]
+            exchanges[i] = ex._replace(
+                response=ex.response + r.data, elapsed=r.time - ex.t
+            )
+    return exchanges
+
+
+def replay_build(
+    build: str, config: dict, requests: Sequence[Request], dt: float = 0.1
+) -> List[Exchange]:
+    """
+    Replays the requests against the build in `build` in a subprocess
+    (the self-contained `_replay` worker, so older builds work too).
+    """
+    env = dict(os.environ, PYTHONPATH=os.path.abspath(build))
+    proc = subprocess.run(
+        [sys.executable, os.path.abspath(_replay.__file__)],
+        input=pickle.dumps((config, list(requests), dt)),
+        capture_output=True,
+        env=env,
+        check=False,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(
+            f"Replay against {build} failed:\n{proc.stderr.decode(errors='replace')}"
+        )
+    return [Exchange(*ex) for ex in pickle.loads(proc.stdout)]
+
+
+# --- Comparison ---
+
+
+def command_key(name: str) -> Tuple[int, int]:
+    """Parses "DEV:CMD" (names or numbers, e.g. "GPS:0x33") into IDs."""
+    dev, _, cmd = name.partition(":")
+    try:
+        return (
+            targets[dev] if dev in targets else int(dev, 0),
+            commands[cmd] if cmd in commands else int(cmd, 0),
+        )
+    except ValueError:
+        raise ValueError(f"Unknown AUX command: {name}") from None
+
+
+def command_name(dev: int, cmd: int) -> str:
+    device = trg_names.get(dev, f"0x{dev:02x}")
+    return f"{device}:{cmd_names.get(cmd, f'0x{cmd:02x}')}"
+
+
+def _take_response(packets: List[bytes], src: int, dst: int, cmd: int):
+    """Removes and returns the first response to a (src -> dst, cmd) request."""
+    for i, pkt in enumerate(packets):
+        if len(pkt) >= 4 and pkt[1] == dst and pkt[2] == src and pkt[3] == cmd:
+            return packets.pop(i)
+    return None
+
+
+def diff(
+    a: Sequence[Exchange],
+    b: Sequence[Exchange],
+    ignore: Set[Tuple[int, int]] = frozenset(),
+) -> Dict[str, Any]:
+    """
+    Aligns the exchanges of two replays of the same trace and compares the
+    responses of every request packet.
+
+    Returns {"exchanges", "differences", "commands": {name: counts},
+    "timing": {name: mean handling times}}; counts are `requests`, `same`,
+    `differs`, `only_a` and `only_b`, with the differing payload `offsets`
+    and a few `examples`.
+    """
+    if len(a) != len(b):
+        raise ValueError(f"Traces differ in length: {len(a)} != {len(b)} requests")
+    report: Dict[str, Dict[str, Any]] = {}
+    timing: Dict[str, List[float]] = {}
+    for i, (ea, eb) in enumerate(zip(a, b)):
+        if ea.request != eb.request:
+            raise ValueError(f"Request {i} differs between the traces")
+        packets_a = split_cmds(ea.response)
+        packets_b = split_cmds(eb.response)
+        reqs = [p for p in split_cmds(ea.request) if len(p) >= 4]
+        for req in reqs:
+            src, dst, cmd = req[1], req[2], req[3]
+            name = command_name(dst, cmd)
+            share = timing.setdefault(name, [0.0, 0.0, 0])
+            share[0] += ea.elapsed / len(reqs)
+            share[1] += eb.elapsed / len(reqs)
+            share[2] += 1
+            if (dst, cmd) in ignore:
+                continue
+            entry = report.setdefault(
+                name,
+                {
+                    "requests": 0,
+                    "same": 0,
+                    "differs": 0,
+                    "only_a": 0,
+                    "only_b": 0,
+                    "offsets": {},
+                    "examples": [],
+                },
+            )
+            entry["requests"] += 1
+            ra = _take_response(packets_a, src, dst, cmd)
+            rb = _take_response(packets_b, src, dst, cmd)
+            if ra == rb:
+                entry["same"] += 1
+                continue
+            if ra is None or rb is None:
+                entry["only_b" if ra is None else "only_a"] += 1
+            else:
+                entry["differs"] += 1
+                # Payload offsets (a length change counts from the shorter end)
+                pa, pb = ra[4:-1], rb[4:-1]
+                for k in range(max(len(pa), len(pb))):
+                    if k >= len(pa) or k >= len(pb) or pa[k] != pb[k]:
+                        entry["offsets"][k] = entry["offsets"].get(k, 0) + 1
+            if len(entry["examples"]) < MAX_EXAMPLES:
+                entry["examples"].append(
+                    {
+                        "index": i,
+                        "t": ea.t,
+                        "request": req.hex(),
+                        "a": ra.hex() if ra is not None else None,
+                        "b": rb.hex() if rb is not None else None,
+                    }
+                )
+    differences = sum(e["differs"] + e["only_a"] + e["only_b"] for e in report.values())
+    return {
+        "exchanges": len(a),
+        "differences": differences,
+        "commands": report,
+        "timing": {
+            name: {"a_us": ta / n * 1e6, "b_us": tb / n * 1e6, "requests": n}
+            for name, (ta, tb, n) in timing.items()
+        },
+        "total_time": {
+            "a": sum(ex.elapsed for ex in a),
+            "b": sum(ex.elapsed for ex in b),
+        },
+    }
+
+
+def format_report(report: Dict[str, Any], a: str = "A", b: str = "B") -> str:
+    lines = [
+        f"{report['exchanges']} exchanges, {report['differences']} differing "
+        f"responses ({a} vs {b})"
+    ]
+    for name, e in sorted(report["commands"].items()):
+        changed = e["differs"] + e["only_a"] + e["only_b"]
+        if not changed:
+            continue
+        offsets = ",".join(str(k) for k in sorted(e["offsets"]))
+        lines.append(
+            f"  {name:<28} {changed}/{e['requests']} differ"
+            + (f" (payload bytes {offsets})" if offsets else "")
+            + (f", {e['only_a']} only in {a}" if e["only_a"] else "")
+            + (f", {e['only_b']} only in {b}" if e["only_b"] else "")
+        )
+        for ex in e["examples"]:
+            lines.append(
+                f"      #{ex['index']} {ex['request']}: {ex['a'] or '-'} "
+                f"-> {ex['b'] or '-'}"
+            )
+    total = report["total_time"]
+    lines.append(
+        f"Handling time: {a} {total['a'] * 1000:.1f} ms, {b} {total['b'] * 1000:.1f} ms"
+    )
+    slowest = sorted(
+        report["timing"].items(), key=lambda kv: -abs(kv[1]["b_us"] - kv[1]["a_us"])
+    )
+    for name, t in slowest[:10]:
+        lines.append(
+            f"  {name:<28} {t['a_us']:8.1f} us -> {t['b_us']:8.1f} us "
+            f"({t['requests']} requests)"
+        )
+    return "\n".join(lines)
+
+
+# --- Command line ---
+
+
+def load_variants(
+    specs: Sequence[str],
+    trace: Sequence[Any],
+    dt: float = 0.1,
+) -> List[List[Exchange]]:
+    """Exchanges of every variant (see the module docstring) for the trace."""
+    try:
+        from ..bus.capture import read_trace
+        from ..bus.mount import NexStarMount
+        from ..nse_simulator import load_config
+    except ImportError:
+        from bus.capture import read_trace  # type: ignore
+        from bus.mount import NexStarMount  # type: ignore
+        from nse_simulator import load_config  # type: ignore
+
+    requests = trace_requests(trace)
+    results: List[Optional[List[Exchange]]] = [None] * len(specs)
+    in_process: List[Tuple[int, Any]] = []
+    for i, spec in enumerate(specs):
+        if spec == "trace":
+            results[i] = recorded_exchanges(trace)
+        elif spec == "default" or spec.endswith(".toml"):
+            config = load_config(None if spec == "default" else spec)
+            in_process.append((i, NexStarMount(config)))
+        elif os.path.isdir(spec):
+            results[i] = replay_build(spec, load_config(), requests, dt)
+        else:
+            results[i] = recorded_exchanges(read_trace(spec))
+    if in_process:
+        replays = replay([m for _, m in in_process], requests, dt)
+        for (i, _), result in zip(in_process, replays):
+            results[i] = result
+    return results  # type: ignore
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Command line entry point (`caux-sim-tracediff`)."""
+    import argparse
+    import json
+    import logging
+
+    parser = argparse.ArgumentParser(
+        description="Replay an AUX trace against two simulator variants and "
+        "compare the responses"
+    )
+    parser.add_argument("trace", help="Capture file or text log ([PROTO] lines)")
+    parser.add_argument(
+        "-a", default="trace", help="Variant A (default: the recorded responses)"
+    )
+    parser.add_argument("-b", default="default", help="Variant B (default: this build)")
+    parser.add_argument(
+        "--ignore",
+        action="append",
+        default=[],
+        metavar="DEV:CMD",
+        help="Skip a command, e.g. GPS:0x33 (repeatable)",
+    )
+    parser.add_argument("--dt", type=float, default=0.1, help="Physics tick [s]")
+    parser.add_argument("--save", help="Write variant B as a capture (a new golden)")
+    parser.add_argument("--json", action="store_true", help="Print JSON")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.ERROR)
+
+    try:
+        from ..bus.capture import RX, TX, CaptureWriter, read_trace
+    except ImportError:
+        from bus.capture import RX, TX, CaptureWriter, read_trace  # type: ignore
+
+    try:
+        ignore = {command_key(name) for name in args.ignore}
+        trace = read_trace(args.trace)
+        a, b = load_variants([args.a, args.b], trace, args.dt)
+        report = diff(a, b, ignore)
+    except (OSError, ValueError, RuntimeError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+
+    if args.save:
+        with CaptureWriter(args.save) as cap:
+            for ex in b:
+                cap.write(ex.t, RX, ex.conn, ex.request)
+                if ex.response:
+                    cap.write(ex.t + ex.elapsed, TX, ex.conn, ex.response)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(format_report(report, args.a, args.b))
+    return 1 if report["differences"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
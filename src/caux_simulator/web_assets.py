@@ -0,0 +1,106 @@
+"""
+Web Console Static Assets
+
+Loads the console page, its script and stylesheet and the vendored three.js
+files from the package once, with gzip variants and content-hash ETags.
+Asset URLs carry the content hash (`?v=...`) so browsers may cache them
+forever; the page itself is revalidated with its ETag.
+"""
+
+import gzip
+import hashlib
+import logging
+import mimetypes
+import os
+import re
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+
+# Vendored libraries shipped in static/vendor (three.js r129, MIT licence),
+# with the upstream files they were copied from. The console must work on
+# machines without internet access, so there is no CDN fallback.
+VENDOR: Dict[str, str] = {
+    "vendor/three.min.js": (
+        "https://cdn.jsdelivr.net/npm/three@0.129.0/build/three.min.js"
+    ),
+    "vendor/OrbitControls.js": (
+        "https://cdn.jsdelivr.net/npm/three@0.129.0/"
+        "examples/js/controls/OrbitControls.js"
+    ),
+}
+
+# Bodies smaller than this are not worth compressing
+GZIP_MIN_SIZE = 1024
+
+_ASSET_REF = re.compile(r"\{\{([\w./-]+)\}\}")
+
+
+class Asset:
+    """One static file in memory."""
+
+    __slots__ = ("body", "gzip", "etag", "media_type")
+
+    def __init__(self, body: bytes, media_type: str, gz: Optional[bytes] = None):
+        self.body = body
+        self.media_type = media_type
+        self.etag = '"' + hashlib.sha256(body).hexdigest()[:16] + '"'
+        if gz is None and len(body) >= GZIP_MIN_SIZE:
+            gz = gzip.compress(body, 9, mtime=0)
+        self.gzip = gz if gz is not None and len(gz) < len(body) else None
+
+    @property
+    def version(self) -> str:
+        return self.etag[1:9]
+
+
+class StaticAssets:
+    """The console assets found under `root`, loaded once."""
+
+    def __init__(self, root: str = STATIC_DIR):
+        self.root = root
+        self.assets: Dict[str, Asset] = {}
+        for dirpath, _, filenames in os.walk(root):
+            for filename in sorted(filenames):
+                if filename.endswith(".gz"):
+                    continue
+                path = os.path.join(dirpath, filename)
+                name = os.path.relpath(path, root).replace(os.sep, "/")
+                self.assets[name] = self._load(path)
+
+        missing = [name for name in VENDOR if name not in self.assets]
+        if missing:
+            raise FileNotFoundError(
+                f"Web console libraries missing from {root}: {', '.join(missing)}"
+            )
+        # The page links every asset by its versioned URL
+        page = self.assets.pop("index.html", None)
+        if page is not None:
+            html = _ASSET_REF.sub(lambda m: self.url(m.group(1)), page.body.decode())
+            self.index: Optional[Asset] = Asset(html.encode(), page.media_type)
+        else:
+            self.index = None
+
+    @staticmethod
+    def _load(path: str) -> Asset:
+        with open(path, "rb") as f:
+            body = f.read()
+        gz = None
+        if os.path.exists(path + ".gz"):
+            with open(path + ".gz", "rb") as f:
+                gz = f.read()
+        media_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        if media_type.startswith("text/") or media_type.endswith("javascript"):
+            media_type += "; charset=utf-8"
+        return Asset(body, media_type, gz)
+
+    def url(self, name: str) -> str:
+        asset = self.assets.get(name)
+        if asset is None:
+            raise KeyError(f"Unknown web console asset: {name}")
+        return f"/static/{name}?v={asset.version}"
+
+    def get(self, name: str) -> Optional[Asset]:
+        return self.assets.get(name)
@@ -0,0 +1,11 @@
+from importlib.metadata import entry_points
+from importlib.util import find_spec
+
+PLUGIN = "caux_simulator.pytest_plugin"
+
+# An installed package loads the plugin through its `pytest11` entry point;
+# a source checkout (PYTHONPATH=src) has no entry point and enables it here.
+if find_spec("caux_simulator") is not None and not any(
+    ep.value == PLUGIN for ep in entry_points(group="pytest11")
+):
+    pytest_plugins = [PLUGIN]
@@ -1,51 +1,24 @@
-import socket
-import subprocess
-import sys
+import asyncio
 import time
 import pytest
-from caux_simulator.bus.utils import encode_packet, unpack_int3, pack_int3
+from caux_simulator.bus.client import open_client
+from caux_simulator.bus.utils import unpack_int3, pack_int3
 
 
 class TestMotionIntegration:
-    @classmethod
-    def setup_class(cls):
-        # Start simulator in headless mode
-        cls.sim_proc = subprocess.Popen(
-            [
-                sys.executable,
-                "-m",
-                "caux_simulator.nse_simulator",
-                "--text",
-                "-p",
-                "2002",
-            ],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            cwd="/home/jochym/Projects/indi/caux-simulator",
-            env={**os.environ, "PYTHONPATH": "src"},
-        )
-        time.sleep(2)
-
-    @classmethod
-    def teardown_class(cls):
-        cls.sim_proc.terminate()
-        cls.sim_proc.wait()
-
-    def setup_method(self):
-        self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        self.sock.connect(("127.0.0.1", 2002))
-        self.sock.settimeout(1.0)
-
-    def teardown_method(self):
-        self.sock.close()
+    @pytest.fixture(autouse=True)
+    def connect(self, caux_sim):
+        # Simulator runs in-process on an ephemeral port (see pytest_plugin)
+        self.loop = asyncio.new_event_loop()
+        host, port = caux_sim.address
+        self.client = self.loop.run_until_complete(open_client(host, port))
+        yield
+        self.loop.run_until_complete(self.client.close())
+        self.loop.close()
 
     def exchange(self, dest, cmd, data=b""):
-        pkt = encode_packet(0x20, dest, cmd, data)
-        self.sock.send(pkt)
-        time.sleep(0.1)
-        resp = self.sock.recv(4096)
-        # Skip echo
-        return resp[len(pkt) :]
+        # Returns the response payload, as soon as it arrives
+        return self.loop.run_until_complete(self.client.query(dest, cmd, data))
 
     def test_goto_sequence(self):
         """Verifies GOTO_FAST and movement monitoring."""
@@ -59,14 +32,14 @@ class TestMotionIntegration:
         # 3. Monitor movement
         time.sleep(0.5)
         resp = self.exchange(0x10, 0x01)
-        current_pos = unpack_int3(resp[5:8])
+        current_pos = unpack_int3(resp)
         assert current_pos > 0.0, "Mount should have moved"
 
         # 4. Wait for completion
         max_retries = 60
         for _ in range(max_retries):
             resp = self.exchange(0x10, 0x13)  # SLEW_DONE
-            if resp[5] == 0xFF:
+            if resp[0] == 0xFF:
                 break
             time.sleep(0.5)
         else:
@@ -74,8 +47,5 @@ class TestMotionIntegration:
 
         # 5. Verify final position
         resp = self.exchange(0x10, 0x01)
-        final_pos = unpack_int3(resp[5:8])
+        final_pos = unpack_int3(resp)
         assert abs(final_pos - target) < 1e-4
-
-
-import os
@@ -1,177 +1,70 @@
-#!/usr/bin/env python3
 """
 NexStar AUX Simulator: Protocol Compliance Regression Suite
-Generated from session logs (SkySafari 7, SkyPortal, Aux Scanner)
+Generated from session logs (SkySafari 7, SkyPortal, Aux Scanner), run over
+TCP against the session simulator of the pytest plugin.
 """
 
-import asyncio
 import socket
-import struct
-import unittest
-import subprocess
-import sys
-import time
-import os
 
-from caux_simulator.bus.utils import encode_packet, make_checksum
+import pytest
 
-# --- Regression Tests ---
+from caux_simulator.bus.utils import encode_packet
 
 
-class TestSkySafari7Handshake(unittest.TestCase):
+class TestSkySafari7Handshake:
     """Verifies the exact command sequence seen in ss7.log."""
 
-    @classmethod
-    def setUpClass(cls):
-        # Start simulator in a background process
-        cls.sim_proc = subprocess.Popen(
-            [
-                sys.executable,
-                "-m",
-                "caux_simulator.nse_simulator",
-                "--text",
-                "--log-categories",
-                "31",
-                "--log-file",
-                "test_debug.log",
-            ],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            cwd="/home/jochym/Projects/indi/caux-simulator",
-            env={**os.environ, "PYTHONPATH": "src"},
-        )
-
-        time.sleep(2)  # Wait for startup
-
-    @classmethod
-    def tearDownClass(cls):
-        cls.sim_proc.terminate()
-        cls.sim_proc.wait()
-
-    def setUp(self):
-        self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        self.sock.connect(("127.0.0.1", 2000))
-        self.sock.settimeout(1.0)
-
-    def tearDown(self):
+    @pytest.fixture(autouse=True)
+    def connect(self, caux_sim):
+        self.sock = socket.create_connection(caux_sim.address, timeout=2.0)
+        yield
         self.sock.close()
 
-    def exchange(self, dest, src, cmd, data=b""):
-        pkt = encode_packet(src, dest, cmd, data)
-        self.sock.send(pkt)
-
-        # Read until we have the echo and the response
+    def recv_exact(self, n):
         buf = b""
-        start_time = time.time()
-        # Expect at least len(pkt) [echo] + 6 bytes [min response: 3B LEN SRC DST CMD CHK]
-        expected_min = len(pkt) + 6
-
-        while len(buf) < expected_min and (time.time() - start_time < 2.0):
-            try:
-                chunk = self.sock.recv(1024)
-                if not chunk:
-                    break
-                buf += chunk
-            except (socket.timeout, BlockingIOError):
-                break
-
-        # Return the actual response part (after the echo)
-        if len(buf) < len(pkt):
-            return b""
-        return buf[len(pkt) :]
+        while len(buf) < n:
+            chunk = self.sock.recv(n - len(buf))
+            assert chunk, "Connection closed"
+            buf += chunk
+        return buf
+
+    def exchange(self, dest, cmd, data=b""):
+        """Sends a command and returns its response packet (after the echo)."""
+        pkt = encode_packet(0x20, dest, cmd, data)
+        self.sock.sendall(pkt)
+        assert self.recv_exact(len(pkt)) == pkt, "Missing echo"
+        head = self.recv_exact(2)
+        return head + self.recv_exact(head[1] + 1)
 
     def test_01_wifi_handshake(self):
         """WiFi module (0xB5) initial handshake sequence."""
-        # 1. GET_VER - Should return version 0.0.256 (00 00 01 00)
-        resp = self.exchange(0xB5, 0x20, 0xFE)
-        self.assertEqual(
-            resp[5:9], bytes([0, 0, 1, 0]), "WiFi Module should return version 0.0.256"
-        )
-
-        # 2. Command 0x49 (Status/Ping)
-        resp = self.exchange(0xB5, 0x20, 0x49)
-        self.assertEqual(resp[5], 0x00, "WiFi 0x49 should return 0x00")
-
-        # 3. Command 0x32 (Config)
-        resp = self.exchange(0xB5, 0x20, 0x32, bytes.fromhex("3106739d"))
-        self.assertEqual(resp[5], 0x01, "WiFi 0x32 should return 0x01 (Success)")
-
-        # 4. Command 0x31 (Location)
-        resp = self.exchange(0xB5, 0x20, 0x31, bytes.fromhex("4248b72d419e46aa"))
-        self.assertEqual(resp[5], 0x01, "WiFi 0x31 should return 0x01 (Success)")
+        assert self.exchange(0xB5, 0xFE)[5:9] == bytes([0, 0, 1, 0])
+        assert self.exchange(0xB5, 0x49)[5] == 0x00
+        assert self.exchange(0xB5, 0x32, bytes.fromhex("3106739d"))[5] == 0x01
+        assert self.exchange(0xB5, 0x31, bytes.fromhex("4248b72d419e46aa"))[5] == 0x01
 
     def test_02_motor_handshake(self):
         """Motor controller (0x10) basic identification."""
-        # 1. GET_VER
-        resp = self.exchange(0x10, 0x20, 0xFE)
-        self.assertEqual(resp[5:9], bytes([7, 19, 20, 10]), "Incorrect AZM MC version")
-
-        # 2. GET_MODEL
-        resp = self.exchange(0x10, 0x20, 0x05)
-        self.assertEqual(
-            resp[5:7],
-            bytes.fromhex("1687"),
-            "Incorrect Model ID (should be Evolution)",
-        )
+        assert self.exchange(0x10, 0xFE)[5:9] == bytes([7, 19, 20, 10])
+        # Evolution mount
+        assert self.exchange(0x10, 0x05)[5:7] == bytes.fromhex("1687")
 
     def test_03_backlash_protocol(self):
-        """Verifies GET/SET backlash formatting."""
-        # 1. GET_POS_BACKLASH (AZM)
-        resp = self.exchange(0x10, 0x20, 0x40)
-        self.assertEqual(
-            len(resp),
-            7,
-            "GET_POS_BACKLASH should return 1 byte payload (7 bytes total)",
-        )
-
-        # 2. GET_POS_BACKLASH (ALT)
-        resp = self.exchange(0x11, 0x20, 0x40)
-        self.assertEqual(
-            len(resp), 7, "GET_POS_BACKLASH (ALT) should return 1 byte payload"
-        )
+        """GET_POS_BACKLASH returns a 1 byte payload on both axes."""
+        assert len(self.exchange(0x10, 0x40)) == 7
+        assert len(self.exchange(0x11, 0x40)) == 7
 
     def test_04_battery_protocol(self):
-        """Verifies Battery (0xB6) multi-byte data structures."""
-        # 1. GET_VOLTAGE_STATUS (SS sends 0x10)
-        resp = self.exchange(0xB6, 0x20, 0x10)
-        self.assertEqual(
-            len(resp),
-            12,
-            "Battery status must be exactly 6 bytes data payload (12 bytes total)",
-        )
-
-    def test_05_accessory_silence(self):
-        """Verifies that dropped devices (Focuser, StarSense, HC) are completely silent."""
-
-        def check_silence(dest):
-            pkt = encode_packet(0x20, dest, 0xFE)
-            self.sock.send(pkt)
-            time.sleep(0.1)
-            try:
-                self.sock.settimeout(0.5)
-                resp = self.sock.recv(1024)
-                # The only thing we might get is the echo
-                if resp == pkt:
-                    # Echo only is fine
-                    pass
-                else:
-                    self.fail(
-                        f"Device {hex(dest)} should be silent but returned: {resp.hex()}"
-                    )
-            except socket.timeout:
-                pass  # Success
-            finally:
-                self.sock.settimeout(1.0)
-
-        # 1. Focuser (0x12)
-        check_silence(0x12)
-
-        # 2. StarSense (0xB4)
-        check_silence(0xB4)
-
-        # 3. Hand Controller (0x04)
-        check_silence(0x04)
-
-
-if __name__ == "__main__":
-    unittest.main()
+        """Battery (0xB6) status is a 6 byte payload."""
+        assert len(self.exchange(0xB6, 0x10)) == 12
+
+    @pytest.mark.parametrize("dest", [0x12, 0xB4, 0x04])
+    def test_05_accessory_silence(self, dest):
+        """Absent devices (Focuser, StarSense, HC) are completely silent."""
+        self.sock.sendall(encode_packet(0x20, dest, 0xFE))
+        self.sock.settimeout(0.3)
+        with pytest.raises(socket.timeout):
+            self.sock.recv(1024)
+        # The connection still works afterwards
+        self.sock.settimeout(2.0)
+        assert self.exchange(0x10, 0x01)[5:8] == b"\x00\x00\x00"
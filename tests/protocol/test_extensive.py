@@ -1,180 +1,42 @@
-#!/usr/bin/env python3
 """
-Extensive SkySafari Protocol Test
-Tests all known commands that SkySafari typically sends
+Extended SkySafari protocol sequence: identification, a short manual move
+on each axis and the configuration queries that used to hang the client.
 """
 
-import socket
-import subprocess
-import time
-import sys
-import os
-import pytest
+from caux_simulator.bus.utils import unpack_int3
 
+VERSION = bytes([7, 19, 20, 10])
 
-def send_aux_command(sock, dest, src, cmd, data=b"", ignore_timeout=False):
-    """Send an AUX command and print the exchange."""
-    length = len(data) + 3
-    # Format: 3B Len Src Dst Cmd Data... Chk
-    header = bytes([length, src, dest, cmd])
-    checksum = (~sum(header + data) + 1) & 0xFF
-    packet = b";" + header + data + bytes([checksum])
+CONFIG_QUERIES = {
+    0x40: b"\x00",  # GET_POS_BACKLASH
+    0x41: b"\x00",  # GET_NEG_BACKLASH
+    0xFC: b"\x00",  # GET_APPROACH
+    0x47: b"\xf0",  # GET_AUTOGUIDE_RATE
+    0x3C: b"\x00\x00\x00",  # GET_CORDWRAP_POS
+    0x21: bytes.fromhex("0fa01194"),  # GET_MAXRATE
+    0x13: b"\xff",  # SLEW_DONE
+}
 
-    print(f"  TX: {packet.hex():40} -> ", end="")
-    sock.send(packet)
 
-    try:
-        time.sleep(0.05)
-        resp = sock.recv(1024)
-        print(f"RX: {resp.hex()}")
-        if not ignore_timeout:
-            assert len(resp) > 0, f"No response for command {hex(cmd)}"
-        return resp
-    except socket.timeout:
-        if ignore_timeout:
-            print("TIMEOUT (Expected for non-simulated device)")
-            return None
-        raise
+def test_identification(caux_channel):
+    assert caux_channel.exchange(0xB9, 0xFE) == (None, [])
+    for motor in (0x10, 0x11):
+        assert caux_channel.query(motor, 0xFE) == VERSION
+        assert caux_channel.query(motor, 0x05) == bytes.fromhex("1687")
+        assert caux_channel.query(motor, 0x01) == b"\x00\x00\x00"
 
 
-def run_test_sequence(sock):
-    """Run the sequence of commands that SkySafari typically sends."""
-    print("\n--- Testing Extended SkySafari Sequence ---")
+def test_manual_move(caux_channel):
+    for motor in (0x10, 0x11):
+        assert caux_channel.query(motor, 0x24, bytes([1])) == b""
+        caux_channel.advance(0.5)
+        assert caux_channel.query(motor, 0x24, bytes([0])) == b""
+        caux_channel.advance(0.5)
+        position = unpack_int3(caux_channel.query(motor, 0x01))
+        assert 0.0 < position < 0.01
 
-    # Step 1: Device enumeration and version queries
-    print("\n1. Device Enumeration Phase:")
-    print("   Querying device versions...")
-    send_aux_command(sock, 0xB9, 0x20, 0xFE, ignore_timeout=True)  # WiFi accessory
-    send_aux_command(sock, 0x10, 0x20, 0xFE)  # AZM
-    send_aux_command(sock, 0x11, 0x20, 0xFE)  # ALT
 
-    # Step 2: Get basic info
-    print("\n2. Getting basic device info...")
-    send_aux_command(sock, 0x10, 0x20, 0x05)  # Model
-    send_aux_command(sock, 0x11, 0x20, 0x05)  # Model
-
-    # Step 3: Check motor positions
-    print("\n3. Checking motor positions...")
-    send_aux_command(sock, 0x10, 0x20, 0x01)  # Position
-    send_aux_command(sock, 0x11, 0x20, 0x01)  # Position
-
-    # Step 4: Test movement capability
-    print("\n4. Testing movement...")
-    send_aux_command(sock, 0x10, 0x20, 0x24, bytes([1]))  # Move at slow rate
-    time.sleep(0.1)  # Brief movement
-    send_aux_command(sock, 0x10, 0x20, 0x24, bytes([0]))  # Stop
-    send_aux_command(sock, 0x11, 0x20, 0x24, bytes([1]))  # Move at slow rate
-    time.sleep(0.1)  # Brief movement
-    send_aux_command(sock, 0x11, 0x20, 0x24, bytes([0]))  # Stop
-
-    # Step 5: The critical config queries that were hanging SkySafari
-    print("\n5. Testing configuration queries (previously problematic)...")
-    send_aux_command(sock, 0x10, 0x20, 0x40)  # GET_POS_BACKLASH (AZM)
-    send_aux_command(sock, 0x11, 0x20, 0x40)  # GET_POS_BACKLASH (ALT)
-    send_aux_command(sock, 0x10, 0x20, 0x41)  # GET_NEG_BACKLASH (AZM)
-    send_aux_command(sock, 0x11, 0x20, 0x41)  # GET_NEG_BACKLASH (ALT)
-
-    # Step 6: Approach settings
-    print("\n6. Testing approach settings...")
-    send_aux_command(sock, 0x10, 0x20, 0xFC)  # GET_APPROACH (AZM)
-    send_aux_command(sock, 0x11, 0x20, 0xFC)  # GET_APPROACH (ALT)
-
-    # Step 7: Autoguide rate (newly added)
-    print("\n7. Testing autoguide rate...")
-    send_aux_command(sock, 0x10, 0x20, 0x47)  # GET_AUTOGUIDE_RATE (AZM)
-    send_aux_command(sock, 0x11, 0x20, 0x47)  # GET_AUTOGUIDE_RATE (ALT)
-
-    # Step 8: Cordwrap settings
-    print("\n8. Testing cordwrap settings...")
-    send_aux_command(sock, 0x10, 0x20, 0x3C)  # GET_CORDWRAP_POS (AZM)
-    send_aux_command(sock, 0x11, 0x20, 0x3C)  # GET_CORDWRAP_POS (ALT)
-
-    # Step 9: Max rates
-    print("\n9. Testing max rates...")
-    send_aux_command(sock, 0x10, 0x20, 0x21)  # GET_MAXRATE (AZM)
-    send_aux_command(sock, 0x11, 0x20, 0x21)  # GET_MAXRATE (ALT)
-
-    # Step 10: Slew status
-    print("\n10. Testing slew status...")
-    send_aux_command(sock, 0x10, 0x20, 0x13)  # SLEW_DONE (AZM)
-    send_aux_command(sock, 0x11, 0x20, 0x13)  # SLEW_DONE (ALT)
-
-    print("\n*** ALL TESTS COMPLETED SUCCESSFULLY ***")
-
-
-def test_extensive_protocol():
-    """Run the extensive protocol test sequence."""
-    # Start simulator
-    log_file = "/tmp/extensive_test.log"
-    if os.path.exists(log_file):
-        os.remove(log_file)
-
-    print("\n1. Starting simulator...")
-    sim_proc = subprocess.Popen(
-        [
-            sys.executable,
-            "-m",
-            "caux_simulator.nse_simulator",
-            "--text",
-            "--log-file",
-            log_file,
-            "--log-categories",
-            "31",
-        ],
-        stdout=subprocess.DEVNULL,
-        stderr=subprocess.DEVNULL,
-        cwd="/home/jochym/Projects/indi/caux-simulator",
-        env={**os.environ, "PYTHONPATH": os.path.join(os.getcwd(), "src")},
-    )
-
-    time.sleep(1)
-
-    try:
-        # Try multiple times to connect
-        sock = None
-        for i in range(5):
-            try:
-                print(f"2. Connecting to simulator on port 2000 (attempt {i + 1})...")
-                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                sock.settimeout(2.0)
-                sock.connect(("127.0.0.1", 2000))
-                print("   Connected!")
-                break
-            except Exception as e:
-                print(f"   Connection failed: {e}")
-                time.sleep(1)
-
-        if not sock:
-            raise Exception("Failed to connect to simulator")
-
-        # Run test sequence
-        run_test_sequence(sock)
-
-        sock.close()
-        print("\n3. Connection test completed successfully!")
-
-    except Exception as e:
-        print(f"\nERROR: {e}")
-        import traceback
-
-        traceback.print_exc()
-        raise e
-
-    finally:
-        print("\n4. Stopping simulator...")
-        sim_proc.terminate()
-        try:
-            sim_proc.wait(timeout=5)
-        except subprocess.TimeoutExpired:
-            sim_proc.kill()
-
-    # Results are already verified during command execution
-    print("\n*** ALL PROTOCOL EXCHANGES VERIFIED ***")
-    print("=" * 80)
-
-
-# Main execution
-if __name__ == "__main__":
-    print("Extensive SkySafari Protocol Test")
-    print("=" * 80)
-    test_extensive_protocol()
+def test_config_queries(caux_channel):
+    for motor in (0x10, 0x11):
+        for cmd, expected in CONFIG_QUERIES.items():
+            assert caux_channel.query(motor, cmd) == expected, f"{motor:#x} {cmd:#x}"
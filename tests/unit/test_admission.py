@@ -0,0 +1,108 @@
+import asyncio
+import socket
+
+import pytest
+
+from caux_simulator.bus.mount import NexStarMount
+from caux_simulator.bus.transport import AuxSession, TokenBucket
+from caux_simulator.bus.utils import encode_packet
+from caux_simulator.nse_simulator import SimulatorServer
+
+PKT = encode_packet(0x20, 0x10, 0x01)
+
+
+def make_server(**simulator):
+    simulator["imperfections"] = {}
+    return SimulatorServer(
+        {"simulator": simulator}, host="127.0.0.1", port=0, metrics=True
+    )
+
+
+def test_accounting_and_rate_limit():
+    t = [0.0]
+    mount = NexStarMount({"simulator": {"imperfections": {}}})
+    session = AuxSession(mount, rate_limit=TokenBucket(10, 100.0, lambda: t[0]))
+    resp = session.feed(PKT * 5)
+    assert (session.packets_rx, session.packets_tx) == (5, 10)  # Echo + response
+    assert (session.bytes_rx, session.bytes_tx) == (5 * len(PKT), len(resp))
+    assert session.throttle() == 0.0
+    session.feed(PKT * 15)
+    assert session.throttle() == 0.1  # 10 packets over the burst at 100/s
+    t[0] = 0.1
+    assert session.throttle() == 0.0
+    with pytest.raises(ValueError):
+        TokenBucket(10, 0.0)
+
+    # A packet split between reads is reassembled, not an error
+    assert session.feed(PKT[:3]) == b""
+    assert session.feed(PKT[3:] + PKT[:1]).startswith(PKT)
+    assert session.feed(PKT[1:]).startswith(PKT)
+    assert session.errors == 0 and session.packets_rx == 22
+
+
+def test_max_connections():
+    async def run():
+        async with make_server(max_connections=1) as server:
+            reader, writer = await asyncio.open_connection("127.0.0.1", server.aux_port)
+            writer.write(PKT)
+            assert (await reader.read(64)).startswith(PKT)
+
+            reader2, writer2 = await asyncio.open_connection(
+                "127.0.0.1", server.aux_port
+            )
+            assert await asyncio.wait_for(reader2.read(64), 2.0) == b""
+            assert server.disconnects["rejected"] == 1
+            assert len(server.sessions) == 1
+            text = server.metrics.render()
+            assert 'caux_aux_disconnects_total{reason="rejected"} 1' in text
+            assert "# TYPE caux_aux_disconnects_total counter" in text
+            assert 'caux_aux_connection_packets{conn="1",direction="tx"} 2' in text
+            writer.close()
+            writer2.close()
+
+    asyncio.run(run())
+
+
+def test_drain_timeout_disconnects_stalled_reader():
+    async def run():
+        async with make_server(drain_timeout=0.2) as server:
+            sock = socket.socket()
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1024)
+            sock.connect(("127.0.0.1", server.aux_port))
+            reader, writer = await asyncio.open_connection(sock=sock)
+            while not server._writers:
+                await asyncio.sleep(0.01)
+            # Small server-side buffers fill up quickly
+            transport = server._writers[0].transport
+            transport.get_extra_info("socket").setsockopt(
+                socket.SOL_SOCKET, socket.SO_SNDBUF, 1024
+            )
+            transport.set_write_buffer_limits(high=1024)
+            # Requests keep coming, replies are never read
+            for _ in range(500):
+                if server.disconnects["drain_timeout"]:
+                    break
+                writer.write(PKT * 100)
+                try:
+                    await asyncio.wait_for(writer.drain(), 0.5)
+                except (ConnectionError, asyncio.TimeoutError):
+                    pass
+                await asyncio.sleep(0.005)
+            assert server.disconnects["drain_timeout"] == 1
+            assert not server.sessions
+            writer.close()
+
+    asyncio.run(run())
+
+
+def test_split_packet_with_semicolon_in_payload():
+    # GOTO to a position containing 0x3B: the payload frames as `;\x03...`
+    goto = encode_packet(0x20, 0x10, 0x02, bytes([0x3B, 3, 0x10, 0x20, 0xFE, 0, 0, 0]))
+    stream = PKT + goto + PKT
+    for split in range(1, len(stream)):
+        mount = NexStarMount({"simulator": {"imperfections": {}}})
+        session = AuxSession(mount, policy="disconnect", budget=TokenBucket(1, 1.0))
+        resp = session.feed(stream[:split]) + session.feed(stream[split:])
+        assert goto in resp, split
+        assert session.errors == 0 and not session.closed, split
+        assert session.packets_rx == 3, split
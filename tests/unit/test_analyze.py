@@ -0,0 +1,82 @@
+import logging
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from caux_simulator import nse_logging as nselog  # noqa: E402
+from caux_simulator.bus.capture import RX, TX, CaptureWriter  # noqa: E402
+from caux_simulator.bus.mount import NexStarMount  # noqa: E402
+from caux_simulator.bus.utils import encode_packet  # noqa: E402
+from caux_simulator.tools import analyze  # noqa: E402
+
+GET_POS = encode_packet(0x20, 0x10, 0x01)
+
+
+def test_capture_decode_and_reports(tmp_path):
+    mount = NexStarMount({"simulator": {"imperfections": {}}})
+    path = str(tmp_path / "session.cap")
+    with CaptureWriter(path) as cap:
+        for i in range(100):
+            t = i * 0.1
+            # Two clients; the second polls in pairs split across reads
+            msg = GET_POS + encode_packet(0x20, 0x11, 0x01)
+            cap.write(t, RX, 1, msg)
+            cap.write(t + 0.002, TX, 1, mount.handle_msg(msg))
+            if i % 2 == 0:
+                msg = encode_packet(0x22, 0xB6, 0x10)
+                cap.write(t + 0.05, RX, 2, msg[:3])
+                cap.write(t + 0.05, RX, 2, msg[3:])
+        # Garbage, a bad checksum and a ';' inside a payload
+        cap.write(11.0, RX, 1, b"\x00;\xff" + GET_POS[:-1] + b"\x00")
+        cap.write(11.1, RX, 1, encode_packet(0x20, 0x10, 0x02, b";;;") + GET_POS)
+
+    packets = analyze.load(path)
+    assert set(packets) == set(analyze.COLUMNS)
+    req = analyze.requests(packets)
+    assert req.sum() == 202  # split packets are not reassembled
+    assert (~packets["chk_ok"]).sum() == 1
+    assert analyze.responses(packets).sum() == 200
+    assert packets["length"][req].max() == 3
+
+    latency = analyze.response_times(packets)
+    assert np.isfinite(latency).sum() == 200
+    assert np.nanmax(latency) == pytest.approx(0.002)
+
+    summary = analyze.summarize(packets)
+    top = summary["commands"][0]
+    assert (top["device"], top["cmd"], top["count"]) == ("AZM", "MC_GET_POSITION", 101)
+    polling = summary["polling"]["1:APP"]
+    assert polling["rate"] == pytest.approx(202 / 11.1)
+    gaps = summary["inter_arrival"]["clients"]["1:APP"]
+    assert gaps["p50"] == pytest.approx(0.0)  # both axes in one read
+    assert "2:NSB" not in summary["polling"]
+    assert "Polling rates:" in analyze.format_summary(summary)
+
+
+def test_text_log(tmp_path):
+    log = tmp_path / "session.log"
+    handler = logging.FileHandler(log)
+    handler.setFormatter(
+        logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    )
+    root = logging.getLogger()
+    root.addHandler(handler)
+    level = root.level
+    root.setLevel(logging.DEBUG)
+    nselog.set_log_categories(nselog.LOG_PROTOCOL)
+    try:
+        mount = NexStarMount({"simulator": {"imperfections": {}}})
+        for _ in range(5):
+            mount.handle_msg(GET_POS)
+    finally:
+        nselog.set_log_categories(0)
+        root.removeHandler(handler)
+        root.setLevel(level)
+        handler.close()
+
+    packets = analyze.load(str(log))
+    assert analyze.requests(packets).sum() == 5
+    assert analyze.responses(packets).sum() == 5
+    assert np.isfinite(packets["t"]).all()
+    assert analyze.main([str(log), "--json"]) == 0
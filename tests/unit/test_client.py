@@ -0,0 +1,67 @@
+import asyncio
+
+import pytest
+
+from caux_simulator.bus.client import AuxClient, PacketFramer, open_client
+from caux_simulator.bus.utils import encode_packet
+from caux_simulator.nse_simulator import SimulatorServer
+
+
+def test_framer_partial_and_garbage():
+    framer = PacketFramer()
+    a = encode_packet(0x20, 0x10, 0x01)
+    b = encode_packet(0x10, 0x20, 0x01, b"\x01\x02\x03")
+    bad = bytearray(encode_packet(0x20, 0x11, 0x01))
+    bad[-1] ^= 0xFF
+    stream = b"\x00junk" + a + bytes(bad) + b
+
+    assert framer.feed(stream[:7]) == []
+    assert framer.feed(stream[7:20]) == [a[1:]]
+    assert framer.feed(stream[20:]) == [b[1:]]
+    assert framer.bad_packets == 1
+    assert framer.buffer == b""
+
+
+def test_framer_rejects_short_length():
+    framer = PacketFramer()
+    a = encode_packet(0x20, 0x10, 0x01)
+    # `;\x00\x00` has a matching checksum but no src, dst and cmd
+    assert framer.feed(b";\x00\x00" + a) == [a[1:]]
+    assert framer.feed(b";\x02\x01\x02\xfd" + a) == [a[1:]]
+    assert framer.bad_packets == 2
+    assert framer.buffer == b""
+
+
+def test_pipelined_requests():
+    async def run():
+        config = {"simulator": {"imperfections": {}}}
+        async with SimulatorServer(config, host="127.0.0.1", port=0) as server:
+            server.mount.handle_msg(encode_packet(0x20, 0x11, 0x04, b"\x00\x00\x07"))
+            async with await open_client(port=server.aux_port) as client:
+                replies = await client.pipeline(
+                    [(0x10, 0xFE, b""), (0x11, 0x01, b""), (0x10, 0x01, b"")] * 5
+                )
+                with pytest.raises(asyncio.TimeoutError):
+                    await client.request(0xB0, 0xFE, timeout=0.05)  # silent GPS
+                pos = await client.query(0x11, 0x01)
+        return replies, pos, client
+
+    replies, pos, client = asyncio.run(run())
+    assert len(replies) == 15
+    assert [r.payload for r in replies[:3]] == [
+        bytes([7, 19, 20, 10]),
+        b"\x00\x00\x07",
+        b"\x00\x00\x00",
+    ]
+    assert all(r.echoed and r.latency >= r.echo_latency >= 0 for r in replies)
+    assert pos == b"\x00\x00\x07"
+    assert not client.unmatched
+    assert not client._pending
+
+
+def test_request_requires_connection():
+    async def run():
+        AuxClient().send(0x10, 0x01)
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(run())
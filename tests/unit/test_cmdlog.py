@@ -0,0 +1,41 @@
+import pytest
+
+from caux_simulator.bus.cmdlog import NO_RESPONSE, CommandLog
+from caux_simulator.bus.mount import NexStarMount
+from caux_simulator.bus.utils import encode_packet
+
+
+def test_ring_buffer_wraps():
+    log = CommandLog(capacity=4)
+    for i in range(6):
+        log.append(float(i), 0x20, 0x10 + i % 2, 0x01, 0, 3, 1e-6)
+    assert len(log) == 4
+    assert [r.seq for r in log.query()] == [2, 3, 4, 5]
+    assert [r.time for r in log.since(4)] == [4.0, 5.0]
+    assert [r.seq for r in log.since(0)] == [2, 3, 4, 5]
+    assert [r.seq for r in log.query(1, device="ALT")] == [5]
+    assert [r.seq for r in log.query(device=0x10)] == [2, 4]
+    assert log.query(0) == [] and log.query(-1) == []
+    log.clear()
+    assert len(log) == 0 and list(log.since(0)) == []
+    with pytest.raises(ValueError):
+        log.query(device="NOPE")
+
+
+def test_mount_records_commands():
+    mount = NexStarMount({"simulator": {"imperfections": {}}})
+    mount.handle_msg(
+        encode_packet(0x20, 0x10, 0x01)
+        + encode_packet(0x20, 0x11, 0x24, b"\x09")
+        + encode_packet(0x20, 0xB0, 0xFE)  # GPS is silent, not logged
+    )
+    records = mount.cmd_log.query()
+    assert [str(r) for r in records] == ["AZM: MC_GET_POSITION", "ALT: MC_MOVE_POS"]
+    assert (records[0].length, records[0].resp_length) == (0, 3)
+    assert (records[1].length, records[1].resp_length) == (1, 0)
+    assert records[0].latency >= 0
+    assert mount.cmd_log.query(cmd="MC_MOVE_POS")[0].as_dict()["dst"] == "ALT"
+    mount.handle_msg(encode_packet(0x20, 0x00, 0x01))  # broadcast
+    assert mount.cmd_log.query(1)[0].resp_length == NO_RESPONSE
+    mount.reset()
+    assert len(mount.cmd_log) == 0
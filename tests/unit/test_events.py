@@ -0,0 +1,81 @@
+import asyncio
+import struct
+
+from caux_simulator.bus.events import EventType
+from caux_simulator.bus.mount import NexStarMount
+from caux_simulator.bus.utils import encode_packet, pack_int3_raw
+
+
+def make_mount():
+    return NexStarMount({"simulator": {"imperfections": {}}})
+
+
+def kinds(events):
+    return [(e.kind, e.device) for e in events]
+
+
+def test_events_coalesced_per_tick():
+    mount = make_mount()
+    sub = mount.events.subscribe()
+    mount.handle_msg(encode_packet(0x20, 0x10, 0x24, b"\x05"))
+    mount.handle_msg(encode_packet(0x20, 0x10, 0x24, b"\x09"))
+    assert sub.drain() == []  # nothing delivered before the tick
+    mount.tick(0.1)
+    events = sub.drain()
+    assert kinds(events) == [
+        (EventType.RATE_CHANGED, 0x10),
+        (EventType.POSITION_CHANGED, 0x10),
+    ]
+    assert events[0].value == 186413.0  # latest rate only
+    mount.tick(0.1)
+    assert kinds(sub.drain()) == [(EventType.POSITION_CHANGED, 0x10)]
+
+    mount.handle_msg(encode_packet(0x20, 0x10, 0x24, b"\x00"))
+    mount.tick(0.1)
+    assert kinds(sub.drain()) == [(EventType.RATE_CHANGED, 0x10)]
+    mount.tick(0.1)
+    assert sub.drain() == []  # idle mount is silent
+
+
+def test_goto_and_sync_events():
+    mount = make_mount()
+    sub = mount.events.subscribe(
+        kinds=(
+            EventType.GOTO_STARTED,
+            EventType.GOTO_FINISHED,
+            EventType.LOCATION_SYNCED,
+            EventType.LIGHT_CHANGED,
+            EventType.CHARGER_CHANGED,
+        )
+    )
+    mount.handle_msg(encode_packet(0x20, 0x11, 0x02, pack_int3_raw(4660)))
+    mount.handle_msg(encode_packet(0x20, 0xB5, 0x31, struct.pack("<ff", 50.0, 20.0)))
+    mount.handle_msg(encode_packet(0x20, 0xBF, 0x10, b"\x01\x10"))
+    mount.handle_msg(encode_packet(0x20, 0xB7, 0x10, b"\x01"))
+    mount.tick(0.01)
+    events = {e.kind: e for e in sub.drain()}
+    assert events[EventType.GOTO_STARTED].value == 4660
+    assert events[EventType.LOCATION_SYNCED].value == (50.0, 20.0)
+    assert events[EventType.LIGHT_CHANGED].value["logo"] == 0x10
+    assert events[EventType.CHARGER_CHANGED].value is True
+    for _ in range(50):
+        mount.tick(0.1)
+    assert kinds(sub.drain()) == [(EventType.GOTO_FINISHED, 0x11)]
+
+
+def test_wait_wakes_on_tick():
+    mount = make_mount()
+    sub = mount.events.subscribe()
+
+    async def scenario():
+        waiter = asyncio.ensure_future(sub.wait(5.0))
+        await asyncio.sleep(0)
+        mount.reset()
+        mount.tick(0.1)
+        events = await asyncio.wait_for(waiter, 1.0)
+        assert kinds(events) == [(EventType.RESET, 0x00)]
+        assert await sub.wait(0.01) == []
+        sub.close()
+        assert not mount.events.subscribers
+
+    asyncio.run(scenario())
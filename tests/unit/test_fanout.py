@@ -0,0 +1,77 @@
+import asyncio
+
+from caux_simulator.bus.client import AuxClient
+from caux_simulator.bus.transport import FanOut
+from caux_simulator.bus.utils import encode_packet
+from caux_simulator.nse_simulator import SimulatorServer
+from caux_simulator.tools.fanout_bench import measure
+
+
+class Transport:
+    def __init__(self, stalled=False):
+        self.written = []
+        self.stalled = stalled
+        self.aborted = False
+
+    def write(self, data):
+        self.written.append(data)
+
+    def get_write_buffer_size(self):
+        return sum(map(len, self.written)) if self.stalled else 0
+
+    def is_closing(self):
+        return self.aborted
+
+    def abort(self):
+        self.aborted = True
+
+
+def test_publish_order_and_overflow():
+    fanout = FanOut(max_buffer=10)
+    a, b, stalled = Transport(), Transport(), Transport(stalled=True)
+    for conn_id, tr in enumerate((a, b, stalled)):
+        fanout.subscribe(conn_id, tr)
+    chunks = [b"12345", b"67890", b"abcde"]
+    for chunk in chunks:
+        fanout.publish(chunk)
+    # The same objects, in the same order, to every subscriber
+    assert a.written == b.written == chunks
+    assert all(x is y for x, y in zip(a.written, chunks))
+    # The stalled one was dropped once over its buffer limit
+    assert stalled.aborted and len(stalled.written) == 3
+    assert list(fanout.subscribers) == [0, 1] and fanout.overflows == 1
+
+
+def test_clients_see_each_others_traffic():
+    async def run():
+        config = {"simulator": {"imperfections": {}}}
+        async with SimulatorServer(
+            config, host="127.0.0.1", port=0, fanout=True
+        ) as srv:
+            app = await AuxClient(src_id=0x20).connect("127.0.0.1", srv.aux_port)
+            sniffer = await AuxClient(src_id=0x22).connect("127.0.0.1", srv.aux_port)
+            assert await app.query(0x10, 0xFE) == bytes([7, 19, 20, 10])
+            while len(sniffer.unmatched) < 2:
+                await asyncio.sleep(0.01)
+            echo, resp = sniffer.unmatched
+            assert b";" + echo == encode_packet(0x20, 0x10, 0xFE)
+            assert resp[1:4] == bytes([0x10, 0x20, 0xFE])
+            assert not app.unmatched
+
+            # WiFly command mode replies are not bus traffic
+            reader, writer = await asyncio.open_connection("127.0.0.1", srv.aux_port)
+            writer.write(b"$$$")
+            assert await reader.read(16) == b"CMD\r\n"
+            await asyncio.sleep(0.05)
+            assert len(sniffer.unmatched) == 2
+            writer.close()
+            await app.close()
+            await sniffer.close()
+
+    asyncio.run(run())
+
+
+def test_fanout_bench():
+    result = asyncio.run(measure(3, 0.3, {"simulator": {"imperfections": {}}}))
+    assert result["requests"] > 0
+    assert result["identical"] and not result["overflows"]
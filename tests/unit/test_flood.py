@@ -0,0 +1,112 @@
+import asyncio
+import logging
+
+import pytest
+from caux_simulator.bus.mount import NexStarMount
+from caux_simulator.bus.transport import AuxSession, TokenBucket
+from caux_simulator.bus.utils import encode_packet
+from caux_simulator.metrics import Metrics
+from caux_simulator.nse_logging import LogLimiter
+from caux_simulator.nse_simulator import SimulatorServer
+from caux_simulator.tools.flood_bench import FloodBench
+
+
+class Clock:
+    def __init__(self):
+        self.t = 0.0
+
+    def __call__(self):
+        return self.t
+
+
+def make_mount():
+    return NexStarMount({"simulator": {"imperfections": {}}})
+
+
+def test_log_limiter(caplog):
+    clock = Clock()
+    limiter = LogLimiter(logging.getLogger("test"), interval=10.0, burst=2, clock=clock)
+    assert [limiter.allow("a") for _ in range(5)] == [True, True, False, False, False]
+    assert limiter.allow("b")
+    assert limiter.suppressed() == 3
+    clock.t = 10.0
+    with caplog.at_level(logging.WARNING):
+        assert limiter.allow("a")
+    assert "3 similar messages suppressed" in caplog.text
+
+
+def test_resync_after_bad_length():
+    mount = make_mount()
+    metrics = Metrics(mount)
+    pkt = encode_packet(0x20, 0x10, 0xFE)
+    # A bogus length byte must not swallow the packet after it
+    resp = mount.handle_msg(b"\x00\x01;\xff" + pkt + b";;" + pkt)
+    assert resp.count(pkt) == 2
+    # Leading bytes, `;\xff` and each `;` of `;;` (lengths past the end)
+    assert metrics.bus.framing_errors == 4
+    assert metrics.bus.packets_rx == 2
+    assert mount.bus.errors == 4
+
+
+def test_resync_after_bad_length_in_stream():
+    mount = make_mount()
+    session = AuxSession(mount)
+    pkt = encode_packet(0x20, 0x10, 0xFE)
+    resp = encode_packet(0x10, 0x20, 0xFE, bytes([7, 19, 20, 10]))
+    # Reads of a connection: `;\xff` is not held as a cut-off packet once
+    # a complete packet follows it
+    assert session.feed(b";\xff" + pkt) == pkt + resp
+    for _ in range(5):
+        assert session.feed(pkt) == pkt + resp
+    assert session.feed(b"\x00\x01;\xff" + pkt + b";;" + pkt) == (pkt + resp) * 2
+    assert session.errors == 5 and session.packets_rx == 8
+    # Without a complete packet after it, a cut-off packet is still held
+    assert session.feed(b";\x07" + pkt[:3]) == b""
+    assert session.errors == 5
+
+
+def test_error_log_is_rate_limited(caplog):
+    mount = make_mount()
+    bad = bytearray(encode_packet(0x20, 0x10, 0x01))
+    bad[-1] ^= 0xFF
+    with caplog.at_level(logging.WARNING):
+        mount.handle_msg(bytes(bad) * 100)
+    assert mount.bus.errors == 100
+    assert len(caplog.records) == mount.bus.log_limiter.burst
+
+
+def test_error_budget_policies():
+    clock = Clock()
+    mount = make_mount()
+    pkt = encode_packet(0x20, 0x10, 0xFE)
+    junk = b";\x01" * 10
+
+    session = AuxSession(mount, "drop", TokenBucket(15, 1.0, clock), "drop", 5.0)
+    assert session.feed(junk) == b""
+    assert session.feed(pkt).startswith(pkt)
+    assert session.feed(junk) == b""  # Budget exhausted: 20 errors
+    assert session.drop_remaining() == 5.0
+    assert session.feed(pkt) == b""  # Input is dropped unparsed
+    assert session.dropped_bytes == len(pkt)
+    clock.t = 5.0
+    assert session.feed(pkt).startswith(pkt)
+
+    session = AuxSession(mount, "close", TokenBucket(5, 1.0, clock), "disconnect")
+    session.feed(junk)
+    assert session.closed and session.feed(pkt) == b""
+
+    with pytest.raises(ValueError):
+        AuxSession(mount, policy="ignore")
+
+
+def test_good_clients_during_flood():
+    server = SimulatorServer(
+        {"simulator": {"imperfections": {}, "error_policy": "disconnect"}},
+        host="127.0.0.1",
+        port=0,
+    )
+    baseline, flood = asyncio.run(FloodBench(server, clients=2).run(0.5))
+    assert baseline["requests"] > 0 and baseline["bus_errors"] == 0
+    assert flood["requests"] > 0 and flood["timeouts"] == 0
+    assert flood["flooder_disconnected"]
+    assert flood["log_messages"] <= 2 * 5 + 1
@@ -0,0 +1,42 @@
+from caux_simulator.bus.mount import NexStarMount
+from caux_simulator.bus.utils import encode_packet
+from caux_simulator.tools.fuzz import Fuzzer, format_stats
+
+
+def test_fuzzing_finds_no_failures():
+    stats = Fuzzer(seed=1).run(iterations=5000)
+    assert stats.inputs == 5000
+    assert not stats.failures, format_stats(stats)
+
+
+def test_malformed_packets_are_dropped():
+    mount = NexStarMount({"simulator": {"imperfections": {}}})
+    mount.bus.raise_errors = True
+    assert mount.handle_msg(b";\x6f") == b""  # Truncated header
+    assert mount.handle_msg(b";\x01\x20\x10\xcf") == b""  # Length < 3
+    # Checksum matches, but the packet is shorter than its length byte
+    assert mount.handle_msg(bytes.fromhex("3b06201138869972")) == b""
+    for cmd in (0x22, 0x24, 0x25, 0xFD):  # Handlers reading data[0]
+        assert mount.handle_msg(encode_packet(0x20, 0x10, cmd))
+
+
+def test_failure_is_minimized(monkeypatch):
+    from caux_simulator.devices.motor import MotorController
+
+    original = MotorController.handle_command
+
+    def planted(self, sender_id, command_id, data):
+        # MOVE_POS at rate 7 crashes after a non-zero SET_APPROACH
+        if command_id == 0x24 and self.approach and data[:1] == b"\x07":
+            raise ZeroDivisionError("planted")
+        return original(self, sender_id, command_id, data)
+
+    monkeypatch.setattr(MotorController, "handle_command", planted)
+    stats = Fuzzer(seed=2).run(iterations=20000)
+    (failure,) = stats.failures
+    assert failure.signature.startswith("handler:ZeroDivisionError@test_fuzz.py")
+    assert len(failure.inputs) == 2
+    approach, move = failure.inputs
+    # ; len src dst cmd data... chk
+    assert approach[3] == move[3] and approach[3] in (0x10, 0x11)
+    assert approach[4] == 0xFD and move[4:6] == b"\x24\x07"
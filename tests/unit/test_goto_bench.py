@@ -0,0 +1,51 @@
+from caux_simulator.tools.goto_bench import (
+    GotoBenchmark,
+    compare,
+    sky_grid,
+    summarize,
+)
+
+
+def make_config(backlash=0):
+    return {"simulator": {"imperfections": {"backlash_steps": backlash}}}
+
+
+def test_sky_grid():
+    grid = sky_grid(4, 3, (10.0, 50.0))
+    assert len(grid) == 12
+    assert grid[0] == (0.0, 10.0)
+    assert grid[4] == (270.0, 30.0)  # second row runs backwards
+    assert grid[-1] == (270.0, 50.0)
+
+
+def test_fast_slow_goto_converges():
+    bench = GotoBenchmark(make_config(), handover="fast-slow")
+    rec = bench.goto(90.0, 45.0)
+    assert rec["timeout"] == 0
+    assert rec["enc_err"] == 0.0
+    # Completion snaps the encoder only; pointing stays within the snap window
+    assert rec["pnt_err"] < 50 * 1296000.0 / 16777216
+    # 90 deg at 4 deg/s plus the slow phase
+    assert 20.0 < rec["t_slew"] < 30.0
+    assert bench.mount.sim_time == rec["t_slew"]
+
+
+def test_anti_stall_runs_in_sim_time():
+    bench = GotoBenchmark(make_config(100), handover="fast", approach=1)
+    records = bench.run(sky_grid(6, 2))
+    summary = summarize(records)
+    assert summary["gotos"] == 12
+    assert summary["timeouts"] == 0
+    assert summary["anti_stall"] > 0
+    assert summary["pnt_err"]["max"] > 0.0
+
+
+def test_compare_baseline():
+    bench = GotoBenchmark(make_config(), handover="fast-slow")
+    base = summarize(bench.run(sky_grid(3, 2)))
+    assert compare(base, base) == []
+    worse = dict(base, t_slew={k: v * 2 for k, v in base["t_slew"].items()})
+    worse["timeouts"] = 1
+    problems = compare(worse, base)
+    assert any(p.startswith("t_slew.p50") for p in problems)
+    assert any(p.startswith("timeouts") for p in problems)
@@ -0,0 +1,46 @@
+import pytest
+from caux_simulator.bus.mount import NexStarMount
+from caux_simulator.bus.utils import pack_int3_raw
+from caux_simulator.devices.base import AuxDevice
+from caux_simulator.tools.mem_bench import measure
+
+CONFIG = {"simulator": {"imperfections": {}}}
+
+
+def test_devices_are_slotted_with_class_handler_tables():
+    mount = NexStarMount(CONFIG)
+    for device in mount.bus.devices.values():
+        assert not hasattr(device, "__dict__")
+        assert 0xFE in device.handlers
+        assert device.handlers is type(device).handlers
+    assert mount.azm_motor.handlers is mount.alt_motor.handlers
+    with pytest.raises(AttributeError):
+        mount.azm_motor.undeclared = 1
+    # Unknown commands are silently ignored
+    assert AuxDevice(0x42, (1, 0, 0, 0), {}).handle_command(0x20, 0x01, b"") is None
+
+
+def test_motor_state_fields_are_reset():
+    motor = NexStarMount(CONFIG).azm_motor
+    assert motor.handle_command(0x20, 0x3B, b"") == b"\x00"
+    motor.handle_command(0x20, 0x38, b"")
+    motor.handle_command(0x20, 0x3A, pack_int3_raw(1234))
+    motor.handle_command(0x20, 0x02, pack_int3_raw(100000))
+    motor.tick(0.01)
+    assert motor._goto_stuck_start is not None
+    assert motor.handle_command(0x20, 0x3B, b"") == b"\xff"
+    assert motor.handle_command(0x20, 0x3C, b"") == pack_int3_raw(1234)
+    motor.reset()
+    assert (motor._goto_stuck_start, motor.cordwrap, motor.cordwrap_steps) == (
+        None,
+        False,
+        0,
+    )
+
+
+def test_mem_bench():
+    result = measure(20, CONFIG)
+    assert result["mounts"] == 20 and result["per_mount"] > 0
+    assert set(result["devices"]) >= {"MotorController", "WiFiModule"}
+    # Slotted devices: no per-instance dicts of state or bound handlers
+    assert result["devices"]["MotorController"] < 2000
@@ -0,0 +1,84 @@
+import asyncio
+
+from caux_simulator.bus.mount import NexStarMount
+from caux_simulator.bus.utils import encode_packet
+from caux_simulator.metrics import Histogram, Metrics
+from caux_simulator.nse_simulator import SimulatorServer
+
+
+def make_mount():
+    return NexStarMount({"simulator": {"imperfections": {}}})
+
+
+def test_histogram_render():
+    h = Histogram((1.0, 2.0))
+    for v in (0.5, 1.5, 1.5, 5.0):
+        h.observe(v)
+    assert h.render("x", 'a="b"') == [
+        'x_bucket{a="b",le="1"} 1',
+        'x_bucket{a="b",le="2"} 3',
+        'x_bucket{a="b",le="+Inf"} 4',
+        'x_sum{a="b"} 8.5',
+        'x_count{a="b"} 4',
+    ]
+
+
+def test_bus_counters():
+    mount = make_mount()
+    metrics = Metrics(mount)
+    bad = bytearray(encode_packet(0x20, 0x10, 0x01))
+    bad[-1] ^= 0xFF
+    mount.handle_msg(
+        encode_packet(0x20, 0x10, 0x01)
+        + encode_packet(0x20, 0x10, 0x01)
+        + encode_packet(0x20, 0xB0, 0xFE)  # GPS is silent
+        + bytes(bad)
+    )
+    mount.handle_msg(encode_packet(0x20, 0x10, 0x24, b"\x09"))
+    stats = metrics.bus
+    assert stats.packets_rx == 5
+    assert stats.packets_tx == 6  # 3 echoes + 3 responses
+    assert stats.checksum_errors == 1
+    assert stats.silenced == 1
+    assert stats.latency[(0x10, 0x01)].count == 2
+
+    text = metrics.render()
+    assert "caux_packets_received_total 5\n" in text
+    assert 'caux_commands_total{device="AZM",cmd="MC_GET_POSITION"} 2' in text
+    assert 'caux_handler_seconds_count{device="AZM",cmd="MC_MOVE_POS"} 1' in text
+    assert 'caux_motor_gotos_completed_total{axis="azm"} 0' in text
+
+
+def test_backlash_jump_counter():
+    mount = make_mount()
+    mount.handle_msg(encode_packet(0x20, 0x10, 0x10, b"\x20"))
+    mount.handle_msg(encode_packet(0x20, 0x10, 0x24, b"\x05"))
+    assert mount.azm_motor.backlash_jumps == 1
+
+
+def test_standalone_metrics_endpoint():
+    async def run():
+        server = SimulatorServer(
+            {"simulator": {"imperfections": {}}},
+            host="0.0.0.0",
+            port=0,
+            metrics=True,
+            metrics_port=0,
+        )
+        async with server:
+            # Local only by default, whatever the AUX port host
+            assert server._metrics_server.sockets[0].getsockname()[0] == "127.0.0.1"
+            reader, writer = await asyncio.open_connection("127.0.0.1", server.aux_port)
+            writer.write(encode_packet(0x20, 0x11, 0x01))
+            await reader.readexactly(6 + 9)
+
+            r, w = await asyncio.open_connection("127.0.0.1", server.metrics_port)
+            w.write(b"GET /metrics HTTP/1.1\r\nHost: x\r\n\r\n")
+            response = await r.read()
+            writer.close()
+        return response.decode()
+
+    response = asyncio.run(run())
+    assert response.startswith("HTTP/1.1 200 OK")
+    assert 'caux_commands_total{device="ALT",cmd="MC_GET_POSITION"} 1' in response
+    assert 'caux_connections{kind="aux"} 1' in response
@@ -0,0 +1,78 @@
+import pytest
+from math import pi, sin, radians
+from caux_simulator.bus.mount import NexStarMount
+from caux_simulator.devices.motor import STEPS_PER_REV
+from caux_simulator.model.periodic_error import PeriodicErrorModel, load_curve
+from caux_simulator.nse_simulator import load_config
+
+
+def test_harmonic_table():
+    # 1 and 3 harmonics, worm period of 1000 steps
+    pe = PeriodicErrorModel(
+        harmonics=[(1, 10.0, 0.0), (3, 2.0, 30.0)], period=1000, table_size=8192
+    )
+    for x in [0, 125, 333.3, 999, 1000 + 250, -250]:
+        ph = 2 * pi * x / 1000
+        expected = 10.0 * sin(ph) + 2.0 * sin(3 * ph + radians(30.0))
+        assert pe(x) * 360 * 3600 == pytest.approx(expected, abs=1e-3)
+
+
+def test_recorded_curve(tmp_path):
+    # Triangle wave sampled at 4 points: 0, 4, 0, -4 arcsec
+    path = tmp_path / "pe.csv"
+    path.write_text("# phase, arcsec\n0.0, 0\n0.25, 4\n0.5, 0\n0.75, -4\n")
+    pe = PeriodicErrorModel(curve=load_curve(str(path)), period=400)
+
+    assert pe(100) * 360 * 3600 == pytest.approx(4.0)
+    assert pe(50) * 360 * 3600 == pytest.approx(2.0)
+    assert pe(350) * 360 * 3600 == pytest.approx(-2.0)
+
+
+def test_vectorized_matches_scalar():
+    np = pytest.importorskip("numpy")
+    pe = PeriodicErrorModel(harmonics=[(1, 5.0, 0.0), (2, 1.0, 90.0)])
+    xs = np.linspace(0, STEPS_PER_REV, 1001)
+    assert np.allclose(pe.evaluate(xs), [pe(x) for x in xs])
+
+
+def test_worm_pe_follows_encoder():
+    config = {
+        "simulator": {
+            "imperfections": {
+                "periodic_error": {
+                    "azm": {"worm_period_steps": 4000, "harmonics": [[1, 3600, 0]]}
+                }
+            }
+        }
+    }
+    mount = NexStarMount(config)
+    mount.alt = 0.0
+
+    # A quarter of a worm cycle gives the full amplitude (1 deg)
+    mount.azm_motor.steps = mount.azm_motor.pointing_steps = 1000
+    sky_azm, sky_alt = mount.get_sky_altaz()
+    assert sky_azm == pytest.approx(1000 / STEPS_PER_REV + 1 / 360.0, rel=1e-6)
+    assert sky_alt == 0.0
+
+    # Independent of simulation time
+    mount.sim_time = 123.0
+    assert mount.get_sky_altaz()[0] == pytest.approx(sky_azm)
+
+
+def test_curve_file_relative_to_config(tmp_path, monkeypatch):
+    (tmp_path / "pe.csv").write_text("0.0, 0\n0.25, 3600\n0.5, 0\n0.75, -3600\n")
+    (tmp_path / "config.toml").write_text(
+        "[simulator.imperfections.periodic_error.azm]\n"
+        "worm_period_steps = 4000\n"
+        'curve_file = "pe.csv"\n'
+    )
+    monkeypatch.chdir(tmp_path.parent)
+    config = load_config(str(tmp_path / "config.toml"))
+    config["simulator"]["imperfections"] = {
+        "periodic_error": config["simulator"]["imperfections"]["periodic_error"]
+    }
+    mount = NexStarMount(config)
+    mount.alt = 0.0
+    mount.azm_motor.steps = mount.azm_motor.pointing_steps = 1000
+    sky_azm, _ = mount.get_sky_altaz()
+    assert sky_azm == pytest.approx(1000 / STEPS_PER_REV + 1 / 360.0, rel=1e-6)
@@ -0,0 +1,71 @@
+import pytest
+from caux_simulator.bus.mount import NexStarMount
+from caux_simulator.devices.motor import STEPS_PER_REV
+from caux_simulator.model.pointing import (
+    ConeError,
+    PointingModel,
+    PointingTerm,
+    error_map,
+)
+
+np = pytest.importorskip("numpy")
+
+IMPERFECTIONS = {
+    "cone_error_arcmin": 5.0,
+    "non_perpendicularity_arcmin": 3.0,
+    "periodic_error_arcsec": 20.0,
+    "periodic_error_period_sec": 480.0,
+    "periodic_error": {"azm": {"harmonics": [[1, 8.0, 0.0], [2, 2.0, 30.0]]}},
+    "refraction_enabled": True,
+}
+
+
+def test_vectorized_matches_mount():
+    mount = NexStarMount({"simulator": {"imperfections": dict(IMPERFECTIONS)}})
+    mount.sim_time = 37.0
+
+    # Positions on exact encoder steps, as the motors report them
+    azm = np.floor(np.array([0.0, 0.1, 0.37, 0.75, 0.99]) * STEPS_PER_REV)
+    alt = np.floor(np.array([0.01, 0.05, 0.12, 0.2, 0.24]) * STEPS_PER_REV)
+    azm /= STEPS_PER_REV
+    alt /= STEPS_PER_REV
+    sky_azm, sky_alt = mount.pointing_model.evaluate(azm, alt, t=mount.sim_time)
+
+    for i in range(len(azm)):
+        mount.azm = azm[i]
+        mount.alt = alt[i]
+        expected = mount.get_sky_altaz()
+        assert sky_azm[i] == pytest.approx(expected[0], abs=1e-12)
+        assert sky_alt[i] == pytest.approx(expected[1], abs=1e-12)
+
+
+def test_custom_term():
+    class AzmOffset(PointingTerm):
+        def apply(self, azm, alt, enc_azm, enc_alt, t, xp):
+            return azm + 0.25, alt
+
+    model = PointingModel([ConeError(0.01)]).add(AzmOffset())
+    assert model.apply(0.9, 0.1, 0, 0, 0.0) == pytest.approx((0.15, 0.11))
+
+    class Incomplete(PointingTerm):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_error_map():
+    model = PointingModel.from_config({"cone_error_arcmin": 10.0})
+    emap = error_map(model, n_azm=36, n_alt=9)
+
+    assert emap["d_alt"].shape == (9, 36)
+    assert np.allclose(emap["d_alt"], 600.0)
+    assert np.allclose(emap["d_azm"], 0.0)
+
+
+def test_error_map_azm_wrap():
+    # Offsets across the 0/360 boundary are reported as small signed values
+    model = PointingModel.from_config({"non_perpendicularity_arcmin": -10.0})
+    emap = error_map(model, n_azm=4, n_alt=3, alt_range=(0.0, 45.0))
+    assert emap["d_azm"][2, 0] == pytest.approx(-600.0, rel=1e-6)
+    assert np.all(np.abs(emap["d_azm"]) < 1000.0)
@@ -0,0 +1,66 @@
+import asyncio
+import struct
+
+from caux_simulator.bus.client import AuxClient
+from caux_simulator.bus.pool import MountPool
+from caux_simulator.bus.utils import pack_int3_raw
+from caux_simulator.nse_simulator import SimulatorServer
+
+CONFIG = {"observer": {"latitude": 50.0}, "simulator": {"imperfections": {}}}
+LOCATION = struct.pack("<ff", 10.0, 20.0)
+
+
+def state(mount):
+    return (
+        mount.azm_motor.steps,
+        mount.azm_motor.trg_steps,
+        mount.azm_motor.rate_steps,
+        mount.sim_time,
+        dict(mount.config["observer"]),
+    )
+
+
+def test_released_mounts_are_reset_and_isolated():
+    pool = MountPool(CONFIG, size=2)
+    fresh = state(pool.idle[0])
+    a, b = pool.acquire(), pool.acquire()
+    assert a.config is not b.config
+    a.bus.devices[0xB5].handle_command(0x20, 0x31, LOCATION)
+    a.azm_motor.handle_command(0x20, 0x24, b"\x09")  # Slew
+    a.tick(1.0)
+    assert state(a) != fresh and state(b) == fresh
+    assert CONFIG["observer"] == {"latitude": 50.0}
+
+    c = pool.acquire()  # The pool is empty: built on demand
+    assert pool.created == 3 and pool.counts() == {"active": 3, "idle": 0}
+    pool.release(a)
+    assert state(pool.acquire()) == fresh
+    pool.release(b)
+    pool.release(c)
+    assert pool.counts() == {"active": 1, "idle": 2}
+
+
+def test_connections_get_their_own_mount():
+    async def run():
+        async with SimulatorServer(
+            CONFIG, host="127.0.0.1", port=0, isolated=True, tick_interval=0.02
+        ) as server:
+            port = server.aux_port
+            job1 = await AuxClient().connect("127.0.0.1", port)
+            job2 = await AuxClient().connect("127.0.0.1", port)
+            start = await job2.query(0x10, 0x01)
+            await job1.query(0x10, 0x02, pack_int3_raw(0x400000))  # GOTO
+            await asyncio.sleep(0.2)
+            assert await job1.query(0x10, 0x01) != start
+            assert await job2.query(0x10, 0x01) == start
+            assert server.mount.azm_motor.trg_steps != 0x400000
+            await job1.close()
+            await asyncio.sleep(0.05)
+            assert server.pool.counts() == {"active": 1, "idle": 3}
+
+            job3 = await AuxClient().connect("127.0.0.1", port)
+            assert await job3.query(0x10, 0x01) == start
+            await job2.close()
+            await job3.close()
+
+    asyncio.run(run())
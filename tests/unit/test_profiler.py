@@ -0,0 +1,37 @@
+import pstats
+import time
+
+from caux_simulator.bus.mount import NexStarMount
+from caux_simulator.bus.utils import encode_packet
+from caux_simulator.profiler import SamplingProfiler
+
+
+def busy_ticks(mount, seconds):
+    move = encode_packet(0x20, 0x10, 0x24, b"\x09")
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        mount.handle_msg(move)
+        mount.tick(0.01)
+
+
+def test_profile_collapsed_and_pstats(tmp_path):
+    mount = NexStarMount({"simulator": {"imperfections": {}}})
+    profiler = SamplingProfiler(interval=0.001)
+    profiler.start()
+    busy_ticks(mount, 0.3)
+    profiler.stop()
+
+    assert profiler.duration > 0.25
+    assert sum(profiler.samples.values()) > 20
+    collapsed, stats_file = profiler.save(str(tmp_path / "prof"))
+
+    with open(collapsed) as f:
+        lines = f.read().splitlines()
+    assert any("busy_ticks (test_profiler.py" in line for line in lines)
+    assert any("tick (motor.py" in line for line in lines)
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+
+    stats = pstats.Stats(stats_file)
+    funcs = {name: v for (_, _, name), v in stats.stats.items()}
+    # Cumulative time of the driver covers (almost) all samples
+    assert funcs["busy_ticks"][3] >= 0.9 * stats.total_tt
@@ -0,0 +1,51 @@
+import socket
+import pytest
+from caux_simulator.pytest_plugin import ThreadedSimulator
+from caux_simulator.bus.utils import encode_packet
+
+
+def recv_exact(sock, n):
+    buf = b""
+    while len(buf) < n:
+        buf += sock.recv(n - len(buf))
+    return buf
+
+
+def test_server_on_ephemeral_port(caux_sim):
+    assert caux_sim.port != 0
+    with socket.create_connection(caux_sim.address, timeout=2.0) as sock:
+        pkt = encode_packet(0x20, 0x10, 0x01)
+        sock.sendall(pkt)
+        resp = recv_exact(sock, len(pkt) + 9)
+    assert resp == pkt + encode_packet(0x10, 0x20, 0x01, b"\x00\x00\x00")
+
+
+def test_state_reset(caux_sim):
+    mount = caux_sim.mount
+    caux_sim.call(mount.handle_msg, encode_packet(0x20, 0x10, 0x04, b"\x10\x00\x00"))
+    caux_sim.call(mount.handle_msg, encode_packet(0x20, 0xBF, 0x10, b"\x00\x05"))
+    mount.config["observer"]["time_offset"] = 3600.0
+    assert mount.azm_motor.steps == 0x100000
+    assert mount.bus.devices[0xBF].lt_tray == 5
+
+    caux_sim.reset()
+    assert mount.azm_motor.steps == 0
+    assert mount.bus.devices[0xBF].lt_tray == 128
+    assert mount.config["observer"]["time_offset"] == 0.0
+
+
+def test_channel_reset(caux_channel):
+    assert caux_channel.query(0x10, 0x01) == b"\x00\x00\x00"
+    caux_channel.query(0x10, 0x04, b"\x40\x00\x00")
+    assert caux_channel.query(0x10, 0x01) == b"\x40\x00\x00"
+
+
+def test_channel_reset_again(caux_channel):
+    assert caux_channel.query(0x10, 0x01) == b"\x00\x00\x00"
+
+
+def test_start_failure_is_raised(caux_config):
+    sim = ThreadedSimulator(caux_config, host="192.0.2.1")  # Not a local address
+    with pytest.raises(OSError):
+        sim.start(timeout=5.0)
+    assert sim._thread is None
@@ -0,0 +1,73 @@
+import asyncio
+
+from caux_simulator.bus.utils import encode_packet
+from caux_simulator.nse_simulator import SimulatorServer
+
+
+def make_server(**kwargs):
+    config = {"simulator": {"imperfections": {}}}
+    return SimulatorServer(config, host="127.0.0.1", port=0, **kwargs)
+
+
+async def query_position(port):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    pkt = encode_packet(0x20, 0x10, 0x01)
+    writer.write(pkt)
+    resp = await asyncio.wait_for(reader.readexactly(len(pkt) + 9), 2.0)
+    writer.close()
+    await writer.wait_closed()
+    return resp[len(pkt) :]
+
+
+def test_two_servers_on_ephemeral_ports():
+    async def run():
+        a, b = make_server(), make_server()
+        await asyncio.gather(a.start(), b.start())
+        try:
+            assert a.aux_port != 0 and b.aux_port != 0
+            assert a.aux_port != b.aux_port
+            assert a.mount is not b.mount
+
+            a.mount.handle_msg(encode_packet(0x20, 0x10, 0x04, b"\x10\x00\x00"))
+            assert await query_position(a.aux_port) == encode_packet(
+                0x10, 0x20, 0x01, b"\x10\x00\x00"
+            )
+            assert await query_position(b.aux_port) == encode_packet(
+                0x10, 0x20, 0x01, b"\x00\x00\x00"
+            )
+        finally:
+            await asyncio.gather(a.stop(), b.stop())
+
+    asyncio.run(run())
+
+
+def test_stop_releases_port_and_tasks():
+    async def run():
+        async with make_server(stellarium=False) as server:
+            port = server.aux_port
+            assert server.running
+            assert server.tasks
+        assert not server.running
+        assert not server.tasks
+        try:
+            await asyncio.open_connection("127.0.0.1", port)
+        except OSError:
+            return True
+        return False
+
+    assert asyncio.run(run())
+
+
+def test_stellarium_ephemeral_port():
+    async def run():
+        async with make_server(stellarium=True, stellarium_port=0) as server:
+            assert server.stellarium_port != 0
+            reader, writer = await asyncio.open_connection(
+                "127.0.0.1", server.stellarium_port
+            )
+            status = await asyncio.wait_for(reader.readexactly(24), 2.0)
+            writer.close()
+            return status
+
+    status = asyncio.run(run())
+    assert int.from_bytes(status[0:2], "little") == 24
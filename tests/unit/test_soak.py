@@ -0,0 +1,65 @@
+import asyncio
+import csv
+import sqlite3
+
+from caux_simulator.nse_simulator import SimulatorServer
+from caux_simulator.tools.soak import SoakHarness, growth
+
+
+def test_growth_detection():
+    flat = [{"t": t, "x": 100.0 + (t % 2)} for t in range(20)]
+    leak = [{"t": t, "x": 100.0 + 5 * t} for t in range(20)]
+    assert growth(flat, "x") is None
+    assert growth(leak, "x").startswith("x: +")
+    assert growth(leak, "x", min_rise=1000.0) is None
+    assert growth(leak[:4], "x") is None  # too few samples
+
+
+def test_short_soak(tmp_path):
+    server = SimulatorServer(
+        {"simulator": {"imperfections": {}}},
+        host="127.0.0.1",
+        port=0,
+        stellarium=True,
+        stellarium_port=0,
+    )
+    out = str(tmp_path / "soak.db")
+    harness = SoakHarness(server, output=out, interval=0.2, rate=100.0)
+    # A leaking container shows up in the findings
+    leak = []
+    harness.watch["leak"] = lambda: leak.append(0) or len(leak)
+    findings = asyncio.run(harness.run(1.5))
+
+    assert not server.running
+    assert len(harness.samples) >= 6
+    last = harness.samples[-1]
+    assert last["requests"] > 50
+    assert last["errors"] == 0
+    assert last["lat_p50_ms"] > 0.0
+    assert any(f.startswith("leak:") for f in findings)
+
+    db = sqlite3.connect(out)
+    assert db.execute("SELECT COUNT(*) FROM samples").fetchone()[0] == len(
+        harness.samples
+    )
+    assert db.execute("SELECT COUNT(*) FROM allocations").fetchone()[0] > 0
+
+
+def test_csv_output_keeps_allocations(tmp_path):
+    server = SimulatorServer(
+        {"simulator": {"imperfections": {}}},
+        host="127.0.0.1",
+        port=0,
+        stellarium=True,
+        stellarium_port=0,
+    )
+    out = str(tmp_path / "soak.csv")
+    harness = SoakHarness(server, output=out, interval=0.2, rate=100.0, top=5)
+    asyncio.run(harness.run(0.5))
+
+    with open(out) as f:
+        assert len(list(csv.DictReader(f))) == len(harness.samples)
+    with open(tmp_path / "soak.allocations.csv") as f:
+        rows = list(csv.DictReader(f))
+    assert 0 < len(rows) <= 5 * len(harness.samples)
+    assert rows[0]["rank"] == "0" and rows[0]["location"]
@@ -0,0 +1,65 @@
+import csv
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from caux_simulator.bus.mount import NexStarMount  # noqa: E402
+from caux_simulator.bus.utils import encode_packet  # noqa: E402
+from caux_simulator.telemetry import FIELDS, TelemetryRecorder  # noqa: E402
+
+
+def make_mount(**recorder_args):
+    mount = NexStarMount({"simulator": {"imperfections": {}}})
+    recorder = TelemetryRecorder(**recorder_args).attach(mount)
+    return mount, recorder
+
+
+def test_ring_and_tiers():
+    mount, rec = make_mount(capacity=50, tiers=((10, 20),))
+    mount.handle_msg(encode_packet(0x20, 0x11, 0x24, b"\x07"))  # 1 deg/s up
+    for _ in range(120):
+        mount.tick(0.1)
+    assert len(rec.raw) == 50 and len(rec.tiers[0]) == 12
+
+    last = rec.query(2.0, ["alt_steps"])
+    assert list(last) == ["t", "alt_steps"]
+    assert len(last["t"]) == 21  # raw tier, 10 Hz
+    assert last["t"][-1] == pytest.approx(12.0)
+
+    long = rec.query(10.0)
+    assert np.diff(long["t"]).min() == pytest.approx(1.0)  # 1 s tier
+    # Window means: t = 11.1 ... 12.0 at 1 deg/s
+    assert long["t"][-1] == pytest.approx(11.55)
+    assert long["sky_alt"][-1] == pytest.approx(11.55, abs=0.05)
+
+    thin = rec.query(None, ["sky_alt"], max_points=5)
+    assert len(thin["t"]) <= 5 and thin["t"][-1] == pytest.approx(11.55)
+    assert rec.velocity("alt_steps") == pytest.approx(46603, rel=1e-3)
+    assert np.isnan(rec.query(1.0, ["ra"])["ra"]).all()  # no observer
+
+    with pytest.raises(ValueError):
+        rec.query(1.0, ["nope"])
+    mount.reset()
+    assert len(rec.raw) == 0 and len(rec.query()["t"]) == 0
+
+
+def test_export(tmp_path):
+    ephem = pytest.importorskip("ephem")
+    obs = ephem.Observer()
+    mount, rec = make_mount(capacity=100, tiers=((5, 10),), observer=obs)
+    stream = tmp_path / "live.csv"
+    rec.start_stream(str(stream), every=4)
+    for _ in range(10):
+        mount.tick(0.1)
+    rec.stop_stream()
+    with open(stream) as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == list(FIELDS) and len(rows) == 11
+    assert 0.0 <= float(rows[-1][FIELDS.index("ra")]) < 360.0
+
+    rec.export_npz(str(tmp_path / "hist.npz"))
+    data = np.load(tmp_path / "hist.npz")
+    assert data["raw"].shape == (10, len(FIELDS))
+    assert data["tier_5"].shape == (2, len(FIELDS))
+    assert rec.to_json(rec.query(0.15, ["dec"]))["dec"][0] is not None
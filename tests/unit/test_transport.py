@@ -0,0 +1,45 @@
+import pytest
+from caux_simulator.bus.mount import NexStarMount
+from caux_simulator.bus.transport import LoopbackChannel
+from caux_simulator.bus.utils import encode_packet, unpack_int3
+
+
+@pytest.fixture
+def channel():
+    return LoopbackChannel(NexStarMount({}))
+
+
+def test_echo_and_response(channel):
+    pkt = encode_packet(0x20, 0x10, 0xFE)
+    resp = channel.send(pkt)
+
+    # Echo first, then the version response from the AZM MC
+    assert resp.startswith(pkt)
+    assert resp[len(pkt) :] == encode_packet(0x10, 0x20, 0xFE, bytes([7, 19, 20, 10]))
+
+    echo, responses = channel.exchange(0x11, 0xFE)
+    assert echo == encode_packet(0x20, 0x11, 0xFE)
+    assert len(responses) == 1
+
+
+def test_silent_device(channel):
+    # StarSense camera (0xB4) is not simulated: no echo, no response
+    assert channel.send(encode_packet(0x20, 0xB4, 0xFE)) == b""
+    assert channel.exchange(0xB4, 0xFE) == (None, [])
+
+
+def test_wifly_command_mode(channel):
+    assert channel.send(b"$$$") == b"CMD\r\n"
+    assert channel.send(b"get ip\r\n").endswith(b"AOK\r\n<2.40-CEL> ")
+    assert channel.send(b"exit\r\n").endswith(b"EXIT\r\n")
+    assert channel.query(0x10, 0x01) == b"\x00\x00\x00"
+
+
+def test_motion_in_simulated_time(channel):
+    # MC_MOVE_POS at rate 9 (4 deg/s) for exactly 2 simulated seconds
+    channel.query(0x10, 0x24, bytes([9]))
+    channel.advance(2.0)
+    channel.query(0x10, 0x24, bytes([0]))
+
+    assert unpack_int3(channel.query(0x10, 0x01)) == pytest.approx(8.0 / 360, abs=1e-5)
+    assert channel.query(0x10, 0x13) == b"\xff"
@@ -0,0 +1,36 @@
+import asyncio
+import types
+
+import pytest
+
+pytest.importorskip("textual")
+ephem = pytest.importorskip("ephem")
+
+from caux_simulator.bus.mount import NexStarMount  # noqa: E402
+from caux_simulator.bus.utils import encode_packet  # noqa: E402
+from caux_simulator.nse_tui import SimulatorApp  # noqa: E402
+
+
+def test_tui_redraws_only_changes():
+    mount = NexStarMount({"simulator": {"imperfections": {}}})
+    args = types.SimpleNamespace(port=2000, stellarium=False, stellarium_port=0)
+
+    async def scenario():
+        app = SimulatorApp(mount, ephem.Observer(), args, {}, refresh_rate=0.1)
+        async with app.run_test() as pilot:
+            updates = []
+            widget = app._widgets["pos-azm"]
+            widget.update = lambda text: updates.append(text)
+            mount.handle_msg(encode_packet(0x20, 0x10, 0x24, b"\x09"))
+            for _ in range(3):
+                mount.tick(0.1)
+                app.update_stats()
+            assert len(updates) == 3  # one redraw per tick with movement
+            mount.handle_msg(encode_packet(0x20, 0x10, 0x24, b"\x00"))
+            mount.tick(0.1)
+            app.update_stats()  # rate event, unchanged position
+            app.update_stats()  # no events
+            assert len(updates) == 3
+            await pilot.pause()
+
+    asyncio.run(scenario())
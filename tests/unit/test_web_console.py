@@ -0,0 +1,101 @@
+import asyncio
+import json
+
+import pytest
+
+pytest.importorskip("fastapi")
+ephem = pytest.importorskip("ephem")
+
+from caux_simulator.bus.mount import NexStarMount  # noqa: E402
+from caux_simulator.bus.utils import encode_packet, pack_int3_raw  # noqa: E402
+from caux_simulator.web_console import WebConsole  # noqa: E402
+
+
+class FakeClient:
+    def __init__(self):
+        self.messages = []
+
+    async def send_text(self, text):
+        self.messages.append(json.loads(text))
+
+
+def test_broadcast_only_unpredictable_changes():
+    mount = NexStarMount(
+        {"simulator": {"imperfections": {}, "web_update_interval": 30.0}}
+    )
+    console = WebConsole(mount, ephem.Observer())
+    client = FakeClient()
+    console.clients.add(client)
+
+    async def step(msg=None):
+        if msg:
+            mount.handle_msg(msg)
+        mount.tick(0.1)
+        await asyncio.sleep(0.01)
+
+    async def scenario():
+        task = asyncio.create_task(console.broadcast_state())
+        await asyncio.sleep(0.01)
+        assert len(client.messages) == 1  # initial state
+
+        await step(encode_packet(0x20, 0x10, 0x24, b"\x09"))
+        assert len(client.messages) == 2  # rate changed
+        assert client.messages[-1]["v_azm"] == pytest.approx(4.0, rel=1e-3)
+        for _ in range(5):
+            await step()
+        assert len(client.messages) == 2  # extrapolated by the page
+
+        await step(encode_packet(0x20, 0x10, 0x24, b"\x00"))
+        assert len(client.messages) == 3
+
+        await step(encode_packet(0x20, 0x11, 0x02, pack_int3_raw(1000000)))
+        remaining = (1000000 - 18641) * 360 / 2**24  # one tick at 4 deg/s
+        assert client.messages[-1]["goto_remaining"]["alt"] == pytest.approx(
+            remaining, abs=0.01
+        )
+        assert client.messages[-1]["goto_remaining"]["azm"] is None
+
+        task.cancel()
+        await task
+        assert not mount.events.subscribers
+
+    asyncio.run(scenario())
+
+
+def test_static_assets_cached(tmp_path):
+    from fastapi.testclient import TestClient
+
+    from caux_simulator.web_assets import StaticAssets
+
+    mount = NexStarMount({"simulator": {"imperfections": {}}})
+    client = TestClient(WebConsole(mount, ephem.Observer()).app)
+
+    page = client.get("/")
+    assert page.headers["cache-control"] == "no-cache"
+    assert (
+        client.get("/", headers={"If-None-Match": page.headers["etag"]}).status_code
+        == 304
+    )
+    js_url = next(
+        part.split('"')[0]
+        for part in page.text.split('src="')[1:]
+        if part.startswith("/static/console.js")
+    )
+    js = client.get(js_url, headers={"Accept-Encoding": "gzip"})
+    assert js.headers["content-encoding"] == "gzip"
+    assert "immutable" in js.headers["cache-control"]
+    assert "async function main" in js.text
+    assert client.get("/static/nope.js").status_code == 404
+
+    config = client.get("/api/config").json()
+    assert config["geometry"]["camera_fov"] == 20
+    assert "version" in config
+
+    # The page links the bundled libraries, which are required
+    assert "/static/vendor/three.min.js?v=" in page.text
+    assert client.get("/static/vendor/OrbitControls.js").status_code == 200
+    (tmp_path / "vendor").mkdir()
+    (tmp_path / "vendor" / "three.min.js").write_text("var THREE = {};")
+    (tmp_path / "index.html").write_text('<script src="{{vendor/three.min.js}}">')
+    with pytest.raises(FileNotFoundError, match="OrbitControls.js"):
+        StaticAssets(str(tmp_path))